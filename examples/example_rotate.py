@@ -14,7 +14,7 @@ if __name__ == '__main__':
     print("===== Plaintext rotation via automorphism =====")
 
     plaintext = cc.encode(msg)
-    automorphismed = plaintext.ringelem.Auto(5 ** shift)
+    automorphismed = plaintext.ringelem.Auto(pow(5, shift, 2 * TOY.N))
     rotated = Plaintext(automorphismed, plaintext.scale, plaintext.level)
     decoded = cc.decode(rotated)
 
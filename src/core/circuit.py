@@ -0,0 +1,455 @@
+from collections import Counter
+import numpy as np
+from core.parameters import CKKSParameters
+from core.encoder import Encoder
+from lib.Ciphertext import Ciphertext
+from lib.Keys import RelinearizationKey, RotationKeySet
+from core.scheduler import DAGScheduler
+from utils.rejections import (_valid_scalar, _valid_array_dtype, _check_msg_length,
+                              _check_relinearization_key, _check_rotation_keyset,
+                              _is_rescalable_level)
+
+# Lazy 회로: TracedCiphertext 위의 연산은 계산하지 않고 DAG 만 만듦.
+# compile() 이 DAG 를 최적화한 뒤 CompiledCircuit.run() 이 실제 암호문으로 실행.
+#
+#   circuit = Circuit(params)
+#   x = circuit.input("x")
+#   circuit.output("y", (x * x).rotate(1) + 0.5)
+#   compiled = circuit.compile()
+#   compiled.run(cc, {"x": ct}, relinearization_key, rotation_keys)["y"]
+#
+# compile 단계
+#   1. simplify : 같은 연산 공유 (CSE, 같은 입력의 같은 회전 포함), 회전의 회전 합치기,
+#                 연속된 add_plain / mul_plain 의 상수 합치기 (mul_plain 은 level 하나 절약)
+#   2. fuse     : 곱들의 합 -> dot / dot_plain (rescale, relinearize 를 합 전체에 한 번)
+#   3. lower    : 곱은 relinearize 없이 (3개짜리) 두고, 2개짜리가 필요한 곳 (mul, rotate, 출력)
+#                 앞에만 relinearize 를 넣음. level 맞추기 (level_down) 는 (원본, level) 마다 한 번
+
+# op: input, add, add_plain, mul, mul_plain, rotate, dot, dot_plain, relinearize, level_down
+class Node:
+    __slots__ = ("op", "args", "const", "level", "size")
+
+    def __init__(self, op: str, args: tuple, const, level: int, size: int):
+        self.op = op
+        self.args = args
+        self.const = const
+        self.level = level
+        self.size = size # component 수 (3: relinearize 전)
+
+    def __repr__(self):
+        return f"Node({self.op}, level={self.level}, size={self.size})"
+
+# 결과의 (level, component 수)
+def _level_size(op: str, args: tuple, const, level: int | None) -> tuple[int, int]:
+    if op == "input":
+        return level, 2
+    if op == "level_down":
+        return const, args[0].size
+    if op in ("rotate", "relinearize"):
+        return args[0].level, 2
+    if op == "add_plain":
+        return args[0].level, args[0].size
+    min_level = min(a.level for a in args)
+    if op == "add":
+        return min_level, max(a.size for a in args)
+    _is_rescalable_level(min_level)
+    if op in ("mul", "dot"):
+        return min_level - 1, 3
+    # mul_plain, dot_plain
+    return min_level - 1, max(a.size for a in args)
+
+def _const_key(const):
+    if isinstance(const, np.ndarray):
+        return const.tobytes()
+    if isinstance(const, tuple):
+        return tuple(_const_key(c) for c in const)
+    return const
+
+class _Builder:
+    """Hash-consing node factory: 같은 (op, args, const) 는 같은 Node."""
+    def __init__(self):
+        self._nodes = {}
+
+    def make(self, op: str, args=(), const=None, level: int | None = None) -> "Node":
+        args = tuple(args)
+        key = (op, tuple(id(a) for a in args), _const_key(const))
+        # key 의 id 들은 node.args 가 살려 두므로 재사용되지 않음
+        node = self._nodes.get(key)
+        if node is None:
+            node = Node(op, args, const, *_level_size(op, args, const, level))
+            self._nodes[key] = node
+        return node
+
+def _topo(roots) -> list["Node"]:
+    order, seen = [], set()
+    stack = [(root, False) for root in roots]
+    while stack:
+        node, done = stack.pop()
+        if done:
+            order.append(node)
+            continue
+        if id(node) in seen:
+            continue
+        seen.add(id(node))
+        stack.append((node, True))
+        stack.extend((a, False) for a in reversed(node.args) if id(a) not in seen)
+    return order
+
+def _use_counts(order: list["Node"], outputs: dict) -> Counter:
+    uses = Counter()
+    for node in order:
+        for a in node.args:
+            uses[id(a)] += 1
+    for node in outputs.values():
+        uses[id(node)] += 1
+    return uses
+
+class TracedCiphertext:
+    """Symbolic ciphertext recorded into a Circuit."""
+    __array_ufunc__ = None # ndarray + traced 도 __radd__ 로
+
+    def __init__(self, circuit: "Circuit", node: "Node"):
+        self.circuit = circuit
+        self.node = node
+
+    @property
+    def level(self) -> int:
+        return self.node.level
+
+    def add(self, other: "TracedCiphertext") -> "TracedCiphertext":
+        return self.circuit._record("add", [self, other])
+
+    def add_plain(self, messages) -> "TracedCiphertext":
+        return self.circuit._record("add_plain", [self], self.circuit._message(messages))
+
+    def add_scalar(self, scalar) -> "TracedCiphertext":
+        _valid_scalar(scalar)
+        return self.circuit._record("add_plain", [self], self.circuit._broadcast(scalar))
+
+    def mul(self, other: "TracedCiphertext") -> "TracedCiphertext":
+        return self.circuit._record("mul", [self, other])
+
+    def mul_plain(self, messages) -> "TracedCiphertext":
+        return self.circuit._record("mul_plain", [self], self.circuit._message(messages))
+
+    def mul_scalar(self, scalar) -> "TracedCiphertext":
+        _valid_scalar(scalar)
+        return self.circuit._record("mul_plain", [self], self.circuit._broadcast(scalar))
+
+    def rotate(self, shift: int) -> "TracedCiphertext":
+        return self.circuit._record("rotate", [self], int(shift))
+
+    def __add__(self, other) -> "TracedCiphertext":
+        if isinstance(other, TracedCiphertext):
+            return self.add(other)
+        if isinstance(other, np.ndarray):
+            return self.add_plain(other)
+        return self.add_scalar(other)
+
+    def __mul__(self, other) -> "TracedCiphertext":
+        if isinstance(other, TracedCiphertext):
+            return self.mul(other)
+        if isinstance(other, np.ndarray):
+            return self.mul_plain(other)
+        return self.mul_scalar(other)
+
+    __radd__ = __add__
+    __rmul__ = __mul__
+
+class Circuit:
+    def __init__(self, params: "CKKSParameters"):
+        self.params = params
+        self.inputs: dict[str, "Node"] = {}
+        self.outputs: dict[str, "Node"] = {}
+
+    def input(self, name: str, level: int = -1) -> "TracedCiphertext":
+        if name in self.inputs:
+            raise ValueError(f"duplicate input {name!r}")
+        if level == -1:
+            level = self.params.max_level
+        node = Node("input", (), name, *_level_size("input", (), name, level))
+        self.inputs[name] = node
+        return TracedCiphertext(self, node)
+
+    def output(self, name: str, traced: "TracedCiphertext"):
+        self._check_traced(traced)
+        if name in self.outputs:
+            raise ValueError(f"duplicate output {name!r}")
+        self.outputs[name] = traced.node
+
+    def compile(self) -> "CompiledCircuit":
+        if not self.outputs:
+            raise ValueError("circuit has no outputs")
+        outputs = _simplify(self.outputs, self.params.slot_count)
+        outputs = _fuse_products(outputs)
+        program, outputs = _lower(outputs)
+        inputs = {node.const: node for node in program if node.op == "input"}
+        return CompiledCircuit(self.params, program, inputs, outputs)
+
+    def _record(self, op: str, operands: list["TracedCiphertext"], const=None) -> "TracedCiphertext":
+        for operand in operands:
+            self._check_traced(operand)
+        args = tuple(operand.node for operand in operands)
+        node = Node(op, args, const, *_level_size(op, args, const, None))
+        return TracedCiphertext(self, node)
+
+    def _check_traced(self, traced):
+        if not isinstance(traced, TracedCiphertext) or traced.circuit is not self:
+            raise ValueError("operand is not traced in this circuit")
+
+    def _message(self, messages) -> np.ndarray:
+        messages = np.asarray(messages)
+        _valid_array_dtype(messages)
+        _check_msg_length(messages, self.params.slot_count)
+        return messages.astype(np.complex128)
+
+    def _broadcast(self, scalar) -> np.ndarray:
+        return np.full(self.params.slot_count, scalar, dtype=np.complex128)
+
+# --- 1. CSE, 회전 / 상수 합치기 ---
+def _simplify(outputs: dict, slot_count: int) -> dict:
+    order = _topo(outputs.values())
+    uses = _use_counts(order, outputs)
+    builder = _Builder()
+    new = {}
+    for node in order:
+        args = [new[id(a)] for a in node.args]
+        op, const = node.op, node.const
+        inner = node.args[0] if node.args else None
+        # 중간 결과를 다른 곳에서 쓰지 않을 때만 합침 (아니면 두 번 계산하게 됨)
+        mergeable = (inner is not None and inner.op == op and args[0].op == op
+                     and uses[id(inner)] == 1)
+        if op == "rotate":
+            const %= slot_count
+            if mergeable:
+                const = (const + args[0].const) % slot_count
+                args = list(args[0].args)
+            if const == 0:
+                new[id(node)] = args[0]
+                continue
+        elif op == "add_plain" and mergeable:
+            const = args[0].const + const
+            args = list(args[0].args)
+        elif op == "mul_plain" and mergeable:
+            const = args[0].const * const
+            args = list(args[0].args)
+        new[id(node)] = builder.make(op, args, const, node.level if op == "input" else None)
+    return {name: new[id(node)] for name, node in outputs.items()}
+
+# --- 2. 곱들의 합 -> dot / dot_plain ---
+def _fuse_products(outputs: dict) -> dict:
+    order = _topo(outputs.values())
+    uses = _use_counts(order, outputs)
+    consumed_by_add = set() # 다른 add 에서만 한 번 쓰이는 add: 더 큰 합의 일부
+    for node in order:
+        if node.op == "add":
+            for a in node.args:
+                if a.op == "add" and uses[id(a)] == 1:
+                    consumed_by_add.add(id(a))
+
+    builder = _Builder()
+    new = {}
+    for node in order:
+        if node.op == "add" and id(node) not in consumed_by_add:
+            new[id(node)] = _fuse_sum(node, uses, new, builder)
+            continue
+        args = [new[id(a)] for a in node.args]
+        new[id(node)] = builder.make(node.op, args, node.const,
+                                     node.level if node.op == "input" else None)
+    return {name: new[id(node)] for name, node in outputs.items()}
+
+def _fuse_sum(root: "Node", uses: Counter, new: dict, builder: "_Builder") -> "Node":
+    leaves, stack = [], [root]
+    while stack:
+        node = stack.pop()
+        for a in node.args:
+            if a.op == "add" and uses[id(a)] == 1:
+                stack.append(a)
+            else:
+                leaves.append(a)
+
+    products = [l for l in leaves if l.op == "mul" and uses[id(l)] == 1]
+    plain_products = [l for l in leaves if l.op == "mul_plain" and uses[id(l)] == 1]
+    terms = []
+    if len(products) >= 2:
+        args = [new[id(l.args[0])] for l in products] + [new[id(l.args[1])] for l in products]
+        terms.append(builder.make("dot", args, len(products)))
+    else:
+        products = []
+    if len(plain_products) >= 2:
+        args = [new[id(l.args[0])] for l in plain_products]
+        terms.append(builder.make("dot_plain", args, tuple(l.const for l in plain_products)))
+    else:
+        plain_products = []
+    fused = {id(l) for l in products + plain_products}
+    terms.extend(new[id(l)] for l in leaves if id(l) not in fused)
+
+    total = terms[0]
+    for term in terms[1:]:
+        total = builder.make("add", [total, term])
+    return total
+
+# --- 3. relinearize / level_down 배치 ---
+# 2개짜리 operand 가 필요한 연산과 그 operand 들의 level
+def _pair_operand_level(node: "Node") -> int | None:
+    if node.op in ("mul", "dot"):
+        return min(a.level for a in node.args)
+    if node.op == "rotate":
+        return node.args[0].level
+    return None
+
+def _lower(outputs: dict) -> tuple[list["Node"], dict]:
+    order = _topo(outputs.values())
+    # 3개짜리 결과는 2개짜리가 필요한 가장 높은 level 에서 한 번만 relinearize 하고 거기서 level_down
+    relin_level = {}
+    for node in order:
+        level = _pair_operand_level(node)
+        for a in node.args if level is not None else ():
+            relin_level[id(a)] = max(relin_level.get(id(a), level), level)
+    # 출력은 2개짜리로 돌려주지만, 출력을 위한 relinearize 는 다른 consumer 가 공유하지 않음
+    pair_demand = dict(relin_level)
+    for node in outputs.values():
+        pair_demand[id(node)] = max(pair_demand.get(id(node), node.level), node.level)
+
+    builder = _Builder()
+    new = {}
+
+    def level_down(node: "Node", level: int) -> "Node":
+        return node if node.level == level else builder.make("level_down", [node], level)
+
+    # pair=False 여도 어차피 relinearize 하는 결과면 (그 level 이 충분히 높으면) 그걸 씀:
+    # 2개짜리끼리 더하면 뒤에서 다시 relinearize 할 필요가 없음
+    def operand(node: "Node", level: int, pair: bool) -> "Node":
+        lowered = new[id(node)]
+        relin = pair_demand.get(id(node)) if pair else relin_level.get(id(node))
+        if lowered.size == 3 and relin is not None and relin >= level:
+            lowered = builder.make("relinearize", [level_down(lowered, relin)])
+        return level_down(lowered, level)
+
+    for node in order:
+        op = node.op
+        if op == "input":
+            new[id(node)] = builder.make(op, (), node.const, node.level)
+            continue
+        pair_level = _pair_operand_level(node)
+        if pair_level is not None:
+            args = [operand(a, pair_level, True) for a in node.args]
+        elif op in ("add", "dot_plain"):
+            level = min(a.level for a in node.args)
+            args = [operand(a, level, False) for a in node.args]
+        else: # add_plain, mul_plain: 상수는 operand 의 level 로 encode
+            args = [new[id(a)] for a in node.args]
+        new[id(node)] = builder.make(op, args, node.const)
+
+    outputs = {name: operand(node, node.level, True) for name, node in outputs.items()}
+    return _topo(outputs.values()), outputs
+
+class CompiledCircuit:
+    """Optimized program (topologically ordered nodes) with pre-encoded constants."""
+    def __init__(self, params: "CKKSParameters", program: list["Node"], inputs: dict, outputs: dict):
+        self.params = params
+        self.program = program
+        self.inputs = inputs
+        self.outputs = outputs
+
+        # 상수 평문은 compile 할 때 한 번만 encode
+        encoder = Encoder(params)
+        self._plaintexts = {}
+        for node in program:
+            if node.op in ("add_plain", "mul_plain"):
+                self._plaintexts[id(node)] = encoder.encode(node.const, node.args[0].level)
+            elif node.op == "dot_plain":
+                level = node.args[0].level
+                self._plaintexts[id(node)] = [encoder.encode(c, level) for c in node.const]
+
+        # 같은 암호문의 회전들은 run 에서 한 번에 (hoisted)
+        self._rotation_groups: dict[int, list["Node"]] = {}
+        for node in program:
+            if node.op == "rotate":
+                self._rotation_groups.setdefault(id(node.args[0]), []).append(node)
+
+    @property
+    def counts(self) -> Counter:
+        return Counter(node.op for node in self.program)
+
+    # scheduler 가 없으면 worker 하나로 (현재 thread 에서) 실행
+    def run(self, cc: "CryptoContext", inputs: dict[str, "Ciphertext"],
+            relinearization_key: "RelinearizationKey | None" = None,
+            rotation_keys: "RotationKeySet | None" = None,
+            scheduler: "DAGScheduler | None" = None) -> dict[str, "Ciphertext"]:
+        if scheduler is None:
+            scheduler = DAGScheduler(workers=1)
+        return scheduler.run(self, cc, inputs, relinearization_key, rotation_keys)
+
+    # 실행 단위: node 하나, 단 같은 암호문의 key 하나로 되는 회전들은 묶어서 (rotate_many 로 lift 공유)
+    # keyset 이 없으면 묶지 않음 (없다는 에러는 회전 task 의 key 를 찾을 때)
+    def _tasks(self, rotation_keys: "RotationKeySet | None") -> list[list["Node"]]:
+        grouped = {}
+        for source, group in self._rotation_groups.items():
+            if rotation_keys is None:
+                break
+            direct = [m for m in group if len(rotation_keys._decompose_shifts(m.const)) == 1]
+            if len(direct) >= 2:
+                for m in direct:
+                    grouped[id(m)] = direct
+        tasks = []
+        for node in self.program:
+            group = grouped.get(id(node))
+            if group is None:
+                tasks.append([node])
+            elif group[0] is node:
+                tasks.append(group)
+        return tasks
+
+    # 회전 task 가 쓸 RotationKey 들 (묶인 회전: node 마다 하나, 단독 회전: 분해된 key 들).
+    # scheduler 가 task 를 넘기기 전에 scheduling thread 에서 호출: keyset (KeyStore 의 cache 등)
+    # 은 worker thread 에서 건드리지 않음
+    def _task_keys(self, nodes: list["Node"], rotation_keys) -> list["RotationKey"] | None:
+        if nodes[0].op != "rotate":
+            return None
+        _check_rotation_keyset(rotation_keys)
+        if len(nodes) > 1:
+            return [rotation_keys[m.const] for m in nodes]
+        return rotation_keys.decompose(nodes[0].const)
+
+    # values: task 의 operand 들 (id(node) -> Ciphertext), keys: _task_keys 의 결과.
+    # task 의 node 순서대로 결과를 반환
+    def _run_task(self, cc: "CryptoContext", nodes: list["Node"], values: dict, inputs: dict,
+                  relinearization_key, keys: list["RotationKey"] | None) -> list["Ciphertext"]:
+        operator = cc.operator
+        if len(nodes) > 1: # hoisted rotations
+            rotated = operator.rotate_many(values[id(nodes[0].args[0])], keys)
+            return [rotated[key.shift] for key in keys]
+
+        node = nodes[0]
+        args = [values[id(a)] for a in node.args]
+        op = node.op
+        if op == "input":
+            if node.const not in inputs:
+                raise ValueError(f"missing input {node.const!r}")
+            ct = operator._linearize(inputs[node.const], relinearization_key)
+            return [operator._level_down_ct(ct, node.level)]
+        if op == "level_down":
+            return [operator._level_down_ct(args[0], node.level)]
+        if op == "relinearize":
+            _check_relinearization_key(relinearization_key)
+            return [operator.relinearize_ciphertext(args[0], relinearization_key)]
+        if op == "add":
+            return [operator.add(*args)]
+        if op == "add_plain":
+            return [operator.add_plain(args[0], self._plaintexts[id(node)])]
+        if op == "mul":
+            return [operator.mul(*args, None, relinearize=False)]
+        if op == "mul_plain":
+            return [operator.mul_plain(args[0], self._plaintexts[id(node)])]
+        if op == "dot":
+            k = node.const
+            return [operator.dot(args[:k], args[k:], None, relinearize=False)]
+        if op == "dot_plain":
+            return [operator.dot_plain(args, self._plaintexts[id(node)])]
+        if op == "rotate":
+            result = args[0]
+            for key in keys:
+                result = operator.rotation(result, key)
+            return [result]
+        raise ValueError(f"unknown op {op!r}")
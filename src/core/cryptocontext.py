@@ -4,30 +4,43 @@ from core.key_generator import KeyGenerator
 from core.encoder import Encoder
 from core.encryptor import Encryptor
 from core.operator import Operator
-from lib.Keys import SecretKey, RelinearizationKey, RotationKey
+from core.encryption_pool import ZeroEncryptionPool
+from lib.Keys import SecretKey, PublicKey, RelinearizationKey, RotationKey, RotationKeySet
 from lib.Ciphertext import Ciphertext
 from lib.Plaintext import Plaintext
 from utils.rejections import (_valid_scalar, _valid_array_dtype,
-                              _check_msg_length, _check_ciphertext_components)
+                              _check_msg_length, _check_ciphertext_size,
+                              _check_shift_given)
 from utils.checker import (_is_scalar_integer)
 
 class CryptoContext:
-    def __init__(self, params: "CKKSParameters"):
+    # executor: 지연 시간이 중요한 단일 mul / rotate 에서 ring 곱을 병렬로 (core.executor.make_executor)
+    def __init__(self, params: "CKKSParameters", executor: "Executor | None" = None):
         self.params = params
         self.keyGenerator = KeyGenerator(params)
         self.encoder = Encoder(params)
         self.encryptor = Encryptor(params)
-        self.operator = Operator(params)
+        self.operator = Operator(params, executor)
 
     ''' Key Gen '''
     def keygen(self):
         return self.keyGenerator.gen_secret_key()
 
-    def relinearization_keygen(self, secret_key: "SecretKey") -> "RelinearizationKey":
-        return self.keyGenerator.gen_relinearization_key(secret_key)
+    def public_keygen(self, secret_key: "SecretKey", seeded: bool = False) -> "PublicKey":
+        return self.keyGenerator.gen_public_key(secret_key, seeded)
 
-    def rotation_keygen(self, shift:int, secret_key: "SecretKey") -> "RotationKey":
-        return self.keyGenerator.gen_rotation_key(shift, secret_key)
+    # seeded=True: uniform 한 A 대신 seed 만 저장 (키 크기 절반)
+    def relinearization_keygen(self, secret_key: "SecretKey",
+                               seeded: bool = False) -> "RelinearizationKey":
+        return self.keyGenerator.gen_relinearization_key(secret_key, seeded)
+
+    def rotation_keygen(self, shift:int, secret_key: "SecretKey",
+                        seeded: bool = False) -> "RotationKey":
+        return self.keyGenerator.gen_rotation_key(shift, secret_key, seeded)
+
+    def rotation_keyset_gen(self, secret_key: "SecretKey", extra_shifts=(),
+                            seeded: bool = False) -> "RotationKeySet":
+        return self.keyGenerator.gen_rotation_keyset(secret_key, extra_shifts, seeded)
 
     ''' Encrypt/Decrypt '''
     def encode(self, msg: np.ndarray, level: int = -1):
@@ -40,24 +53,62 @@ class CryptoContext:
         message = self.encoder.decode(plaintext)
         return message
 
-    def encrypt(self, msg: np.ndarray, secret_key: "SecretKey", level: int = -1):
+    # seeded=True: a 대신 seed 만 저장하는 압축 암호문
+    def encrypt(self, msg: np.ndarray, secret_key: "SecretKey", level: int = -1,
+                seeded: bool = False):
         if level == -1:
             level = self.params.max_level
         encoded = self.encoder.encode(msg, level)
-        ciphertext = self.encryptor.encrypt(encoded, secret_key)
+        ciphertext = self.encryptor.encrypt(encoded, secret_key, seeded)
         return ciphertext
 
+    # secret key 없이 암호화. pool 이 있으면 평문 덧셈 한 번으로 끝남
+    def encrypt_public(self, msg: np.ndarray, public_key: "PublicKey", level: int = -1,
+                       pool: "ZeroEncryptionPool | None" = None):
+        if level == -1:
+            level = self.params.max_level
+        encoded = self.encoder.encode(msg, level)
+        return self.encryptor.encrypt_public(encoded, public_key, pool)
+
+    # background thread 가 0 의 암호문을 미리 채워두는 pool
+    def encryption_pool(self, public_key: "PublicKey", level: int = -1, capacity: int = 32,
+                        background: bool = True) -> "ZeroEncryptionPool":
+        if level == -1:
+            level = self.params.max_level
+        return ZeroEncryptionPool(self.encryptor, public_key, level, capacity, background)
+
     def decrypt(self, ct: "Ciphertext", secret_key: "SecretKey"):
         plaintext = self.encryptor.decrypt(ct, secret_key)
         message = self.encoder.decode(plaintext)
         return message
 
+    # msgs: (B, slot_count)
+    def encode_batch(self, msgs: np.ndarray, level: int = -1) -> list["Plaintext"]:
+        return self.encoder.encode_batch(msgs, level)
+
+    def decode_batch(self, plaintexts: list["Plaintext"]) -> np.ndarray:
+        return self.encoder.decode_batch(plaintexts)
+
+    def encrypt_batch(self, msgs: np.ndarray, secret_key: "SecretKey", level: int = -1,
+                      seeded: bool = False) -> list["Ciphertext"]:
+        encoded = self.encoder.encode_batch(msgs, level)
+        return [self.encryptor.encrypt(pt, secret_key, seeded) for pt in encoded]
+
+    def decrypt_batch(self, cts: list["Ciphertext"], secret_key: "SecretKey") -> np.ndarray:
+        plaintexts = [self.encryptor.decrypt(ct, secret_key) for ct in cts]
+        return self.encoder.decode_batch(plaintexts)
+
     def add(self, ct1: "Ciphertext", ct2: "Ciphertext") -> "Ciphertext":
         return self.operator.add(ct1, ct2)
 
     def add_plain(self, ct: "Ciphertext", pt: "Plaintext") -> "Ciphertext":
         return self.operator.add_plain(ct, pt)
 
+    # dst 를 직접 수정 (누적용). dst 와 component 를 공유하는 다른 암호문도 바뀜:
+    # 이 class 의 연산 결과는 입력과 공유하지 않음 (relinearize 는 2개짜리면 입력 그대로 반환)
+    def add_inplace(self, dst: "Ciphertext", src: "Ciphertext") -> "Ciphertext":
+        return self.operator.add_inplace(dst, src)
+
     # 우선 정수, 실수만 허용
     def add_scalar(self, ct: "Ciphertext", scalar: np.int64|np.float64|int|float) -> "Ciphertext":
         _valid_scalar(scalar)
@@ -76,20 +127,37 @@ class CryptoContext:
         plaintext = self.encoder.encode(messages, ct_level)
         return self.operator.add_plain(ct, plaintext)
 
+    # relinearize=False: 3개짜리 암호문을 반환하고 relinearize 는 필요할 때까지 미룸
     def mul(self, ct1: "Ciphertext", ct2: "Ciphertext",
-            relinearization_key: "RelinearizationKey") -> "Ciphertext":
-        return self.operator.mul(ct1, ct2, relinearization_key)
+            relinearization_key: "RelinearizationKey | None" = None,
+            relinearize: bool = True) -> "Ciphertext":
+        return self.operator.mul(ct1, ct2, relinearization_key, relinearize)
+
+    def relinearize(self, ct: "Ciphertext",
+                    relinearization_key: "RelinearizationKey") -> "Ciphertext":
+        return self.operator.relinearize_ciphertext(ct, relinearization_key)
 
     def mul_plain(self, ct: "Ciphertext", pt: "Plaintext") -> "Ciphertext":
         return self.operator.mul_plain(ct, pt)
 
+    def mul_plain_inplace(self, dst: "Ciphertext", pt: "Plaintext") -> "Ciphertext":
+        return self.operator.mul_plain_inplace(dst, pt)
+
+    # sum_i cts1[i] * cts2[i]: relinearize, rescale 한 번씩
+    def dot(self, cts1: list["Ciphertext"], cts2: list["Ciphertext"],
+            relinearization_key: "RelinearizationKey | None" = None,
+            relinearize: bool = True) -> "Ciphertext":
+        return self.operator.dot(cts1, cts2, relinearization_key, relinearize)
+
+    # sum_i cts[i] * pts[i]: rescale 한 번
+    def dot_plain(self, cts: list["Ciphertext"], pts: list["Plaintext"]) -> "Ciphertext":
+        return self.operator.dot_plain(cts, pts)
+
     def mul_scalar(self, ct: "Ciphertext", scalar: np.int64|np.float64|int|float) -> "Ciphertext":
-        _check_ciphertext_components(ct)
+        _check_ciphertext_size(ct)
         if _is_scalar_integer(scalar): # No need to encode = no need to consume level
-            a, b = ct.components
-            new_a = a.scalarmul(int(scalar))
-            new_b = b.scalarmul(int(scalar))
-            return Ciphertext([new_a, new_b], ct.scale, ct.level)
+            multiplied = [c.scalarmul(int(scalar)) for c in ct.components]
+            return Ciphertext(multiplied, ct.scale, ct.level)
         else:
             slot_count = self.params.slot_count
             message = np.repeat(scalar, slot_count)
@@ -104,10 +172,39 @@ class CryptoContext:
         plaintext = self.encoder.encode(messages, ct_level)
         return self.operator.mul_plain(ct, plaintext)
 
-    def rotate(self, ciphertext: "Ciphertext", rotation_key: "RotationKey") -> "Ciphertext":
-        _check_ciphertext_components(ciphertext)
+    # 3개짜리 암호문은 relinearization_key 로 먼저 relinearize.
+    # rotation_key 로 RotationKeySet / KeyStore 를 넘기면 shift 로 key 를 찾아서 회전
+    def rotate(self, ciphertext: "Ciphertext", rotation_key: "RotationKey | RotationKeySet",
+               relinearization_key: "RelinearizationKey | None" = None,
+               shift: int | None = None) -> "Ciphertext":
+        if isinstance(rotation_key, RotationKeySet):
+            _check_shift_given(shift)
+            return self.rotate_by(ciphertext, shift, rotation_key, relinearization_key)
+        ciphertext = self.operator._linearize(ciphertext, relinearization_key)
         return self.operator.rotation(ciphertext, rotation_key)
 
+    def rotate_inplace(self, dst: "Ciphertext", rotation_key: "RotationKey",
+                       relinearization_key: "RelinearizationKey | None" = None) -> "Ciphertext":
+        linearized = self.operator._linearize(dst, relinearization_key)
+        dst.components = linearized.components
+        return self.operator.rotate_inplace(dst, rotation_key)
+
+    # 임의의 shift: keyset 의 key 들로 최소 개수의 회전을 합성
+    def rotate_by(self, ciphertext: "Ciphertext", shift: int,
+                  keyset: "RotationKeySet",
+                  relinearization_key: "RelinearizationKey | None" = None) -> "Ciphertext":
+        rotated = self.operator._linearize(ciphertext, relinearization_key)
+        for rotation_key in keyset.decompose(shift):
+            rotated = self.operator.rotation(rotated, rotation_key)
+        return rotated
+
+    # 같은 암호문을 여러 shift 로 회전 (hoisted): {shift: Ciphertext}
+    def rotate_many(self, ciphertext: "Ciphertext",
+                    rotation_keys: list["RotationKey"],
+                    relinearization_key: "RelinearizationKey | None" = None) -> dict[int, "Ciphertext"]:
+        ciphertext = self.operator._linearize(ciphertext, relinearization_key)
+        return self.operator.rotate_many(ciphertext, rotation_keys)
+
     @property
     def slot_count(self):
         return self.params.slot_count
@@ -1,27 +1,42 @@
 import numpy as np
 from lib.Plaintext import Plaintext
-from utils.rejections import (_check_msg_length)
+from utils.rejections import (_check_msg_length, _check_batch_shape)
 
 class Encoder:
     def __init__(self, params):
         self.params = params
         self.slots = params.N // 2
-        self.ecdMatrices, self.dcdMatrix = GenTransformMatrices(params.N)
+        self.fftTables = GenFFTTables(params.N)
 
     def encode(self, msg: np.ndarray, level:int=-1) -> "Plaintext":
         _check_msg_length(msg, self.params.slot_count)
         if level == -1:
             level = self.params.max_level
         cycloRing = self.params.rings[level]
-        complex_msg = np.array([m for m in msg], dtype=np.complex128)
-        rounded = Encode(complex_msg, self.ecdMatrices, self.params.N, self.params.scale)
+        complex_msg = np.asarray(msg, dtype=np.complex128)
+        rounded = FFTEncode(complex_msg, self.fftTables, self.params.N, self.params.scale)
         encoded = cycloRing.from_coeffs(rounded)
         return Plaintext(encoded, self.params.scale, level)
 
     def decode(self, plaintext: "Plaintext") -> np.ndarray:
-        decoded = Decode(plaintext, self.dcdMatrix, self.params.N, self.params.scale)
+        decoded = FFTDecode(plaintext, self.fftTables, self.params.N, self.params.scale)
         return decoded
 
+    # msgs: (B, slot_count) -> B 개의 Plaintext (FFT/반올림은 한 번에)
+    def encode_batch(self, msgs: np.ndarray, level: int = -1) -> list["Plaintext"]:
+        msgs = np.asarray(msgs)
+        _check_batch_shape(msgs, self.params.slot_count)
+        if level == -1:
+            level = self.params.max_level
+        cycloRing = self.params.rings[level]
+        rounded = FFTEncode(msgs.astype(np.complex128), self.fftTables, self.params.N, self.params.scale)
+        return [Plaintext(cycloRing.from_coeffs(row), self.params.scale, level) for row in rounded]
+
+    def decode_batch(self, plaintexts: list["Plaintext"]) -> np.ndarray:
+        decoded = FFTDecodeBatch(plaintexts, self.fftTables, self.params.N, self.params.scale)
+        return decoded
+
+# Dense O(N^2) 변환 행렬 (reference 용)
 def GenTransformMatrices(N):
     U = []
     for i in range(N // 2):
@@ -55,3 +70,42 @@ def Decode(plaintext: "Plaintext", dcdMatrix, N:int, scale: int):
     scaled = np.array(coeffs / scale, dtype=np.float64)
     transformed = np.array((dcdMatrix @ scaled)[:N//2].T.real, dtype=np.float64)
     return transformed
+
+# O(N log N) 변환: 슬롯 i 는 odd exponent k = 5^i (mod 2N) 에서의 평가값 m(zeta^k).
+# zeta^(jk) = zeta^j * omega^(j(k-1)/2) (omega = zeta^2) 이므로 m_j * zeta^j 에 대한
+# 길이 N FFT 한 번으로 모든 odd k 에서의 값을 얻고, (k-1)/2 위치에서 슬롯을 읽는다.
+def GenFFTTables(N):
+    M = 2 * N
+    rot_group = np.array([pow(5, i, M) for i in range(N // 2)], dtype=np.int64)
+    slot_idx = (rot_group - 1) // 2          # zeta^(5^i)
+    conj_idx = (M - rot_group - 1) // 2      # zeta^(-5^i) : 켤레 슬롯
+    twist = np.exp(1j * np.pi * np.arange(N) / N)  # zeta^j
+    return twist, slot_idx, conj_idx
+
+# msg: (slots,) 또는 (B, slots) -> (N,) 또는 (B, N)
+def FFTEncode(msg: np.ndarray, fftTables, N: int, scale: int):
+    twist, slot_idx, conj_idx = fftTables
+    z = np.asarray(msg, dtype=np.complex128)
+    values = np.empty(z.shape[:-1] + (N,), dtype=np.complex128)
+    values[..., slot_idx] = z
+    values[..., conj_idx] = np.conjugate(z)
+
+    encoded = (np.fft.fft(values, axis=-1) * np.conjugate(twist)).real / N
+    rounded = np.array(np.round(encoded * scale), dtype=int)
+
+    return rounded
+
+def FFTDecode(plaintext: "Plaintext", fftTables, N: int, scale: int):
+    coeffs = plaintext.ringelem.poly._center_reduce()
+    scaled = np.array(coeffs / scale, dtype=np.float64)
+    return _fft_decode(scaled, fftTables, N)
+
+def FFTDecodeBatch(plaintexts: list["Plaintext"], fftTables, N: int, scale: int):
+    coeffs = np.array([pt.ringelem.poly._center_reduce() for pt in plaintexts], dtype=object)
+    scaled = np.array(coeffs / scale, dtype=np.float64).reshape(len(plaintexts), N)
+    return _fft_decode(scaled, fftTables, N)
+
+def _fft_decode(scaled: np.ndarray, fftTables, N: int):
+    twist, slot_idx, _ = fftTables
+    values = np.fft.ifft(scaled * twist, axis=-1) * N
+    return np.array(values[..., slot_idx].real, dtype=np.float64)
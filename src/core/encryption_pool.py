@@ -0,0 +1,82 @@
+import threading
+from collections import deque
+from lib.Ciphertext import Ciphertext
+from lib.Keys import PublicKey
+
+# 공개키로 만든 0 의 암호문 (v * pk + e) 을 미리 만들어 두는 pool.
+# 온라인 암호화는 pool 에서 하나 꺼내서 평문을 더하기만 하면 됨.
+
+class ZeroEncryptionPool:
+    """Precomputed public-key encryptions of zero at a fixed level.
+
+    background=True 이면 daemon thread 가 capacity 까지 계속 채움.
+    pool 이 비어 있으면 take() 가 그 자리에서 하나 만듦 (miss).
+    """
+    def __init__(self, encryptor: "Encryptor", public_key: "PublicKey", level: int,
+                 capacity: int = 32, background: bool = True):
+        if capacity < 1:
+            raise ValueError("capacity should be positive")
+        self.encryptor = encryptor
+        self.public_key = public_key
+        self.level = level
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self._pool: deque[Ciphertext] = deque()
+        self._cond = threading.Condition()
+        self._closed = False
+        self._worker = None
+        if background:
+            self._worker = threading.Thread(target=self._refill, name="ZeroEncryptionPool",
+                                            daemon=True)
+            self._worker.start()
+
+    def take(self) -> "Ciphertext":
+        with self._cond:
+            if self._pool:
+                self.hits += 1
+                zero = self._pool.popleft()
+                self._cond.notify()
+                return zero
+            self.misses += 1
+        return self._generate()
+
+    def fill(self, count: int | None = None):
+        """Synchronously add `count` encryptions of zero (default: up to capacity)."""
+        if count is None:
+            count = self.capacity - len(self)
+        for _ in range(count):
+            zero = self._generate()
+            with self._cond:
+                self._pool.append(zero)
+
+    def __len__(self) -> int:
+        with self._cond:
+            return len(self._pool)
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._worker is not None:
+            self._worker.join()
+
+    def __enter__(self) -> "ZeroEncryptionPool":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _generate(self) -> "Ciphertext":
+        return self.encryptor.encrypt_zero_public(self.public_key, self.level)
+
+    def _refill(self):
+        while True:
+            with self._cond:
+                while not self._closed and len(self._pool) >= self.capacity:
+                    self._cond.wait()
+                if self._closed:
+                    return
+            zero = self._generate() # 계산은 lock 밖에서
+            with self._cond:
+                self._pool.append(zero)
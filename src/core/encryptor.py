@@ -1,7 +1,8 @@
-from lib.Keys import SecretKey
+from lib.Keys import SecretKey, PublicKey
 from lib.Ciphertext import Ciphertext
 from lib.Plaintext import Plaintext
-from utils.rejections import (_check_ciphertext_components)
+from lib.Sampler import new_seed
+from utils.rejections import (_check_ciphertext_size, _check_pool_level)
 
 # encrypt, decrypt, keygen
 
@@ -10,19 +11,47 @@ class Encryptor:
         self.params = params
         self.slots = params.N // 2
 
-    def encrypt(self, plaintext: "Plaintext", secret_key: "SecretKey") -> "Ciphertext":
+    # seeded=True: a 대신 32-byte seed 만 저장 (a 는 SHAKE-256 으로 다시 전개)
+    def encrypt(self, plaintext: "Plaintext", secret_key: "SecretKey",
+                seeded: bool = False) -> "Ciphertext":
         level = plaintext.level
         fitted_s = secret_key._fitting(level)
         cycloRing = self.params.rings[level]
         pt = plaintext.ringelem
         s = fitted_s.ringelem
-        a = cycloRing.random_uniform()
-        e = cycloRing.sample_Gaussian()
+        seed = new_seed() if seeded else None
+        a = cycloRing.expand_uniform(seed) if seeded else cycloRing.random_uniform()
+        e = cycloRing.sample_Gaussian(self.params.sigma)
         b = a * s + pt + e
+        if seeded:
+            return Ciphertext([None, b], self.params.scale, level, seed=seed)
         return Ciphertext([a, b], self.params.scale, level)
 
+    # (v * a + e0, v * b + e1): v 는 ternary, 복호화하면 v * e + e1 - e0 * s (작은 noise)
+    def encrypt_zero_public(self, public_key: "PublicKey", level: int) -> "Ciphertext":
+        cycloRing = self.params.rings[level]
+        a, b = public_key._fitting(level)
+        v = cycloRing.sample_ternary()
+        e0 = cycloRing.sample_Gaussian(self.params.sigma)
+        e1 = cycloRing.sample_Gaussian(self.params.sigma)
+        return Ciphertext([v * a + e0, v * b + e1], self.params.scale, level)
+
+    # pool 이 있으면 미리 만들어 둔 0 의 암호문에 평문만 더함 (ring 곱셈 없음)
+    def encrypt_public(self, plaintext: "Plaintext", public_key: "PublicKey",
+                       pool: "ZeroEncryptionPool | None" = None) -> "Ciphertext":
+        level = plaintext.level
+        if pool is not None:
+            _check_pool_level(pool.level, level)
+            zero = pool.take()
+        else:
+            zero = self.encrypt_zero_public(public_key, level)
+        a, b = zero.components
+        return Ciphertext([a, b + plaintext.ringelem], self.params.scale, level)
+
     def decrypt(self, ciphertext: "Ciphertext", secret_key: "SecretKey") -> "Plaintext":
-        _check_ciphertext_components(ciphertext)
+        _check_ciphertext_size(ciphertext)
+        if len(ciphertext.components) == 3: # relinearize 전의 암호문
+            return self.decrypt_triple(ciphertext, secret_key)
         a, b = ciphertext.components
         current_level = ciphertext.level
         fitted_s = secret_key._fitting(current_level)
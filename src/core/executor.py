@@ -0,0 +1,70 @@
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
+from core.parameters import CKKSParameters
+from lib.Polynomial import CyclotomicRing, RingElem
+
+# 하나의 연산 안에서 서로 독립인 ring 곱 (tensor 의 3개, key switching 의 2개) 을
+# executor 에 나눠서 실행. executor 가 None 이면 그 자리에서 순서대로 계산.
+#
+# thread pool: RingElem 을 그대로 넘김 (numpy 연산 중에는 GIL 이 풀림).
+# process pool: make_executor 로 만든 worker 가 params 를 가지고 있고,
+#               피연산자와 결과는 직렬화된 bytes 와 ring 번호 (level, auxRing 은 -1) 로 주고받음.
+
+_WORKER_PARAMS: list = []
+
+def _init_worker(params: "CKKSParameters"):
+    _WORKER_PARAMS[:] = [params]
+
+def make_executor(params: "CKKSParameters", kind: str = "thread",
+                  workers: int | None = None) -> "Executor":
+    """Executor for Operator / CryptoContext(executor=...): kind is "thread" or "process"."""
+    if kind == "thread":
+        executor = ThreadPoolExecutor(workers)
+    elif kind == "process":
+        executor = ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(params,))
+    else:
+        raise ValueError(f"unknown executor kind {kind!r}")
+    # Operator 가 다른 params 의 executor 를 거부할 수 있도록 (process worker 의 ring 은 이 params 기준)
+    executor.chain_id = params.chain_id
+    return executor
+
+def ring_products(executor: "Executor | None", params: "CKKSParameters",
+                  pairs: list[tuple["RingElem", "RingElem"]], divisor: int | None = None,
+                  target: "CyclotomicRing | None" = None) -> list["RingElem"]:
+    """[x * y for x, y in pairs], each optionally followed by div_round(divisor, target)."""
+    if executor is None or len(pairs) < 2:
+        return [_product(x, y, divisor, target) for x, y in pairs]
+
+    if not isinstance(executor, ProcessPoolExecutor):
+        futures = [executor.submit(_product, x, y, divisor, target) for x, y in pairs]
+        return [f.result() for f in futures]
+
+    out_ring = target if divisor is not None else pairs[0][0].ring
+    target_key = _ring_key(params, target) if divisor is not None else None
+    futures = [executor.submit(_product_task, _ring_key(params, x.ring), x.to_bytes(),
+                               y.to_bytes(), divisor, target_key) for x, y in pairs]
+    return [out_ring.from_bytes(f.result()) for f in futures]
+
+def _product(x: "RingElem", y: "RingElem", divisor: int | None,
+             target: "CyclotomicRing | None") -> "RingElem":
+    product = x * y
+    if divisor is not None:
+        product = product.div_round(divisor, target)
+    return product
+
+def _product_task(ring_key: int, x_bytes: bytes, y_bytes: bytes, divisor: int | None,
+                  target_key: int | None) -> bytes:
+    params = _WORKER_PARAMS[0]
+    ring = _ring(params, ring_key)
+    target = _ring(params, target_key) if target_key is not None else None
+    return _product(ring.from_bytes(x_bytes), ring.from_bytes(y_bytes), divisor, target).to_bytes()
+
+def _ring_key(params: "CKKSParameters", ring: "CyclotomicRing") -> int:
+    if ring is params.auxRing:
+        return -1
+    for level, r in enumerate(params.rings):
+        if r is ring:
+            return level
+    raise RuntimeError("Ring does not belong to these parameters.")
+
+def _ring(params: "CKKSParameters", key: int) -> "CyclotomicRing":
+    return params.auxRing if key == -1 else params.rings[key]
@@ -1,6 +1,7 @@
 from core.parameters import CKKSParameters
 from lib.Ciphertext import Ciphertext 
-from lib.Keys import SecretKey, RelinearizationKey, RotationKey
+from lib.Keys import SecretKey, PublicKey, RelinearizationKey, RotationKey, RotationKeySet
+from lib.Sampler import new_seed
 
 class KeyGenerator:
     def __init__(self, params: CKKSParameters):
@@ -11,8 +12,22 @@ class KeyGenerator:
         cycloRing = self.params.rings[self.params.max_level]
         return SecretKey(self.params, cycloRing.sample_ternary())
 
-    def gen_relinearization_key(self, secret_key: "SecretKey") -> "RelinearizationKey":
-        aux_scale = 1 << self.params.log_aux_scale
+    # (a, b = a * s + e): secret key 없이 암호화할 수 있도록
+    def gen_public_key(self, secret_key: "SecretKey", seeded: bool = False) -> "PublicKey":
+        level = self.params.max_level
+        cycloRing = self.params.rings[level]
+        s = secret_key._fitting(level).ringelem
+        seed = new_seed() if seeded else None
+        a = cycloRing.expand_uniform(seed) if seeded else cycloRing.random_uniform()
+        e = cycloRing.sample_Gaussian(self.params.sigma)
+        b = a * s + e
+        if seeded:
+            return PublicKey(self.params, Ciphertext([None, b], self.params.scale, level, seed=seed))
+        return PublicKey(self.params, Ciphertext([a, b], self.params.scale, level))
+
+    def gen_relinearization_key(self, secret_key: "SecretKey",
+                                seeded: bool = False) -> "RelinearizationKey":
+        aux_scale = self.params.aux_scale
         auxRing = self.params.auxRing
         s = secret_key.ringelem
         ss = s * s
@@ -20,27 +35,52 @@ class KeyGenerator:
         scaled = new_ring_s.scalarmul(aux_scale)
 
         S = auxRing.from_coeffs(s.poly._center_reduce())
-        A = auxRing.random_uniform()
-        E = auxRing.sample_Gaussian()
+        seed = new_seed() if seeded else None
+        A = auxRing.expand_uniform(seed) if seeded else auxRing.random_uniform()
+        E = auxRing.sample_Gaussian(self.params.sigma)
 
         B = A * S + scaled + E
-        key = Ciphertext([A, B], aux_scale, self.params.max_level)
+        key = self._key_ciphertext(A, B, seed)
 
         return RelinearizationKey(self.params, key) 
 
-    def gen_rotation_key(self, shift: int, secret_key: "SecretKey") -> "RotationKey":
-        aux_scale = 1 << self.params.log_aux_scale
+    def gen_rotation_key(self, shift: int, secret_key: "SecretKey",
+                         seeded: bool = False) -> "RotationKey":
+        aux_scale = self.params.aux_scale
         auxRing = self.params.auxRing
         s = secret_key.ringelem
-        auto_s = s.Auto(5 ** shift) # Overflow 조심
+        auto_s = s.Auto(s.ring.galois_element(shift))
         new_ring_s = auxRing.from_coeffs(auto_s.poly.coeffs)
         scaled = new_ring_s.scalarmul(aux_scale)
 
         S = auxRing.from_coeffs(s.poly._center_reduce())
-        A = auxRing.random_uniform()
-        E = auxRing.sample_Gaussian()
+        seed = new_seed() if seeded else None
+        A = auxRing.expand_uniform(seed) if seeded else auxRing.random_uniform()
+        E = auxRing.sample_Gaussian(self.params.sigma)
 
         B = A * S - scaled + E
-        key = Ciphertext([A, B], aux_scale, self.params.max_level)
+        key = self._key_ciphertext(A, B, seed)
 
         return RotationKey(self.params, key, shift)
+
+    # +-2^i (i < log2(slots)) 와 추가 shift 들의 key: O(log slots) 개
+    def gen_rotation_keyset(self, secret_key: "SecretKey", extra_shifts=(),
+                            seeded: bool = False) -> "RotationKeySet":
+        slots = self.params.slot_count
+        shifts = set()
+        power = 1
+        while power < slots:
+            shifts.add(power)
+            if power != slots // 2: # slots/2 와 -slots/2 는 같은 회전
+                shifts.add(-power)
+            power *= 2
+        shifts.update(int(shift) for shift in extra_shifts)
+
+        keys = {shift: self.gen_rotation_key(shift, secret_key, seeded) for shift in sorted(shifts)}
+        return RotationKeySet(self.params, keys)
+
+    # seed 가 있으면 A 는 버리고 seed 만 저장
+    def _key_ciphertext(self, A: "RingElem", B: "RingElem", seed: bytes | None) -> "Ciphertext":
+        if seed is not None:
+            return Ciphertext([None, B], self.params.aux_scale, self.params.max_level, seed=seed)
+        return Ciphertext([A, B], self.params.aux_scale, self.params.max_level)
@@ -3,36 +3,56 @@ from lib.Plaintext import Plaintext
 from lib.Polynomial import RingElem
 from lib.Keys import RelinearizationKey, RotationKey
 from core.parameters import CKKSParameters
+from core.executor import ring_products
 from utils.rejections import (_check_ciphertext_components,
+                              _check_ciphertext_size,
                               _check_components,
+                              _check_two_or_three_components,
                               _check_triple_components,
+                              _check_relinearizable,
+                              _check_relinearization_key,
+                              _check_dot_operands,
+                              _check_executor,
                               _is_small_level_ct,
                               _is_small_level_pt,
-                              _is_level_zero)
+                              _is_level_zero,
+                              _is_rescalable_level)
 
 class Operator:
-    def __init__(self, params: "CKKSParameters"):
+    # executor: 연산 하나 안의 독립적인 ring 곱을 나눠서 실행 (core.executor.make_executor)
+    def __init__(self, params: "CKKSParameters", executor: "Executor | None" = None):
+        _check_executor(executor, params)
         self.params= params
+        self.executor = executor
 
     # --- Utils ---
     def _level_down_ct(self, ct: Ciphertext, target_level: int) -> Ciphertext:
-        _check_ciphertext_components(ct)
+        _check_ciphertext_size(ct)
         _is_small_level_ct(ct, target_level)
 
         if ct.level == target_level:
             return ct
 
         cycloRing = self.params.rings[target_level]
-        a, b = ct.components
+        level_downed = [cycloRing.from_coeffs(c.poly._center_reduce()) for c in ct.components]
 
-        coeffs_a = a.poly._center_reduce()
-        coeffs_b = b.poly._center_reduce()
+        return Ciphertext(level_downed, self.params.scale, target_level)
 
-        level_downed_a = cycloRing.from_coeffs(coeffs_a)
-        level_downed_b = cycloRing.from_coeffs(coeffs_b)
+    # (a, b) 는 (0, a, b) 와 같은 평문을 가지는 3개짜리 암호문
+    def _to_triple(self, components: list["RingElem"]) -> list["RingElem"]:
+        if len(components) == 3:
+            return components
+        a, b = components
+        return [a.ring.zero(), a, b]
 
-        return Ciphertext([level_downed_a, level_downed_b],
-                          self.params.scale, target_level)
+    # 2개의 poly 가 필요한 연산 (rotation, mul) 앞에서만 relinearize
+    def _linearize(self, ct: Ciphertext,
+                   relinearization_key: "RelinearizationKey | None") -> Ciphertext:
+        _check_ciphertext_size(ct)
+        if len(ct.components) == 2:
+            return ct
+        _check_relinearizable(ct, relinearization_key)
+        return self.relinearize_ciphertext(ct, relinearization_key)
 
     def _level_down_pt(self, pt: Plaintext, target_level: int) -> Plaintext:
         _is_small_level_pt(pt, target_level)
@@ -46,33 +66,91 @@ class Operator:
 
     # --- Additions ---
     def add(self, ct1: Ciphertext, ct2: Ciphertext) -> Ciphertext:
-        _check_ciphertext_components(ct1)
-        _check_ciphertext_components(ct2)
+        _check_ciphertext_size(ct1)
+        _check_ciphertext_size(ct2)
 
         min_level = min(ct1.level, ct2.level)
-        level_downed1 = self._level_down_ct(ct1, min_level)
-        level_downed2 = self._level_down_ct(ct2, min_level)
+        components1 = self._level_down_ct(ct1, min_level).components
+        components2 = self._level_down_ct(ct2, min_level).components
 
-        a1, b1 = level_downed1.components
-        a2, b2 = level_downed2.components
+        # 하나라도 relinearize 전이면 3개짜리로 맞춰서 더함
+        if len(components1) != len(components2):
+            components1 = self._to_triple(components1)
+            components2 = self._to_triple(components2)
 
-        added_a = a1 + a2
-        added_b = b1 + b2
+        added = [c1 + c2 for c1, c2 in zip(components1, components2)]
 
-        return Ciphertext([added_a, added_b], self.params.scale, min_level)
+        return Ciphertext(added, self.params.scale, min_level)
 
     def add_plain(self, ct: Ciphertext, pt: Plaintext) -> Ciphertext:
-        _check_ciphertext_components(ct)
+        _check_ciphertext_size(ct)
         ct_level = ct.level
         level_downed_pt = self._level_down_pt(pt, ct_level)
-        a, b = ct.components
+        *rest, b = ct.components
         p = level_downed_pt.ringelem
         added_b = b + p
-        return Ciphertext([a, added_b], self.params.scale, ct_level)
+        # b 이외의 component 도 복사: 결과에 add_inplace 를 해도 ct 는 그대로
+        return Ciphertext([c.copy() for c in rest] + [added_b], self.params.scale, ct_level)
+
+    # --- In-place ---
+    # dst 의 component 버퍼를 직접 수정 (accumulation loop 에서 할당 없음).
+    # 공개 연산의 결과는 입력과 component 를 공유하지 않으므로 그대로 dst 로 써도 됨.
+    # 직접 component 를 나눠 가진 암호문 (Ciphertext(ct.components, ...)) 은 먼저 ct.copy().
+    def add_inplace(self, dst: Ciphertext, src: Ciphertext) -> Ciphertext:
+        _check_ciphertext_size(dst)
+        _check_ciphertext_size(src)
+
+        if dst.level > src.level:
+            dst.components = self._level_down_ct(dst, src.level).components
+            dst.level = src.level
+        src_components = self._level_down_ct(src, dst.level).components
+
+        if len(dst.components) < len(src_components):
+            dst.components = self._to_triple(dst.components)
+        elif len(dst.components) > len(src_components):
+            src_components = self._to_triple(src_components)
+
+        for c_dst, c_src in zip(dst.components, src_components):
+            c_dst.iadd(c_src)
+        dst.seed = None # a 가 바뀌었으므로 seed 는 무효
+        return dst
+
+    # rescale 로 ring 이 바뀌므로 component 는 새로 만들고 dst 객체만 재사용
+    def mul_plain_inplace(self, dst: Ciphertext, pt: Plaintext) -> Ciphertext:
+        multiplied = self.mul_plain(dst, pt)
+        dst.components, dst.level = multiplied.components, multiplied.level
+        return dst
+
+    def rotate_inplace(self, dst: Ciphertext, rotation_key: "RotationKey") -> Ciphertext:
+        rotated = self.rotation(dst, rotation_key)
+        dst.components = rotated.components
+        return dst
 
     # --- Multiplications ---
+    # relinearize=False 이면 rescale 만 하고 3개짜리 암호문 (aa, abba, bb) 을 반환.
+    # relinearize 는 2개짜리가 필요한 연산 (rotation, 다음 mul) 에서 또는 명시적으로.
     def mul(self, ct1: "Ciphertext", ct2: "Ciphertext",
-            relinearization_key: "RelinearizationKey") -> "Ciphertext":
+            relinearization_key: "RelinearizationKey | None",
+            relinearize: bool = True) -> "Ciphertext":
+        ct1 = self._linearize(ct1, relinearization_key)
+        ct2 = self._linearize(ct2, relinearization_key)
+        min_level = min(ct1.level, ct2.level)
+        tensored = self.tensor(ct1, ct2)
+
+        if not relinearize:
+            rescaled = self.rescale(tensored, min_level - 1)
+            return Ciphertext(rescaled, self.params.scale, min_level - 1)
+
+        _check_relinearization_key(relinearization_key)
+        relin_a, relin_b = self.relinearize(tensored, relinearization_key, min_level)
+        rescaled_a, rescaled_b = self.rescale([relin_a, relin_b], min_level - 1)
+
+        return Ciphertext([rescaled_a, rescaled_b], self.params.scale, min_level-1)
+
+    # (a1, b1) x (a2, b2) -> (aa, abba, bb), rescale 전
+    def tensor(self, ct1: "Ciphertext", ct2: "Ciphertext") -> list["RingElem"]:
+        _check_ciphertext_components(ct1)
+        _check_ciphertext_components(ct2)
         min_level = min(ct1.level, ct2.level)
         level_downed_ct1 = self._level_down_ct(ct1, min_level)
         level_downed_ct2 = self._level_down_ct(ct2, min_level)
@@ -80,45 +158,80 @@ class Operator:
         a1, b1 = level_downed_ct1.components
         a2, b2 = level_downed_ct2.components
 
-        aa = a1 * a2
-        abba = a1 * b2 + b1 * a2
-        bb = b1 * b2
-
-        relin_a, relin_b = self.relinearize([aa, abba, bb], relinearization_key, min_level)
-        rescaled_a, rescaled_b = self.rescale([relin_a, relin_b], min_level - 1)
+        # a1*b2 + b1*a2 = (a1+b1)(a2+b2) - a1*a2 - b1*b2: 곱 3번
+        aa, bb, cross = ring_products(self.executor, self.params,
+                                      [(a1, a2), (b1, b2), (a1 + b1, a2 + b2)])
+        abba = cross - aa - bb
 
-        return Ciphertext([rescaled_a, rescaled_b], self.params.scale, min_level-1)
+        return [aa, abba, bb]
 
     def mul_plain(self, ct: Ciphertext, pt: Plaintext) -> "Ciphertext":
-        _check_ciphertext_components(ct)
+        _check_ciphertext_size(ct)
         _is_level_zero(ct)
         ct_level = ct.level
         level_downed_pt = self._level_down_pt(pt, ct_level)
         p = level_downed_pt.ringelem
-        a, b = ct.components
-        multiplied_a = a * p
-        multiplied_b = b * p
+        multiplied = [c * p for c in ct.components]
 
         downed_level = ct_level - 1
-        rescaled_a, rescaled_b = self.rescale([multiplied_a, multiplied_b], downed_level)
-
-        return Ciphertext([rescaled_a, rescaled_b], self.params.scale, downed_level)
+        rescaled = self.rescale(multiplied, downed_level)
+
+        return Ciphertext(rescaled, self.params.scale, downed_level)
+
+    # sum_i ct1_i * ct2_i: tensor 결과를 rescale 전 상태로 누적하고
+    # relinearize, rescale 은 마지막에 한 번만
+    def dot(self, cts1: list["Ciphertext"], cts2: list["Ciphertext"],
+            relinearization_key: "RelinearizationKey | None",
+            relinearize: bool = True) -> "Ciphertext":
+        _check_dot_operands(cts1, cts2)
+        cts1 = [self._linearize(ct, relinearization_key) for ct in cts1]
+        cts2 = [self._linearize(ct, relinearization_key) for ct in cts2]
+        min_level = min(ct.level for ct in cts1 + cts2)
+        _is_rescalable_level(min_level)
+
+        acc = None
+        for ct1, ct2 in zip(cts1, cts2):
+            tensored = self.tensor(self._level_down_ct(ct1, min_level),
+                                   self._level_down_ct(ct2, min_level))
+            acc = tensored if acc is None else [x + y for x, y in zip(acc, tensored)]
+
+        if relinearize:
+            _check_relinearization_key(relinearization_key)
+            acc = self.relinearize(acc, relinearization_key, min_level)
+        rescaled = self.rescale(acc, min_level - 1)
+
+        return Ciphertext(rescaled, self.params.scale, min_level - 1)
+
+    # sum_i ct_i * pt_i: rescale 은 마지막에 한 번만
+    def dot_plain(self, cts: list["Ciphertext"], pts: list["Plaintext"]) -> "Ciphertext":
+        _check_dot_operands(cts, pts)
+        for ct in cts:
+            _check_ciphertext_size(ct)
+        min_level = min(min(ct.level for ct in cts), min(pt.level for pt in pts))
+        _is_rescalable_level(min_level)
+
+        # 하나라도 3개짜리면 전부 3개짜리로 맞춤
+        triple = any(len(ct.components) == 3 for ct in cts)
+        acc = None
+        for ct, pt in zip(cts, pts):
+            components = self._level_down_ct(ct, min_level).components
+            if triple:
+                components = self._to_triple(components)
+            p = self._level_down_pt(pt, min_level).ringelem
+            multiplied = [c * p for c in components]
+            acc = multiplied if acc is None else [x + y for x, y in zip(acc, multiplied)]
+
+        rescaled = self.rescale(acc, min_level - 1)
+
+        return Ciphertext(rescaled, self.params.scale, min_level - 1)
 
     def rescale(self, components: list["RingElem"], downed_level: int) -> list["RingElem"]:
-        _check_components(components)
+        _check_two_or_three_components(components)
         cycloRing = self.params.rings[downed_level]
-        log_scale = self.params.log_scale
-
-        a, b = components
-        coeffs_a, coeffs_b = a.poly.coeffs, b.poly.coeffs
-        for i in range(self.params.N):
-            coeffs_a[i] = div_round_power2(coeffs_a[i], log_scale)
-            coeffs_b[i] = div_round_power2(coeffs_b[i], log_scale)
+        # power-of-two: 2^log_scale, RNS: 마지막 prime q_l
+        divisor = self.params.rings[downed_level + 1].modsys.q // cycloRing.modsys.q
 
-        new_a = cycloRing.from_coeffs(coeffs_a)
-        new_b = cycloRing.from_coeffs(coeffs_b)
-
-        return [new_a, new_b]
+        return [c.div_round(divisor, cycloRing) for c in components]
 
     # --- Rotation ---
     def rotation(self, ciphertext: "Ciphertext", rotation_key: "RotationKey") -> "Ciphertext":
@@ -127,36 +240,50 @@ class Operator:
         current_level = ciphertext.level
 
         a,b = ciphertext.components
-        auto_a = a.Auto(5 ** shift)
-        auto_b = b.Auto(5 ** shift)
+        k = a.ring.galois_element(shift)
+        auto_a = a.Auto(k)
+        auto_b = b.Auto(k)
 
         [switched_a, switched_b] = self.keyswitch([auto_a, auto_b], rotation_key, current_level)
 
         return Ciphertext([switched_a, switched_b], self.params.scale, current_level)
 
+    # Halevi-Shoup hoisting: a 를 auxRing 으로 lift 하는 전처리는 한 번만 하고
+    # shift 마다 lift 된 a 에 automorphism (permutation) 과 key 곱만 수행
+    def rotate_many(self, ciphertext: "Ciphertext",
+                    rotation_keys: list["RotationKey"]) -> dict[int, "Ciphertext"]:
+        _check_ciphertext_components(ciphertext)
+        current_level = ciphertext.level
+
+        a, b = ciphertext.components
+        lifted_a = self.params.auxRing._from_reduced(a.poly.coeffs)
+
+        rotated = {}
+        for rotation_key in rotation_keys:
+            k = a.ring.galois_element(rotation_key.shift)
+            auto_b = b.Auto(k)
+            new_a, new_b = self._switch(lifted_a.Auto(k), rotation_key.key, current_level)
+            rotated[rotation_key.shift] = Ciphertext([new_a, auto_b + new_b],
+                                                     self.params.scale, current_level)
+        return rotated
+
     # --- Key Switchings ---
+    def relinearize_ciphertext(self, ct: "Ciphertext",
+                               relinearization_key: "RelinearizationKey") -> "Ciphertext":
+        _check_ciphertext_size(ct)
+        if len(ct.components) == 2:
+            return ct
+        relinearized = self.relinearize(ct.components, relinearization_key, ct.level)
+        return Ciphertext(relinearized, ct.scale, ct.level)
+
     def relinearize(self, components: list["RingElem"], relinearization_key: "RelinearizationKey",
                     current_level: int) -> list["RingElem"]:
         _check_triple_components(components)
         auxRing = self.params.auxRing
-        cycloRing = self.params.rings[current_level]
-        log_aux_scale = self.params.log_aux_scale
 
         aa, abba, bb = components
-        key_a, key_b = relinearization_key.key.components
-
-        tmp_aa = auxRing.from_coeffs(aa.poly.coeffs)
-
-        re_a = tmp_aa * key_a
-        re_b = tmp_aa * key_b
-
-        coeffs_a, coeffs_b =  re_a.poly.coeffs, re_b.poly.coeffs
-        for i in range(self.params.N):
-            coeffs_a[i] = div_round_power2(coeffs_a[i], log_aux_scale)
-            coeffs_b[i] = div_round_power2(coeffs_b[i], log_aux_scale)
-
-        new_a = cycloRing.from_coeffs(coeffs_a)
-        new_b = cycloRing.from_coeffs(coeffs_b)
+        tmp_aa = auxRing._from_reduced(aa.poly.coeffs)
+        new_a, new_b = self._switch(tmp_aa, relinearization_key.key, current_level)
 
         return [abba + new_a, bb + new_b]
 
@@ -164,28 +291,30 @@ class Operator:
                   current_level: int) -> list["RingElem"]:
         _check_components(components)
         auxRing = self.params.auxRing
-        cycloRing = self.params.rings[current_level]
-        log_aux_scale = self.params.log_aux_scale
 
         auto_a, auto_b = components
-        key_a, key_b = rotation_key.key.components
-
-        tmp_aa = auxRing.from_coeffs(auto_a.poly.coeffs)
+        tmp_aa = auxRing._from_reduced(auto_a.poly.coeffs)
+        new_a, new_b = self._switch(tmp_aa, rotation_key.key, current_level)
 
-        switched_a = tmp_aa * key_a
-        switched_b = tmp_aa * key_b
+        return [new_a, auto_b + new_b]
 
-        coeffs_a, coeffs_b =  switched_a.poly.coeffs, switched_b.poly.coeffs
-        for i in range(self.params.N):
-            coeffs_a[i] = div_round_power2(coeffs_a[i], log_aux_scale)
-            coeffs_b[i] = div_round_power2(coeffs_b[i], log_aux_scale)
+    # lift 된 (auxRing) 원소와 key 의 곱을 aux_scale 로 나누어 current_level 로 내림
+    def _switch(self, lifted: "RingElem", key: "Ciphertext",
+                current_level: int) -> list["RingElem"]:
+        cycloRing = self.params.rings[current_level]
+        aux_scale = self.params.aux_scale
+        key_a, key_b = key.components
 
-        new_a = cycloRing.from_coeffs(coeffs_a)
-        new_b = cycloRing.from_coeffs(coeffs_b)
-
-        return [new_a, auto_b + new_b]
+        return ring_products(self.executor, self.params, [(lifted, key_a), (lifted, key_b)],
+                             aux_scale, cycloRing)
 
 def div_round_power2(a, shift):
     # arr: np.ndarray of ints mod q (0..q-1)
     # 반올림 나눗셈: floor((x + 2^(shift-1)) / 2^shift)
     return (a + (1 << (shift-1))) >> shift
+
+def div_round(a, divisor):
+    # 반올림 나눗셈: floor((x + divisor/2) / divisor)
+    if divisor & (divisor - 1) == 0:
+        return div_round_power2(a, divisor.bit_length() - 1)
+    return (a + (divisor >> 1)) // divisor
@@ -0,0 +1,187 @@
+import multiprocessing
+import numpy as np
+from core.parameters import CKKSParameters
+from core.cryptocontext import CryptoContext
+from lib.Ciphertext import Ciphertext
+from lib.Keys import SecretKey, PublicKey, RelinearizationKey, RotationKey, RotationKeySet
+from lib.SharedArena import ArenaHandle, CiphertextArena
+from utils.rejections import _check_worker_key
+
+# 독립적인 암호문 batch 를 process pool 로 나눠서 처리.
+# worker 는 시작할 때 한 번만 params / key 를 받아서 CryptoContext 를 만들어 두고,
+# task 마다 주고받는 것은 직렬화된 암호문 (bytes) 뿐.
+# arena 를 쓰면 암호문은 shared memory slot 에 두고 handle 만 주고받음:
+# 입력은 worker 에서 복사 없이 view 로 읽고, 결과는 parent 가 미리 잡아 둔 slot 에 씀.
+
+_WORKER: dict = {}
+
+# task 하나가 동시에 쓰는 arena slot 의 최대 수 (mul_map: 입력 2개 + 결과 1개)
+MAX_SLOTS_PER_TASK = 3
+
+def _init_worker(params: "CKKSParameters", key_blobs: dict, arena_name: str | None = None):
+    cc = CryptoContext(params)
+    _WORKER.clear()
+    _WORKER["cc"] = cc
+    _WORKER["params"] = params
+    if arena_name is not None:
+        _WORKER["arena"] = CiphertextArena.attach(arena_name, params)
+    if "secret_key" in key_blobs:
+        _WORKER["secret_key"] = SecretKey.from_bytes(key_blobs["secret_key"], params)
+    if "public_key" in key_blobs:
+        _WORKER["public_key"] = PublicKey.from_bytes(key_blobs["public_key"], params)
+    if "relinearization_key" in key_blobs:
+        _WORKER["relinearization_key"] = RelinearizationKey.from_bytes(
+            key_blobs["relinearization_key"], params)
+    if "rotation_keys" in key_blobs:
+        keys = [RotationKey.from_bytes(blob, params) for blob in key_blobs["rotation_keys"]]
+        _WORKER["rotation_keys"] = RotationKeySet(params, {key.shift: key for key in keys})
+
+# ref: 직렬화된 bytes 혹은 arena handle
+def _load(ref: "bytes | ArenaHandle") -> "Ciphertext":
+    if isinstance(ref, ArenaHandle):
+        return _WORKER["arena"].get(ref, copy=False)
+    return Ciphertext.from_bytes(ref, _WORKER["params"])
+
+def _dump(ct: "Ciphertext", out: "ArenaHandle | None") -> "bytes | ArenaHandle":
+    if out is not None:
+        return _WORKER["arena"].write(out, ct)
+    return ct.to_bytes(_WORKER["params"])
+
+def _encrypt_task(args) -> "bytes | ArenaHandle":
+    msg, level, out = args
+    cc = _WORKER["cc"]
+    if "secret_key" in _WORKER:
+        return _dump(cc.encrypt(msg, _WORKER["secret_key"], level), out)
+    return _dump(cc.encrypt_public(msg, _WORKER["public_key"], level), out)
+
+def _decrypt_task(args) -> np.ndarray:
+    ref, _ = args
+    return _WORKER["cc"].decrypt(_load(ref), _WORKER["secret_key"])
+
+def _mul_task(args) -> "bytes | ArenaHandle":
+    ref1, ref2, out = args
+    cc = _WORKER["cc"]
+    return _dump(cc.mul(_load(ref1), _load(ref2), _WORKER.get("relinearization_key")), out)
+
+def _rotate_task(args) -> "bytes | ArenaHandle":
+    ref, shift, out = args
+    cc = _WORKER["cc"]
+    return _dump(cc.rotate_by(_load(ref), shift, _WORKER["rotation_keys"],
+                              _WORKER.get("relinearization_key")), out)
+
+class ParallelCryptoContext(CryptoContext):
+    """CryptoContext whose *_map methods run over a persistent process pool.
+
+    key 는 생성자에서 한 번만 worker 에 전달되고 (직렬화된 bytes), 암호문도 bytes 로 주고받음.
+    arena_slots 를 주면 그 크기의 CiphertextArena 를 만들어 암호문을 shared memory 로 주고받음.
+    단일 연산은 CryptoContext 와 같이 현재 process 에서 실행.
+    """
+    def __init__(self, params: "CKKSParameters", processes: int | None = None,
+                 secret_key: "SecretKey | None" = None,
+                 public_key: "PublicKey | None" = None,
+                 relinearization_key: "RelinearizationKey | None" = None,
+                 rotation_keys: "RotationKeySet | list[RotationKey] | None" = None,
+                 chunksize: int = 1, mp_context=None, arena_slots: int | None = None):
+        if arena_slots is not None and arena_slots < MAX_SLOTS_PER_TASK:
+            raise ValueError(f"arena_slots should be at least {MAX_SLOTS_PER_TASK}")
+        super().__init__(params)
+        self.chunksize = chunksize
+        key_blobs = {}
+        if secret_key is not None:
+            key_blobs["secret_key"] = secret_key.to_bytes()
+        if public_key is not None:
+            key_blobs["public_key"] = public_key.to_bytes()
+        if relinearization_key is not None:
+            key_blobs["relinearization_key"] = relinearization_key.to_bytes()
+        if rotation_keys is not None:
+            if isinstance(rotation_keys, RotationKeySet):
+                rotation_keys = [rotation_keys[shift] for shift in rotation_keys.shifts]
+            key_blobs["rotation_keys"] = [key.to_bytes() for key in rotation_keys]
+        self._keys = set(key_blobs)
+        self.arena = CiphertextArena(params, arena_slots) if arena_slots is not None else None
+        arena_name = self.arena.name if self.arena is not None else None
+        ctx = mp_context or multiprocessing.get_context()
+        self.pool = ctx.Pool(processes, initializer=_init_worker,
+                             initargs=(params, key_blobs, arena_name))
+
+    def encrypt_map(self, msgs, level: int = -1) -> list["Ciphertext"]:
+        _check_worker_key(self._keys, "secret_key", "public_key")
+        if level == -1:
+            level = self.params.max_level
+        items = [([], (np.asarray(msg), level)) for msg in msgs]
+        return self._run(_encrypt_task, items, True)
+
+    def decrypt_map(self, cts: list["Ciphertext"]) -> np.ndarray:
+        _check_worker_key(self._keys, "secret_key")
+        return np.array(self._run(_decrypt_task, [([ct], ()) for ct in cts], False))
+
+    def mul_map(self, cts1: list["Ciphertext"], cts2: list["Ciphertext"]) -> list["Ciphertext"]:
+        _check_worker_key(self._keys, "relinearization_key")
+        items = [([ct1, ct2], ()) for ct1, ct2 in zip(cts1, cts2, strict=True)]
+        return self._run(_mul_task, items, True)
+
+    # shifts: 정수 하나 (모두 같은 회전) 혹은 암호문마다 하나씩
+    def rotate_map(self, cts: list["Ciphertext"], shifts) -> list["Ciphertext"]:
+        _check_worker_key(self._keys, "rotation_keys")
+        if np.isscalar(shifts):
+            shifts = [int(shifts)] * len(cts)
+        items = [([ct], (int(shift),)) for ct, shift in zip(cts, shifts, strict=True)]
+        return self._run(_rotate_task, items, True)
+
+    def close(self):
+        self.pool.close()
+        self.pool.join()
+        if self.arena is not None:
+            self.arena.unlink()
+
+    def terminate(self):
+        self.pool.terminate()
+        self.pool.join()
+        if self.arena is not None:
+            self.arena.unlink()
+
+    def __enter__(self) -> "ParallelCryptoContext":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # items: (입력 암호문 list, 나머지 인자) 의 list
+    # output: 결과가 암호문이면 True (arena 에서는 결과용 slot 을 미리 잡음)
+    def _run(self, task, items: list, output: bool) -> list:
+        if self.arena is None:
+            tasks = [(*[ct.to_bytes(self.params) for ct in cts], *args, None)
+                     for cts, args in items]
+            results = self.pool.map(task, tasks, self.chunksize)
+            if not output:
+                return results
+            return [Ciphertext.from_bytes(data, self.params) for data in results]
+
+        # task 하나가 쓰는 slot 수 만큼씩 나눠서 실행
+        per_task = max(1, len(items[0][0]) + output) if items else 1
+        step = max(1, self.arena.slots // per_task)
+        results = []
+        for start in range(0, len(items), step):
+            results.extend(self._run_arena(task, items[start:start + step], output))
+        return results
+
+    def _run_arena(self, task, items: list, output: bool) -> list:
+        arena = self.arena
+        handles = []
+        try:
+            tasks = []
+            for cts, args in items:
+                refs = [arena.put(ct) for ct in cts]
+                handles.extend(refs)
+                out = None
+                if output:
+                    out = arena.reserve()
+                    handles.append(out)
+                tasks.append((*refs, *args, out))
+            results = self.pool.map(task, tasks, self.chunksize)
+            if not output:
+                return results
+            return [arena.get(handle) for handle in results]
+        finally:
+            for handle in handles:
+                arena.free(handle)
@@ -1,5 +1,7 @@
-import numpy as np
-from lib.Polynomial import CyclotomicRing, SingleMod
+import hashlib
+import math
+from lib.Polynomial import CyclotomicRing, SingleMod, RNSMod
+from lib.NTT import gen_ntt_primes, gen_ntt_primes_near, WORD_BITS
 
 # q0 = 50bits 으로 가정
 def GenCyclotomicRings(N, log_scale, max_level):
@@ -10,9 +12,26 @@ def GenCyclotomicRings(N, log_scale, max_level):
         LOG += log_scale
     return rings
 
+# RNS: q0 (50bits 이하 prime) * q1 * ... * qL, q_i ~ 2^log_scale
+def GenRNSCyclotomicRings(N, log_scale, max_level):
+    if log_scale >= WORD_BITS:
+        raise ValueError(f"log_scale should be smaller than {WORD_BITS} for RNS")
+    q0 = gen_ntt_primes(50, N, 1)
+    primes = q0 + gen_ntt_primes_near(log_scale, N, max_level, exclude=tuple(q0))
+    rings = []
+    for level in range(max_level + 1):
+        rings.append(CyclotomicRing.create(N, RNSMod(tuple(primes[:level + 1]))))
+    return rings
+
+# RNS 의 special modulus P = p_0 * ... * p_k >= 2^log_aux_scale (근사)
+def GenSpecialPrimes(N, log_aux_scale, exclude):
+    count = -(-log_aux_scale // 50)
+    return gen_ntt_primes(50, N, count, exclude=tuple(exclude))
+
 # TODO: bottom_modulus 정의
 class CKKSParameters:
-    def __init__(self, N: int, log_q: int, log_scale: int, log_aux_scale: int, sigma: float = 3.2):
+    def __init__(self, N: int, log_q: int, log_scale: int, log_aux_scale: int, sigma: float = 3.2,
+                 rns: bool = False):
         self.N = N
         self.slot_count = N//2
         self.q = 1 << log_q
@@ -22,10 +41,23 @@ class CKKSParameters:
         self.log_aux_scale = log_aux_scale
         self.sigma = sigma
         self.max_level = (log_q - 50) // log_scale
+        self.rns = rns
 
         # Cyclotomic ring 초기화 
-        self.rings = GenCyclotomicRings(self.N, self.log_scale, self.max_level)
-        self.auxRing = CyclotomicRing.create(N, SingleMod(1 << int(log_q + log_aux_scale)))
+        if rns:
+            self.rings = GenRNSCyclotomicRings(self.N, self.log_scale, self.max_level)
+            chain = self.rings[-1].modsys.primes
+            special = GenSpecialPrimes(self.N, self.log_aux_scale, chain)
+            self.q = self.rings[-1].modsys.q
+            self.aux_scale = math.prod(special)
+            self.auxRing = CyclotomicRing.create(N, RNSMod(chain + tuple(special)))
+        else:
+            self.rings = GenCyclotomicRings(self.N, self.log_scale, self.max_level)
+            self.aux_scale = 1 << log_aux_scale
+            self.auxRing = CyclotomicRing.create(N, SingleMod(1 << int(log_q + log_aux_scale)))
 
-TOY = CKKSParameters(16, 250, 40, 300, 3.2) # max_level = 5
+        # 직렬화된 객체가 같은 modulus chain 위에서 만들어졌는지 확인하는 id
+        chain = [ring.modsys.q for ring in self.rings] + [self.auxRing.modsys.q]
+        self.chain_id = hashlib.sha256(repr((N, self.scale, chain)).encode()).digest()[:8]
 
+TOY = CKKSParameters(16, 250, 40, 300, 3.2) # max_level = 5
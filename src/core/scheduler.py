@@ -0,0 +1,125 @@
+import heapq
+import os
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+# CompiledCircuit 의 program (DAG) 을 의존성 순서대로 worker pool 에서 실행.
+#  - operand 가 모두 준비된 task 중 critical path (그 task 부터 출력까지 남은 비용) 가 긴 것부터
+#  - 중간 결과는 마지막 consumer 가 끝나는 즉시 버림 (최대 메모리 제한)
+# worker 는 thread: 암호문은 프로세스 안의 객체를 그대로 주고받고, 무거운 부분 (numpy) 은 GIL 을 풂.
+
+# op 별 대략적인 비용 (ring 곱셈 하나 = 1). 우선순위를 정하는 데만 씀
+OP_COST = {
+    "input": 0.1,
+    "level_down": 0.2,
+    "add": 0.1,
+    "add_plain": 0.1,
+    "mul_plain": 1.0,
+    "mul": 3.5,        # tensor 곱 3번 + rescale
+    "relinearize": 4.0, # auxRing 곱 2번 (ring 이 더 큼)
+    "rotate": 4.5,      # key switching + automorphism
+}
+
+def _node_cost(node) -> float:
+    if node.op == "dot":
+        return 3.0 * node.const + 0.5
+    if node.op == "dot_plain":
+        return len(node.const) + 0.5
+    return OP_COST[node.op]
+
+def critical_path(program: list) -> dict[int, float]:
+    """id(node) -> cost of the longest path from node to an output (node included)."""
+    consumers = {id(node): [] for node in program}
+    for node in program:
+        for a in node.args:
+            consumers[id(a)].append(node)
+    rank = {}
+    for node in reversed(program):
+        rank[id(node)] = _node_cost(node) + max((rank[id(c)] for c in consumers[id(node)]),
+                                                default=0.0)
+    return rank
+
+class DAGScheduler:
+    """Run a CompiledCircuit over a thread pool, critical path first.
+
+    executor 를 넘기면 그 pool 을 쓰고 (닫지 않음), 아니면 run 마다 workers 개짜리 pool 을 만듦.
+    workers=1 이면 pool 없이 현재 thread 에서 같은 순서로 실행.
+    """
+    def __init__(self, workers: int | None = None, executor: "ThreadPoolExecutor | None" = None):
+        self.workers = workers or os.cpu_count() or 1
+        if self.workers < 1:
+            raise ValueError("workers should be positive")
+        self.executor = executor
+        self.peak_live = 0 # 마지막 run 에서 동시에 살아 있던 암호문 수의 최대
+
+    def run(self, compiled: "CompiledCircuit", cc: "CryptoContext", inputs: dict,
+            relinearization_key=None, rotation_keys=None) -> dict:
+        tasks = compiled._tasks(rotation_keys)
+        rank = critical_path(compiled.program)
+        owner = {id(node): t for t, nodes in enumerate(tasks) for node in nodes}
+
+        # task 별 operand (다른 task 의 node) 와 node 별로 그 값을 쓰는 task
+        deps = []
+        users = {}
+        for t, nodes in enumerate(tasks):
+            own = {id(node) for node in nodes}
+            operands = {id(a): a for node in nodes for a in node.args if id(a) not in own}
+            deps.append(list(operands.values()))
+            for key in operands:
+                users.setdefault(key, []).append(t)
+        waiting = [len({owner[id(a)] for a in operands}) for operands in deps]
+        remaining_uses = {key: len(ts) for key, ts in users.items()}
+        pinned = {id(node) for node in compiled.outputs.values()}
+
+        ready = [(-max(rank[id(n)] for n in tasks[t]), t) for t in range(len(tasks)) if waiting[t] == 0]
+        heapq.heapify(ready)
+        values = {}
+        self.peak_live = 0
+
+        # operand 와 rotation key 는 scheduling thread 에서 모아서 넘김
+        # (worker 는 values 도 rotation_keys 도 보지 않음)
+        def execute(t: int, operands: dict, keys) -> list:
+            return compiled._run_task(cc, tasks[t], operands, inputs, relinearization_key, keys)
+
+        def arguments_of(t: int) -> tuple:
+            return ({id(a): values[id(a)] for a in deps[t]},
+                    compiled._task_keys(tasks[t], rotation_keys))
+
+        def finish(t: int, results: list):
+            for node, ct in zip(tasks[t], results):
+                values[id(node)] = ct
+            self.peak_live = max(self.peak_live, len(values))
+            # 이 task 가 operand 의 마지막 consumer 이면 버림
+            for a in deps[t]:
+                remaining_uses[id(a)] -= 1
+                if remaining_uses[id(a)] == 0 and id(a) not in pinned:
+                    del values[id(a)]
+            notified = set()
+            for node in tasks[t]:
+                for u in users.get(id(node), ()):
+                    if u in notified:
+                        continue
+                    notified.add(u)
+                    waiting[u] -= 1
+                    if waiting[u] == 0:
+                        heapq.heappush(ready, (-max(rank[id(n)] for n in tasks[u]), u))
+
+        if self.workers == 1 and self.executor is None:
+            while ready:
+                _, t = heapq.heappop(ready)
+                finish(t, execute(t, *arguments_of(t)))
+        else:
+            executor = self.executor or ThreadPoolExecutor(self.workers)
+            try:
+                running = {}
+                while ready or running:
+                    while ready and len(running) < self.workers:
+                        _, t = heapq.heappop(ready)
+                        running[executor.submit(execute, t, *arguments_of(t))] = t
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        finish(running.pop(future), future.result())
+            finally:
+                if self.executor is None:
+                    executor.shutdown(cancel_futures=True)
+
+        return {name: values[id(node)] for name, node in compiled.outputs.items()}
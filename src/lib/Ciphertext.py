@@ -1,13 +1,49 @@
 from lib.Polynomial import RingElem
+from lib import Serialize
 
 class Ciphertext:
-    def __init__(self, components: list["RingElem"], scale: int, level: int):
-        self.components = components
+    # seed 가 있으면 첫 번째 component (uniform a) 는 None 으로 두고 필요할 때 전개
+    def __init__(self, components: list["RingElem"], scale: int, level: int,
+                 seed: bytes | None = None):
+        self._components = components
         self.scale = scale
         self.level = level
+        self.seed = seed
 
-    # TODO:
-    def copy(self):
-        return NotImplemented
+    @property
+    def components(self) -> list["RingElem"]:
+        if self._components[0] is None:
+            b = self._components[-1]
+            self._components[0] = b.ring.expand_uniform(self.seed)
+        return self._components
 
+    # component 를 바꾸면 seed 로는 더 이상 a 를 복원할 수 없음
+    @components.setter
+    def components(self, components: list["RingElem"]):
+        self._components = components
+        self.seed = None
 
+    @property
+    def is_seeded(self) -> bool:
+        return self.seed is not None
+
+    def copy(self) -> "Ciphertext":
+        components = [c.copy() if c is not None else None for c in self._components]
+        return Ciphertext(components, self.scale, self.level, self.seed)
+
+    # --- serialization ---
+    def to_bytes(self, params) -> bytes:
+        return Serialize.pack(Serialize.KIND_CIPHERTEXT, params, self.level, self.scale,
+                              self._components, self.seed)
+
+    @classmethod
+    def from_bytes(cls, data, params) -> "Ciphertext":
+        header, components, seed = Serialize.unpack(data, params, Serialize.KIND_CIPHERTEXT)
+        return cls(components, header.scale, header.level, seed)
+
+    def save(self, path: str, params):
+        Serialize.save(path, self.to_bytes(params))
+
+    @classmethod
+    def load(cls, path: str, params) -> "Ciphertext":
+        return Serialize.load(path, lambda mm: cls.from_bytes(mm, params))
@@ -0,0 +1,105 @@
+from __future__ import annotations
+import json
+import os
+import threading
+import time
+
+# ring 의 (poly backend, N, modulus bit-length) 별로 가장 빠른 Poly.mul 전략을 골라서 기억.
+# 결과는 JSON 파일에 저장되어 다음 실행부터는 benchmark 없이 바로 사용.
+
+CACHE_ENV = "TOYCKKS_MUL_CACHE"
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "toyckks", "mul_dispatch.json")
+
+# O(N^2) / O(N^1.58) object 연산 전략은 큰 N 에서 benchmark 자체가 너무 오래 걸리므로 제외
+_MAX_N = {"convolve": 1 << 10, "karatsuba": 1 << 12}
+
+class MulDispatcher:
+    """Autotuned choice of the polynomial multiplication strategy per ring shape."""
+    def __init__(self, cache_path: str | None = None, autotune: bool = True, repeat: int = 2):
+        if cache_path is None:
+            cache_path = os.environ.get(CACHE_ENV, DEFAULT_CACHE_PATH)
+        self.cache_path = cache_path or None # "" 이면 저장하지 않음
+        self.autotune = autotune
+        self.repeat = repeat
+        self._table: dict[str, str] | None = None
+        # 여러 thread 가 같은 table / 같은 tmp 파일을 동시에 쓰지 않도록
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def candidates(ring) -> list[str]:
+        methods = ring.poly_cls.mul_methods(ring.modsys, ring.N)
+        return [m for m in methods if ring.N <= _MAX_N.get(m, ring.N)]
+
+    @staticmethod
+    def shape_key(ring) -> str:
+        methods = ",".join(MulDispatcher.candidates(ring))
+        return f"{ring.poly_cls.__name__}:{ring.N}:{ring.modsys.bitlen()}:{methods}"
+
+    @staticmethod
+    def default(ring) -> str:
+        return "ntt" if "ntt" in MulDispatcher.candidates(ring) else "kronecker"
+
+    def method_for(self, ring) -> str:
+        key = self.shape_key(ring)
+        with self._lock:
+            table = self._load()
+            if key not in table:
+                table[key] = self.tune(ring) if self.autotune else self.default(ring)
+                self._save()
+            return table[key]
+
+    def tune(self, ring) -> str:
+        """Microbenchmark every candidate on random operands of the ring's shape."""
+        candidates = self.candidates(ring)
+        if len(candidates) == 1:
+            return candidates[0]
+        a = ring.random_uniform().poly
+        b = ring.random_uniform().poly
+        timings = {}
+        for method in candidates:
+            best = float("inf")
+            for _ in range(self.repeat):
+                start = time.perf_counter()
+                a.mul(b, method=method)
+                best = min(best, time.perf_counter() - start)
+            timings[method] = best
+        return min(timings, key=timings.get)
+
+    def set(self, ring, method: str):
+        if method not in self.candidates(ring):
+            raise ValueError(f"{method} is not available for {self.shape_key(ring)}")
+        with self._lock:
+            self._load()[self.shape_key(ring)] = method
+            self._save()
+
+    def clear(self):
+        with self._lock:
+            self._table = {}
+            self._save()
+
+    def _load(self) -> dict[str, str]:
+        with self._lock:
+            if self._table is None:
+                self._table = {}
+                if self.cache_path and os.path.exists(self.cache_path):
+                    try:
+                        with open(self.cache_path) as f:
+                            self._table = dict(json.load(f))
+                    except (OSError, ValueError):
+                        pass
+            return self._table
+
+    def _save(self):
+        if not self.cache_path:
+            return
+        with self._lock:
+            try:
+                os.makedirs(os.path.dirname(self.cache_path) or ".", exist_ok=True)
+                tmp = f"{self.cache_path}.{os.getpid()}.tmp"
+                with open(tmp, "w") as f:
+                    json.dump(self._table, f, indent=1, sort_keys=True)
+                os.replace(tmp, self.cache_path)
+            except OSError:
+                pass # 저장 실패 시에도 메모리 상의 결과는 사용
+
+DISPATCHER = MulDispatcher()
@@ -0,0 +1,169 @@
+from __future__ import annotations
+import mmap
+import struct
+import threading
+from collections import OrderedDict
+from core.parameters import CKKSParameters
+from lib.Keys import RelinearizationKey, RotationKey, RotationKeySet
+from lib import Serialize
+
+# Key file (little-endian)
+#   magic "TCKK" | version u8 | count u32
+#   index : count x (kind u8 | shift i32 | offset u64 | length u64)
+#   blobs : Serialize 형식의 key 들
+
+MAGIC = b"TCKK"
+VERSION = 1
+
+_HEADER = struct.Struct("<4sBI")
+_ENTRY = struct.Struct("<BiQQ")
+
+class KeyStore(RotationKeySet):
+    """Rotation keys resolved by shift from a memory-mapped key file.
+
+    key 는 처음 쓰일 때 deserialize 되고, 최근에 쓰인 `capacity` 개만 메모리에 유지 (LRU).
+    cache 와 통계는 lock 으로 보호되므로 여러 thread 에서 같이 써도 됨.
+    """
+    def __init__(self, path: str, params: CKKSParameters, capacity: int = 16):
+        if capacity < 1:
+            raise ValueError("capacity should be positive")
+        self.path = path
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.prefetched = 0
+        self._cache: OrderedDict[int, RotationKey] = OrderedDict()
+        self._relinearization_key = None
+        self._relinearization_entry = None
+        self._lock = threading.RLock()
+
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._index = self._parse_index()
+        except Exception:
+            self._mm.close()
+            raise
+        # keys 는 지금 메모리에 올라와 있는 key 들 (LRU cache), 전체 shift 목록은 _index
+        super().__init__(params, self._cache)
+
+    def _parse_index(self) -> dict[int, tuple[int, int]]:
+        if len(self._mm) < _HEADER.size:
+            raise ValueError("truncated key file")
+        magic, version, count = _HEADER.unpack_from(self._mm)
+        if magic != MAGIC:
+            raise ValueError("not a ToyCKKS key file")
+        if version != VERSION:
+            raise ValueError(f"unsupported key file version {version}")
+        if _HEADER.size + count * _ENTRY.size > len(self._mm):
+            raise ValueError("truncated key file")
+        index = {}
+        for i in range(count):
+            kind, shift, offset, length = _ENTRY.unpack_from(self._mm, _HEADER.size + i * _ENTRY.size)
+            if offset + length > len(self._mm):
+                raise ValueError("truncated key file")
+            if kind == Serialize.KIND_ROTATION_KEY:
+                index[shift] = (offset, length)
+            elif kind == Serialize.KIND_RELINEARIZATION_KEY:
+                self._relinearization_entry = (offset, length)
+            else:
+                raise ValueError(f"unexpected object kind {kind} in key file")
+        return index
+
+    @property
+    def shifts(self) -> list[int]:
+        return sorted(self._index)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    @staticmethod
+    def write(path: str, rotation_keys, relinearization_key: "RelinearizationKey | None" = None):
+        """Write rotation keys (a list or a RotationKeySet) and an optional relinearization key."""
+        if isinstance(rotation_keys, RotationKeySet):
+            rotation_keys = [rotation_keys[shift] for shift in rotation_keys.shifts]
+        entries = [(Serialize.KIND_ROTATION_KEY, key.shift, key.to_bytes()) for key in rotation_keys]
+        if relinearization_key is not None:
+            entries.append((Serialize.KIND_RELINEARIZATION_KEY, 0, relinearization_key.to_bytes()))
+
+        offset = _HEADER.size + len(entries) * _ENTRY.size
+        index = []
+        for kind, shift, blob in entries:
+            index.append(_ENTRY.pack(kind, shift, offset, len(blob)))
+            offset += len(blob)
+        with open(path, "wb") as f:
+            f.write(_HEADER.pack(MAGIC, VERSION, len(entries)))
+            f.writelines(index)
+            f.writelines(blob for _, _, blob in entries)
+
+    @property
+    def relinearization_key(self) -> "RelinearizationKey":
+        with self._lock:
+            if self._relinearization_key is None:
+                if self._relinearization_entry is None:
+                    raise KeyError("no relinearization key in key file")
+                offset, length = self._relinearization_entry
+                self._relinearization_key = RelinearizationKey.from_bytes(
+                    self._blob(offset, length), self.params)
+            return self._relinearization_key
+
+    def prefetch(self, shifts) -> None:
+        """Load the keys an upcoming batch of rotations will use (decomposed shifts included)."""
+        with self._lock:
+            for shift in shifts:
+                for d in self._decompose_shifts(shift):
+                    resolved = self._resolve(d)
+                    if resolved is None:
+                        raise KeyError(f"no rotation key for shift {d}")
+                    if resolved not in self._cache:
+                        self._insert(resolved, self._deserialize(resolved))
+                        self.prefetched += 1
+
+    @property
+    def stats(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                "prefetched": self.prefetched, "cached": len(self._cache)}
+
+    def close(self):
+        with self._lock:
+            self._cache.clear()
+            self._mm.close()
+
+    def __enter__(self) -> "KeyStore":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _find(self, shift: int):
+        resolved = self._resolve(shift)
+        if resolved is None:
+            return None
+        with self._lock:
+            if resolved in self._cache:
+                self.hits += 1
+                self._cache.move_to_end(resolved)
+                return self._cache[resolved]
+            self.misses += 1
+            key = self._deserialize(resolved)
+            self._insert(resolved, key)
+            return key
+
+    def _has_key(self, shift: int) -> bool:
+        return shift in self._index
+
+    # _lock 을 잡은 상태에서 호출
+    def _insert(self, shift: int, key: "RotationKey"):
+        self._cache[shift] = key
+        self._cache.move_to_end(shift)
+        while len(self._cache) > self.capacity:
+            self._cache.popitem(last=False)
+            self.evictions += 1
+
+    def _deserialize(self, shift: int) -> "RotationKey":
+        offset, length = self._index[shift]
+        return RotationKey.from_bytes(self._blob(offset, length), self.params)
+
+    def _blob(self, offset: int, length: int) -> memoryview:
+        return memoryview(self._mm)[offset:offset + length]
@@ -1,6 +1,7 @@
 from core.parameters import CKKSParameters
 from lib.Polynomial import RingElem
 from lib.Ciphertext import Ciphertext
+from lib import Serialize
 
 class SecretKey:
     def __init__(self, params:CKKSParameters, ringelem: "RingElem"):
@@ -13,13 +14,171 @@ class SecretKey:
         ringelem = cycloRing.from_coeffs(coeffs)
         return SecretKey(self.params, ringelem)
 
+    # --- serialization ---
+    def to_bytes(self) -> bytes:
+        return Serialize.pack(Serialize.KIND_SECRET_KEY, self.params, self.params.max_level,
+                              1, [self.ringelem])
+
+    @classmethod
+    def from_bytes(cls, data, params: CKKSParameters) -> "SecretKey":
+        _, (ringelem,), _ = Serialize.unpack(data, params, Serialize.KIND_SECRET_KEY)
+        return cls(params, ringelem)
+
+    def save(self, path: str):
+        Serialize.save(path, self.to_bytes())
+
+    @classmethod
+    def load(cls, path: str, params: CKKSParameters) -> "SecretKey":
+        return Serialize.load(path, lambda mm: cls.from_bytes(mm, params))
+
+# 0 의 암호문 (a, b = a * s + e), max level
+class PublicKey:
+    def __init__(self, params: CKKSParameters, key: "Ciphertext"):
+        self.params = params
+        self.key = key
+        self._fitted: dict[int, list["RingElem"]] = {}
+
+    # level 의 modulus 로 reduce 한 (a, b): q_level | q_max 이므로 b = a * s + e 가 그대로 성립
+    def _fitting(self, level: int) -> list["RingElem"]:
+        if level not in self._fitted:
+            cycloRing = self.params.rings[level]
+            fitted = [c if c.ring is cycloRing else cycloRing.from_coeffs(c.poly.coeffs)
+                      for c in self.key.components]
+            # 여러 thread 가 동시에 계산해도 모두 같은 list 를 쓰도록 (dict.setdefault 는 atomic)
+            return self._fitted.setdefault(level, fitted)
+        return self._fitted[level]
+
+    def to_bytes(self) -> bytes:
+        return Serialize.pack(Serialize.KIND_PUBLIC_KEY, self.params, self.key.level,
+                              self.key.scale, self.key._components, self.key.seed)
+
+    @classmethod
+    def from_bytes(cls, data, params: CKKSParameters) -> "PublicKey":
+        header, components, seed = Serialize.unpack(data, params, Serialize.KIND_PUBLIC_KEY)
+        return cls(params, Ciphertext(components, header.scale, header.level, seed))
+
+    def save(self, path: str):
+        Serialize.save(path, self.to_bytes())
+
+    @classmethod
+    def load(cls, path: str, params: CKKSParameters) -> "PublicKey":
+        return Serialize.load(path, lambda mm: cls.from_bytes(mm, params))
+
+# evaluation key 의 key 암호문 (auxRing) 직렬화
+def _pack_key(kind: int, params: CKKSParameters, key: "Ciphertext", shift: int = 0) -> bytes:
+    return Serialize.pack(kind, params, key.level, key.scale, key._components, key.seed,
+                          aux=True, shift=shift)
+
+def _unpack_key(data, params: CKKSParameters, kind: int) -> tuple["Ciphertext", int]:
+    header, components, seed = Serialize.unpack(data, params, kind)
+    return Ciphertext(components, header.scale, header.level, seed), header.shift
+
 class RelinearizationKey:
     def __init__(self, params:CKKSParameters, key: "Ciphertext"):
         self.params = params
         self.key = key
 
+    def to_bytes(self) -> bytes:
+        return _pack_key(Serialize.KIND_RELINEARIZATION_KEY, self.params, self.key)
+
+    @classmethod
+    def from_bytes(cls, data, params: CKKSParameters) -> "RelinearizationKey":
+        key, _ = _unpack_key(data, params, Serialize.KIND_RELINEARIZATION_KEY)
+        return cls(params, key)
+
+    def save(self, path: str):
+        Serialize.save(path, self.to_bytes())
+
+    @classmethod
+    def load(cls, path: str, params: CKKSParameters) -> "RelinearizationKey":
+        return Serialize.load(path, lambda mm: cls.from_bytes(mm, params))
+
 class RotationKey:
     def __init__(self, params: CKKSParameters, key: "Ciphertext", shift: int):
         self.params = params
         self.shift = shift
         self.key = key
+
+    def to_bytes(self) -> bytes:
+        return _pack_key(Serialize.KIND_ROTATION_KEY, self.params, self.key, self.shift)
+
+    @classmethod
+    def from_bytes(cls, data, params: CKKSParameters) -> "RotationKey":
+        key, shift = _unpack_key(data, params, Serialize.KIND_ROTATION_KEY)
+        return cls(params, key, shift)
+
+    def save(self, path: str):
+        Serialize.save(path, self.to_bytes())
+
+    @classmethod
+    def load(cls, path: str, params: CKKSParameters) -> "RotationKey":
+        return Serialize.load(path, lambda mm: cls.from_bytes(mm, params))
+
+class RotationKeySet:
+    """Rotation keys for +-2^i (and optional extra shifts); any shift is a composition."""
+    def __init__(self, params: CKKSParameters, keys: dict[int, "RotationKey"]):
+        self.params = params
+        self.keys = keys
+
+    @property
+    def shifts(self) -> list[int]:
+        return sorted(self.keys)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __contains__(self, shift: int) -> bool:
+        return self._resolve(shift) is not None
+
+    def __getitem__(self, shift: int) -> "RotationKey":
+        key = self._find(shift)
+        if key is None:
+            raise KeyError(f"no rotation key for shift {shift}")
+        return key
+
+    # shift 를 key 가 있는 shift 들의 합으로 분해 (NAF: 최소 개수의 +-2^i)
+    def decompose(self, shift: int) -> list["RotationKey"]:
+        return [self[d] for d in self._decompose_shifts(shift)]
+
+    def _decompose_shifts(self, shift: int) -> list[int]:
+        slots = self.params.slot_count
+        shift %= slots
+        if shift == 0:
+            return []
+        if shift in self:
+            return [shift]
+
+        best = None
+        for target in (shift, shift - slots):
+            digits = [d for d in _naf(target) if d % slots != 0]
+            if best is None or len(digits) < len(best):
+                best = digits
+        return best
+
+    def _find(self, shift: int):
+        resolved = self._resolve(shift)
+        return None if resolved is None else self.keys[resolved]
+
+    # key 가 있는 동치 shift (slot 회전은 mod slot_count 로 같음)
+    def _resolve(self, shift: int) -> int | None:
+        slots = self.params.slot_count
+        for candidate in (shift, shift % slots, shift % slots - slots):
+            if self._has_key(candidate):
+                return candidate
+        return None
+
+    def _has_key(self, shift: int) -> bool:
+        return shift in self.keys
+
+# Non-adjacent form: n = sum d_i 2^i, d_i in {-1, 0, 1}, 인접한 0 아닌 digit 없음
+def _naf(n: int) -> list[int]:
+    digits = []
+    power = 1
+    while n != 0:
+        if n % 2:
+            d = 2 - (n % 4)
+            digits.append(d * power)
+            n -= d
+        n //= 2
+        power *= 2
+    return digits
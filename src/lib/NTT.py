@@ -0,0 +1,161 @@
+from __future__ import annotations
+from functools import lru_cache
+import numpy as np
+
+# q 가 이 값보다 작으면 uint64 (machine word) 로 butterfly 연산을 수행
+WORD_BITS = 50
+
+# ---------- Number theory utils ----------
+
+_MR_BASES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+
+def is_prime(n: int) -> bool:
+    """Miller-Rabin (deterministic for n < 3.3e24, probabilistic above)."""
+    if n < 2:
+        return False
+    for p in _MR_BASES:
+        if n % p == 0:
+            return n == p
+    d, r = n - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        r += 1
+    for a in _MR_BASES:
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(r - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+def is_ntt_friendly(N: int, q: int) -> bool:
+    return N > 0 and N & (N - 1) == 0 and q % (2 * N) == 1 and is_prime(q)
+
+def find_primitive_root(N: int, q: int) -> int:
+    """Primitive 2N-th root of unity psi mod q (psi^N = -1)."""
+    M = 2 * N
+    for x in range(2, q):
+        psi = pow(x, (q - 1) // M, q)
+        # M 이 power-of-two 이므로 psi^N = -1 이면 order 가 정확히 M
+        if pow(psi, N, q) == q - 1:
+            return psi
+    raise ValueError(f"no primitive {M}-th root of unity mod {q}")
+
+def gen_ntt_primes(bits: int, N: int, count: int, exclude: tuple = ()) -> list[int]:
+    """`count` primes q = 1 (mod 2N) below 2^bits, closest to 2^bits first."""
+    M = 2 * N
+    primes = []
+    q = ((1 << bits) - 1) // M * M + 1
+    while len(primes) < count:
+        if q < M:
+            raise ValueError(f"not enough {bits}-bit NTT primes for N={N}")
+        if q not in exclude and is_prime(q):
+            primes.append(q)
+        q -= M
+    return primes
+
+def gen_ntt_primes_near(bits: int, N: int, count: int, exclude: tuple = ()) -> list[int]:
+    """`count` primes q = 1 (mod 2N) alternating around 2^bits (scale-like primes)."""
+    M = 2 * N
+    center = 1 << bits
+    primes = []
+    up = center + 1
+    down = center - M + 1
+    while len(primes) < count:
+        for q in (down, up):
+            if len(primes) < count and q not in exclude and is_prime(q):
+                primes.append(q)
+        up += M
+        down -= M
+    return primes
+
+def _bitrev(i: int, logn: int) -> int:
+    return int(format(i, f"0{logn}b")[::-1], 2) if logn > 0 else 0
+
+# ---------- Modular kernels ----------
+
+def mulmod_word(a: np.ndarray, b: np.ndarray, q) -> np.ndarray:
+    """a*b mod q for uint64 arrays with entries < q < 2^WORD_BITS.
+
+    quotient 을 float64 로 추정하고 나머지는 uint64 wrap-around 로 정확히 계산.
+    """
+    qq = np.asarray(q, dtype=np.uint64)
+    quot = np.floor(a.astype(np.float64) * b.astype(np.float64) / qq.astype(np.float64))
+    r = (a * b - quot.astype(np.uint64) * qq).view(np.int64)
+    qi = qq.astype(np.int64)
+    r = np.where(r < 0, r + qi, r)
+    r = np.where(r >= qi, r - qi, r)
+    return r.view(np.uint64)
+
+# ---------- NTT ----------
+
+class NTTParams:
+    """Twiddle tables for the negacyclic NTT over Z_q[X]/(X^N + 1).
+
+    forward: Cooley-Tukey (natural -> bit-reversed order)
+    inverse: Gentleman-Sande (bit-reversed -> natural order)
+    """
+    def __init__(self, N: int, q: int):
+        if not is_ntt_friendly(N, q):
+            raise ValueError(f"q={q} is not an NTT-friendly prime for N={N}")
+        self.N = N
+        self.q = q
+        self.logN = N.bit_length() - 1
+        self.word = q.bit_length() <= WORD_BITS
+        self.dtype = np.uint64 if self.word else object
+
+        psi = find_primitive_root(N, q)
+        psi_inv = pow(psi, -1, q)
+        rev = [_bitrev(i, self.logN) for i in range(N)]
+        self.psi = psi
+        self.psi_rev = np.array([pow(psi, r, q) for r in rev], dtype=self.dtype)
+        self.psi_inv_rev = np.array([pow(psi_inv, r, q) for r in rev], dtype=self.dtype)
+        self.n_inv = pow(N, -1, q)
+
+    def _mulmod(self, a, b):
+        if self.word:
+            return mulmod_word(a, b, self.q)
+        return (a * b) % self.q
+
+    def forward(self, coeffs: np.ndarray) -> np.ndarray:
+        q, N = self.q, self.N
+        A = np.array(coeffs, dtype=self.dtype)
+        m, t = 1, N // 2
+        while m < N:
+            A = A.reshape(m, 2 * t)
+            S = self.psi_rev[m:2 * m].reshape(m, 1)
+            U = A[:, :t]
+            V = self._mulmod(A[:, t:], np.broadcast_to(S, (m, t)))
+            A = np.concatenate(((U + V) % q, (U + (q - V)) % q), axis=1)
+            m, t = 2 * m, t // 2
+        return A.reshape(N)
+
+    def inverse(self, values: np.ndarray) -> np.ndarray:
+        q, N = self.q, self.N
+        A = np.array(values, dtype=self.dtype)
+        m, t = N // 2, 1
+        while m >= 1:
+            A = A.reshape(m, 2 * t)
+            S = self.psi_inv_rev[m:2 * m].reshape(m, 1)
+            U = A[:, :t]
+            V = A[:, t:]
+            W = self._mulmod((U + (q - V)) % q, np.broadcast_to(S, (m, t)))
+            A = np.concatenate(((U + V) % q, W), axis=1)
+            m, t = m // 2, 2 * t
+        A = A.reshape(N)
+        return self._mulmod(A, np.full(N, self.n_inv, dtype=self.dtype))
+
+    def pointwise(self, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        return self._mulmod(a, b)
+
+    def negacyclic_mul(self, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        return self.inverse(self.pointwise(self.forward(a), self.forward(b)))
+
+@lru_cache(maxsize=None)
+def ntt_params(N: int, q: int) -> NTTParams:
+    """Cached NTTParams per (N, q): twiddle 테이블은 ring 당 한 번만 생성."""
+    return NTTParams(N, q)
@@ -1,4 +1,5 @@
 from lib.Polynomial import RingElem
+from lib import Serialize
 
 class Plaintext:
     def __init__(self, ringelem: "RingElem", scale: int, level: int):
@@ -6,10 +7,25 @@ class Plaintext:
         self.scale = scale
         self.level = level
 
-    # TODO: 좀 더 다듬기
-    def copy(self): # TODO
-        return NotImplemented
-        # return Plaintext(self.poly.copy(), self.scale, self.level)
+    def copy(self) -> "Plaintext":
+        return Plaintext(self.ringelem.copy(), self.scale, self.level)
+
+    # --- serialization ---
+    def to_bytes(self, params) -> bytes:
+        return Serialize.pack(Serialize.KIND_PLAINTEXT, params, self.level, self.scale,
+                              [self.ringelem])
+
+    @classmethod
+    def from_bytes(cls, data, params) -> "Plaintext":
+        header, (ringelem,), _ = Serialize.unpack(data, params, Serialize.KIND_PLAINTEXT)
+        return cls(ringelem, header.scale, header.level)
+
+    def save(self, path: str, params):
+        Serialize.save(path, self.to_bytes(params))
+
+    @classmethod
+    def load(cls, path: str, params) -> "Plaintext":
+        return Serialize.load(path, lambda mm: cls.from_bytes(mm, params))
 
     def __repr__(self):
         formatted = ""
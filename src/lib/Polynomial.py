@@ -1,10 +1,12 @@
 from __future__ import annotations
 from dataclasses import dataclass
+from functools import cached_property, lru_cache
 from typing import List, Iterable, Protocol, runtime_checkable, cast
 import numpy as np
-import random
 import math
-import secrets
+from lib.NTT import NTTParams, ntt_params, is_ntt_friendly, mulmod_word, WORD_BITS
+from lib.Dispatcher import DISPATCHER
+from lib.Sampler import XOF, new_seed, uniform_mod, ternary, gaussian
 
 # ---------- Utils ----------
 
@@ -15,6 +17,37 @@ def _to_pyint_scalar(x):
         x = x.item()
     return int(x)
 
+def _is_machine_int_array(x) -> bool:
+    return isinstance(x, np.ndarray) and x.ndim == 1 and x.dtype.kind in "iu"
+
+# ---------- Automorphism X -> X^k ----------
+
+def galois_element(shift: int, N: int) -> int:
+    """Slot rotation by `shift` is the automorphism X -> X^(5^shift mod 2N)."""
+    return pow(5, shift, 2 * N)
+
+def automorphism_map(N: int, k: int) -> tuple[np.ndarray, np.ndarray]:
+    """Target indices and signs (+1/-1) for X -> X^k (cached per (N, k mod 2N))."""
+    return _automorphism_map(N, k % (2 * N))
+
+@lru_cache(maxsize=None)
+def _automorphism_map(N: int, k: int) -> tuple[np.ndarray, np.ndarray]:
+    M = 2 * N
+    # Note: N 이 power-of-two 일 경우에는 홀수 여부만 판단하면 됨.
+    if k % 2 == 0 or math.gcd(k, M) != 1:
+        raise ValueError("k must be odd and coprime to 2N")
+    j = (np.arange(N) * k) % M
+    # X^i -> X^(ik), ik >= N 이면 X^N = -1 때문에 -X^(ik - N)
+    perm = j % N
+    sign = np.where(j < N, 1, -1).astype(np.int8)
+    perm.setflags(write=False)
+    sign.setflags(write=False)
+    return perm, sign
+
+def _check_map(perm: np.ndarray, sign: np.ndarray, N: int):
+    if len(perm) != N or len(sign) != N:
+        raise ValueError("bad map shape")
+
 # ---------- Interfaces & primitives ----------
 
 @runtime_checkable
@@ -29,15 +62,19 @@ class ModSystem(Protocol):
     def as_int(self, a: int) -> int: ...
     def bitlen(self) -> int: ...
 
-# TODO: q를 power-of-two 사용할 것 이므로 마스킹을 이용해서
-# mod 연산 경량화
 @dataclass(frozen=True)
 class SingleMod(ModSystem):
     q: int
     def __post_init__(self):
         if self.q <= 1:
             raise ValueError("q must be > 1")
+        # q 가 power-of-two 이면 mod 연산을 마스킹으로 (음수도 & 로 [0, q) 에 들어옴)
+        object.__setattr__(self, "_mask", self.q - 1 if self.is_pow2 else None)
+    @property
+    def is_pow2(self) -> bool: return self.q & (self.q - 1) == 0
     def reduce(self, a: int) -> int:
+        if self._mask is not None:
+            return a & self._mask
         x = a % self.q
         return x if x >= 0 else x + self.q
     def center_reduce(self, a: int) -> int:
@@ -50,6 +87,59 @@ class SingleMod(ModSystem):
     def as_int(self, a: int) -> int: return int(a)
     def bitlen(self) -> int: return self.q.bit_length()
 
+@dataclass(frozen=True)
+class RNSMod(ModSystem):
+    """RNS modulus Q = q_0 * q_1 * ... with word-sized NTT primes q_i."""
+    primes: tuple
+    def __post_init__(self):
+        primes = tuple(int(p) for p in self.primes)
+        if len(primes) == 0:
+            raise ValueError("need at least one prime")
+        if len(set(primes)) != len(primes):
+            raise ValueError("primes must be distinct")
+        if any(p <= 1 or p.bit_length() > WORD_BITS for p in primes):
+            raise ValueError(f"primes must be in (1, 2^{WORD_BITS})")
+        Q = math.prod(primes)
+        hats = [Q // p for p in primes]
+        # CRT 상수: x = sum_i [x_i * (Q/q_i)^-1]_{q_i} * (Q/q_i) mod Q
+        object.__setattr__(self, "primes", primes)
+        object.__setattr__(self, "q", Q)
+        object.__setattr__(self, "_col", np.array(primes, dtype=np.uint64).reshape(-1, 1))
+        object.__setattr__(self, "_hat", np.array(hats, dtype=object).reshape(-1, 1))
+        object.__setattr__(self, "_hat_inv", np.array(
+            [pow(h % p, -1, p) for h, p in zip(hats, primes)], dtype=np.uint64).reshape(-1, 1))
+    def reduce(self, a: int) -> int: return a % self.q
+    def center_reduce(self, a: int) -> int:
+        h = self.q // 2
+        return ((a + h) % self.q) - h
+    def add(self, a: int, b: int) -> int: return (a + b) % self.q
+    def sub(self, a: int, b: int) -> int: return (a - b) % self.q
+    def mul(self, a: int, b: int) -> int: return (a * b) % self.q
+    def negate(self, a: int) -> int: return (self.q - a) % self.q
+    def as_int(self, a: int) -> int: return int(a)
+    def bitlen(self) -> int: return self.q.bit_length()
+    @property
+    def limbs(self) -> int: return len(self.primes)
+
+    # int coeffs (N,) <-> residues (limbs x N, uint64)
+    def to_limbs(self, coeffs: np.ndarray) -> np.ndarray:
+        if _is_machine_int_array(coeffs): # int64 그대로 limb 별 mod
+            return np.array([np.mod(coeffs, p) for p in self.primes], dtype=np.uint64)
+        c = np.asarray(coeffs, dtype=object)
+        return np.array([c % p for p in self.primes], dtype=np.uint64)
+
+    def from_limbs(self, limbs: np.ndarray) -> np.ndarray:
+        t = mulmod_word(limbs, self._hat_inv, self._col)
+        return (t.astype(object) * self._hat).sum(axis=0) % self.q
+
+    def center_from_limbs(self, limbs: np.ndarray) -> np.ndarray:
+        x = self.from_limbs(limbs)
+        return np.where(x >= self.q - self.q // 2, x - self.q, x)
+
+@lru_cache(maxsize=None)
+def _sub_rns(primes: tuple) -> RNSMod:
+    return RNSMod(primes)
+
 # ---------- Cyclotomic polynomial X^N + 1 ----------
 
 @dataclass(frozen=True)
@@ -61,22 +151,192 @@ class Cyclotomic2N:
     @property
     def degree(self) -> int: return self.N
 
+# 직렬화: 계수 하나를 ceil(log2 q / 8) byte (little-endian) 로
+def _coeff_bytes(q: int) -> int:
+    return max(1, -(-(q - 1).bit_length() // 8))
+
+def _words_to_bytes(words: np.ndarray, nb: int) -> bytes:
+    # uint64 배열의 하위 nb byte 만
+    raw = np.ascontiguousarray(words, dtype="<u8").view(np.uint8).reshape(-1, 8)
+    return raw[:, :nb].tobytes()
+
+def _words_from_bytes(buf, nb: int, count: int) -> np.ndarray:
+    raw = np.frombuffer(buf, dtype=np.uint8, count=count * nb).reshape(count, nb)
+    padded = np.zeros((count, 8), dtype=np.uint8)
+    padded[:, :nb] = raw
+    return padded.view("<u8").reshape(count).astype(np.uint64)
+
+def _check_serialized_range(values: np.ndarray, q: int):
+    if (values >= q).any():
+        raise ValueError("serialized coefficient out of range")
+
+# ---------- Fixed-width limb kernels (power-of-two modulus) ----------
+# 계수 하나를 32-bit limb K 개로 표현: (K x N) uint32, limb 0 이 least significant.
+# 연산 중간값은 uint64 에 담고, carry 는 다음 limb 로 한꺼번에 전파.
+
+_LIMB_BITS = 32
+_LIMB_MASK = np.uint64(0xFFFFFFFF)
+
+def _limb_count(q: int) -> int:
+    return max(1, -(-(q.bit_length() - 1) // _LIMB_BITS))
+
+def _limb_top_mask(q: int) -> np.uint64:
+    r = (q.bit_length() - 1) - _LIMB_BITS * (_limb_count(q) - 1)
+    return np.uint64((1 << r) - 1)
+
+def _limbs_from_ints(coeffs: np.ndarray, q: int) -> np.ndarray:
+    K = _limb_count(q)
+    mask = q - 1
+    buf = b"".join((int(c) & mask).to_bytes(4 * K, "little") for c in coeffs)
+    return np.ascontiguousarray(np.frombuffer(buf, dtype="<u4").reshape(len(coeffs), K).T, dtype=np.uint32)
+
+def _limbs_from_machine_ints(coeffs: np.ndarray, q: int) -> np.ndarray:
+    # int64/uint64 배열: two's complement 를 그대로 limb 로 쪼갬 (계수 단위 loop 없음)
+    K = _limb_count(q)
+    u = coeffs.astype(np.uint64)
+    sign = np.where(coeffs < 0, _LIMB_MASK, np.uint64(0))
+    limbs = np.empty((max(K, 2), len(coeffs)), dtype=np.uint64)
+    limbs[0] = u & _LIMB_MASK
+    limbs[1] = u >> np.uint64(_LIMB_BITS)
+    limbs[2:] = sign
+    limbs = limbs[:K]
+    limbs[-1] &= _limb_top_mask(q)
+    return limbs.astype(np.uint32)
+
+def _ints_from_limbs(limbs: np.ndarray) -> np.ndarray:
+    K, N = limbs.shape
+    nb = 4 * K
+    buf = np.ascontiguousarray(limbs.T, dtype="<u4").tobytes()
+    return np.array([int.from_bytes(buf[i * nb:(i + 1) * nb], "little") for i in range(N)],
+                    dtype=object)
+
+def _limb_normalize(acc: np.ndarray, top_mask: np.uint64) -> np.ndarray:
+    """Propagate carries of a (K x N) uint64 accumulator and reduce mod 2^(32K')."""
+    while True:
+        carry = acc[:-1] >> np.uint64(_LIMB_BITS)
+        if not carry.any():
+            break
+        acc[:-1] &= _LIMB_MASK
+        acc[1:] += carry
+    acc[-1] &= top_mask
+    return acc.astype(np.uint32)
+
+def _limb_add(a: np.ndarray, b: np.ndarray, top_mask: np.uint64) -> np.ndarray:
+    return _limb_normalize(a.astype(np.uint64) + b, top_mask)
+
+def _limb_neg(a: np.ndarray, top_mask: np.uint64) -> np.ndarray:
+    # two's complement: -a = ~a + 1
+    acc = (~a).astype(np.uint64)
+    acc[0] += np.uint64(1)
+    return _limb_normalize(acc, top_mask)
+
+def _limb_sub(a: np.ndarray, b: np.ndarray, top_mask: np.uint64) -> np.ndarray:
+    # a - b = a + ~b + 1
+    acc = a.astype(np.uint64) + (~b)
+    acc[0] += np.uint64(1)
+    return _limb_normalize(acc, top_mask)
+
+def _limb_shift_right(a: np.ndarray, shift: int, K_out: int, top_mask: np.uint64) -> np.ndarray:
+    """floor(a / 2^shift) mod 2^k' for (K x N) uint32 limbs, output K_out limbs."""
+    K = a.shape[0]
+    w, b = divmod(shift, _LIMB_BITS)
+    wide = a.astype(np.uint64)
+    out = np.zeros((K_out, a.shape[1]), dtype=np.uint64)
+    for j in range(K_out):
+        if j + w < K:
+            out[j] = wide[j + w] >> np.uint64(b)
+        if b and j + w + 1 < K:
+            out[j] |= (wide[j + w + 1] << np.uint64(_LIMB_BITS - b)) & _LIMB_MASK
+    out[-1] &= top_mask
+    return out.astype(np.uint32)
+
+def _limb_scalarmul(a: np.ndarray, k: int, top_mask: np.uint64) -> np.ndarray:
+    K = a.shape[0]
+    wide = a.astype(np.uint64)
+    acc = np.zeros_like(wide)
+    for j in range(K):
+        kj = (k >> (_LIMB_BITS * j)) & 0xFFFFFFFF
+        if kj == 0:
+            continue
+        # 32x32 -> 64 bit 곱을 lo/hi 로 나눠서 누적 (limb 당 최대 2K 개 항 < 2^64)
+        prod = wide[:K - j] * np.uint64(kj)
+        acc[j:] += prod & _LIMB_MASK
+        acc[j + 1:] += prod[:K - j - 1] >> np.uint64(_LIMB_BITS)
+    return _limb_normalize(acc, top_mask)
+
+# ---------- Vectorized convolutions (object dtype) ----------
+
+_KARATSUBA_CUTOFF = 32
+
+def _negacyclic_fold(c: np.ndarray, q: int, N: int) -> np.ndarray:
+    # 길이 2N-1 의 linear convolution 을 X^N = -1 로 접기
+    res = c[:N].copy()
+    res[:N - 1] -= c[N:]
+    return res % q
+
+def _convolve_karatsuba(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    n = len(a)
+    if n <= _KARATSUBA_CUTOFF or n % 2:
+        return np.convolve(a, b)
+    h = n // 2
+    a0, a1, b0, b1 = a[:h], a[h:], b[:h], b[h:]
+    z0 = _convolve_karatsuba(a0, b0)
+    z2 = _convolve_karatsuba(a1, b1)
+    z1 = _convolve_karatsuba(a0 + a1, b0 + b1) - z0 - z2
+    res = np.zeros(2 * n - 1, dtype=object)
+    res[:2 * h - 1] += z0
+    res[h:3 * h - 1] += z1
+    res[2 * h:] += z2
+    return res
+
+# ---------- Kronecker substitution ----------
+# a(X), b(X) 를 X = 2^(8*nb) 에서 평가한 큰 정수 하나로 packing 하고
+# CPython big-int 곱셈 (Karatsuba) 한 번으로 convolution 전체를 계산.
+
+def _kronecker_slot_bytes(q: int, N: int) -> int:
+    # 곱의 각 계수 < N * q^2 이므로 carry 가 옆 slot 으로 넘어가지 않음
+    return (2 * q.bit_length() + N.bit_length() + 7) // 8
+
+def _kronecker_pack(coeffs, nb: int) -> int:
+    return int.from_bytes(b"".join(int(c).to_bytes(nb, "little") for c in coeffs), "little")
+
+def _negacyclic_kronecker(a: np.ndarray, b: np.ndarray, q: int, N: int) -> np.ndarray:
+    nb = _kronecker_slot_bytes(q, N)
+    raw = (_kronecker_pack(a, nb) * _kronecker_pack(b, nb)).to_bytes(2 * N * nb, "little")
+    slots = np.array([int.from_bytes(raw[k * nb:(k + 1) * nb], "little") for k in range(2 * N)],
+                     dtype=object)
+    # X^N = -1 : c_k - c_(k+N)
+    return (slots[:N] - slots[N:]) % q
+
 # ---------- Polynomial representations ----------
 
 class Poly:
     """Dense polynomial over Z_q with modulus X^N + 1 (coeffs length N)."""
     __slots__ = ("coeffs", "mod", "N")
     def __init__(self, coeffs: Iterable[int], mod: ModSystem, N: int):
-        coeffs = list(coeffs)
+        if not _is_machine_int_array(coeffs):
+            coeffs = list(coeffs)
         if len(coeffs) != N:
             raise ValueError(f"need {N} coeffs")
         self.mod = mod
         self.N = N
-        self.coeffs = np.array([mod.reduce(_to_pyint_scalar(c)) for c in coeffs], dtype=object)
+        if _is_machine_int_array(coeffs):
+            self.coeffs = coeffs.astype(object) % mod.q
+        else:
+            self.coeffs = np.array([mod.reduce(_to_pyint_scalar(c)) for c in coeffs], dtype=object)
+
+    # 내부 연산 결과용: 이미 [0, q) 로 reduce 된 object 배열을 검증/복사 없이 그대로 사용
+    @classmethod
+    def _from_reduced(cls, coeffs: np.ndarray, mod: ModSystem, N: int) -> "Poly":
+        obj = cls.__new__(cls)
+        obj.coeffs = coeffs
+        obj.mod = mod
+        obj.N = N
+        return obj
 
     @classmethod
     def zero(cls, mod: ModSystem, N: int) -> "Poly":
-        return cls([0]*N, mod, N)
+        return cls._from_reduced(np.zeros(N, dtype=object), mod, N)
 
     @classmethod
     def from_int(cls, k: int, mod: ModSystem, N: int) -> "Poly":
@@ -84,33 +344,64 @@ class Poly:
         v[0] = mod.reduce(k)
         return cls(v, mod, N)
 
-    def copy(self) -> "Poly": return Poly(self.coeffs.tolist(), self.mod, self.N)
+    def copy(self) -> "Poly": return Poly._from_reduced(self.coeffs.copy(), self.mod, self.N)
 
     # ring ops
     def __add__(self, other: "Poly") -> "Poly":
         self._check(other)
         c = (self.coeffs + other.coeffs) % self._q_like()
-        return Poly(c, self.mod, self.N)
+        return Poly._from_reduced(c, self.mod, self.N)
 
     def __sub__(self, other: "Poly") -> "Poly":
         self._check(other)
         c = (self.coeffs - other.coeffs) % self._q_like()
-        return Poly(c, self.mod, self.N)
+        return Poly._from_reduced(c, self.mod, self.N)
+
+    # in-place: self 의 계수 배열을 그대로 재사용
+    def iadd(self, other: "Poly") -> "Poly":
+        self._check(other)
+        q = self._q_like()
+        np.add(self.coeffs, other.coeffs, out=self.coeffs)
+        np.remainder(self.coeffs, q, out=self.coeffs)
+        return self
+
+    def isub(self, other: "Poly") -> "Poly":
+        self._check(other)
+        q = self._q_like()
+        np.subtract(self.coeffs, other.coeffs, out=self.coeffs)
+        np.remainder(self.coeffs, q, out=self.coeffs)
+        return self
 
     def __neg__(self) -> "Poly":
         q = self._q_like()
-        return Poly((-self.coeffs) % q, self.mod, self.N)
+        return Poly._from_reduced((-self.coeffs) % q, self.mod, self.N)
 
     def scalarmul(self, k: int) -> "Poly":
         q = self._q_like()
-        return Poly((self.coeffs * (k % int(q))) % q, self.mod, self.N)
+        return Poly._from_reduced((self.coeffs * (k % int(q))) % q, self.mod, self.N)
+
+    @staticmethod
+    def mul_methods(mod: ModSystem, N: int) -> tuple:
+        """Multiplication strategies worth benchmarking (schoolbook 은 reference 용)."""
+        methods = ("convolve", "karatsuba", "kronecker")
+        if is_ntt_friendly(N, int(cast(SingleMod, mod).q)):
+            methods += ("ntt",)
+        return methods
 
     def mul(self, other: "Poly", method: str = "schoolbook") -> "Poly":
         self._check(other)
         if method == "schoolbook":
             return self._mul_schoolbook(other)
+        elif method == "convolve":
+            c = np.convolve(self.coeffs, other.coeffs)
+            return Poly._from_reduced(_negacyclic_fold(c, self._q_like(), self.N), self.mod, self.N)
+        elif method == "karatsuba":
+            c = _convolve_karatsuba(self.coeffs, other.coeffs)
+            return Poly._from_reduced(_negacyclic_fold(c, self._q_like(), self.N), self.mod, self.N)
         elif method == "ntt":
-            raise NotImplementedError("attach NTTParams and implement")
+            return self._mul_ntt(other)
+        elif method == "kronecker":
+            return self._mul_kronecker(other)
         else:
             raise ValueError("unknown method")
 
@@ -131,37 +422,72 @@ class Poly:
                     acc[k] = (acc[k] + ai * b[j]) % q
                 else:
                     acc[k - N] = (acc[k - N] - ai * b[j]) % q  # negate due to X^N = -1
-        return Poly(acc, self.mod, N)
+        return Poly._from_reduced(acc, self.mod, N)
+
+    # q 가 NTT-friendly prime (q = 1 mod 2N) 일 때: O(N log N)
+    def _mul_ntt(self, other: "Poly") -> "Poly":
+        params = ntt_params(self.N, self._q_like())
+        c = params.negacyclic_mul(self.coeffs, other.coeffs)
+        return Poly._from_reduced(c.astype(object), self.mod, self.N)
+
+    # big-int packing: NTT-friendly 하지 않은 (power-of-two, 550 bits aux) q 용
+    def _mul_kronecker(self, other: "Poly") -> "Poly":
+        c = _negacyclic_kronecker(self.coeffs, other.coeffs, self._q_like(), self.N)
+        return Poly._from_reduced(c, self.mod, self.N)
 
-    # TODO: permutation map 으로 만들어두어 연산 경량화
     def automorphism(self, k: int) -> "Poly":
-        N = self.N
-        M = 2 * N
-        k %= M
-        # Note: N 이 power-of-two 일 경우에는 홀수 여부만 판단하면 됨.
-        if k % 2 == 0 or math.gcd(k, M) != 1:
-            raise ValueError("k must be odd and coprime to 2N")
+        return self.automorphism_with_map(*automorphism_map(self.N, k))
 
+    def automorphism_with_map(self, perm: np.ndarray, sign: np.ndarray) -> "Poly":
+        """Apply a precomputed automorphism map (perm, sign)."""
+        N = self.N
+        _check_map(perm, sign, N)
         q = self._q_like()
-        a = self.coeffs
-        res = np.zeros(N, dtype=object)
+        res = np.empty(N, dtype=object)
+        res[perm] = np.where(sign < 0, (-self.coeffs) % q, self.coeffs)
+        return Poly._from_reduced(res, self.mod, N)
 
-        for i in range(N):
-            j = (i * k) % M
-            if j < N:
-                # X^i -> X^(ik), same sign
-                res[j] = a[i]  # already reduced
-            else:
-                # X^i -> -X^(ik - N) because X^N = -1
-                res[j - N] = (-a[i]) % q
+    # 반올림 나눗셈 후 target_mod 로 내림: round(x / divisor) mod q'
+    def div_round(self, divisor: int, target_mod: ModSystem) -> "Poly | LimbPoly | RNSPoly":
+        if divisor & (divisor - 1) == 0:
+            return self.div_round_pow2(divisor.bit_length() - 1, target_mod)
+        c = (self.coeffs + (divisor >> 1)) // divisor
+        return _poly_cls_for(target_mod)._from_reduced(c % target_mod.q, target_mod, self.N)
 
-        return Poly(res, self.mod, N)
+    def div_round_pow2(self, shift: int, target_mod: ModSystem) -> "Poly | LimbPoly | RNSPoly":
+        c = (self.coeffs + ((1 << shift) >> 1)) >> shift
+        return _poly_cls_for(target_mod)._from_reduced(c % target_mod.q, target_mod, self.N)
 
     def tolist(self) -> List[int]: return [int(x) for x in self.coeffs]
 
     def _q_like(self):
         return int(cast(SingleMod, self.mod).q)
 
+    # --- serialization ---
+    @staticmethod
+    def byte_size(mod: ModSystem, N: int) -> int:
+        return N * _coeff_bytes(mod.q)
+
+    def to_bytes(self) -> bytes:
+        q = self._q_like()
+        nb = _coeff_bytes(q)
+        if nb <= 8:
+            return _words_to_bytes(self.coeffs.astype(np.uint64), nb)
+        return b"".join(int(c).to_bytes(nb, "little") for c in self.coeffs)
+
+    @classmethod
+    def from_bytes(cls, buf, mod: ModSystem, N: int) -> "Poly":
+        q = mod.q
+        nb = _coeff_bytes(q)
+        if nb <= 8:
+            coeffs = _words_from_bytes(buf, nb, N).astype(object)
+        else:
+            view = memoryview(buf)
+            coeffs = np.array([int.from_bytes(view[i * nb:(i + 1) * nb], "little")
+                               for i in range(N)], dtype=object)
+        _check_serialized_range(coeffs, q)
+        return cls._from_reduced(coeffs, mod, N)
+
     def _center_reduce(self):
         mod = self.mod
         coeffs = self.coeffs
@@ -172,6 +498,359 @@ class Poly:
         if self.N != other.N or type(self.mod) != type(other.mod):
             raise TypeError("incompatible polynomials")
 
+class LimbPoly:
+    """Polynomial over Z_q, q = 2^k, stored as fixed-width limbs (K x N, uint32)."""
+    __slots__ = ("limbs", "mod", "N")
+    def __init__(self, coeffs: Iterable[int], mod: SingleMod, N: int):
+        if not _is_machine_int_array(coeffs):
+            coeffs = list(coeffs)
+        if len(coeffs) != N:
+            raise ValueError(f"need {N} coeffs")
+        if not mod.is_pow2:
+            raise ValueError("LimbPoly needs a power-of-two modulus")
+        self.mod = mod
+        self.N = N
+        if _is_machine_int_array(coeffs):
+            self.limbs = _limbs_from_machine_ints(coeffs, mod.q)
+        else:
+            self.limbs = _limbs_from_ints([_to_pyint_scalar(c) for c in coeffs], mod.q)
+
+    @classmethod
+    def _from_limbs(cls, limbs: np.ndarray, mod: SingleMod, N: int) -> "LimbPoly":
+        obj = cls.__new__(cls)
+        obj.limbs = limbs
+        obj.mod = mod
+        obj.N = N
+        return obj
+
+    @classmethod
+    def _from_reduced(cls, coeffs: np.ndarray, mod: SingleMod, N: int) -> "LimbPoly":
+        return cls._from_limbs(_limbs_from_ints(coeffs, mod.q), mod, N)
+
+    @classmethod
+    def zero(cls, mod: SingleMod, N: int) -> "LimbPoly":
+        return cls._from_limbs(np.zeros((_limb_count(mod.q), N), dtype=np.uint32), mod, N)
+
+    @classmethod
+    def from_int(cls, k: int, mod: SingleMod, N: int) -> "LimbPoly":
+        v = [0]*N
+        v[0] = mod.reduce(k)
+        return cls(v, mod, N)
+
+    def copy(self) -> "LimbPoly": return LimbPoly._from_limbs(self.limbs.copy(), self.mod, self.N)
+
+    @property
+    def coeffs(self) -> np.ndarray:
+        """Coefficients in [0, q) (fresh object array)."""
+        return _ints_from_limbs(self.limbs)
+
+    @property
+    def _top_mask(self) -> np.uint64:
+        return _limb_top_mask(self.mod.q)
+
+    # ring ops (vectorized over limbs)
+    def __add__(self, other: "LimbPoly") -> "LimbPoly":
+        self._check(other)
+        return LimbPoly._from_limbs(_limb_add(self.limbs, other.limbs, self._top_mask), self.mod, self.N)
+
+    def __sub__(self, other: "LimbPoly") -> "LimbPoly":
+        self._check(other)
+        return LimbPoly._from_limbs(_limb_sub(self.limbs, other.limbs, self._top_mask), self.mod, self.N)
+
+    # in-place: carry 전파용 uint64 임시 배열 외에는 self.limbs 를 재사용
+    def iadd(self, other: "LimbPoly") -> "LimbPoly":
+        self._check(other)
+        np.copyto(self.limbs, _limb_add(self.limbs, other.limbs, self._top_mask))
+        return self
+
+    def isub(self, other: "LimbPoly") -> "LimbPoly":
+        self._check(other)
+        np.copyto(self.limbs, _limb_sub(self.limbs, other.limbs, self._top_mask))
+        return self
+
+    def __neg__(self) -> "LimbPoly":
+        return LimbPoly._from_limbs(_limb_neg(self.limbs, self._top_mask), self.mod, self.N)
+
+    def scalarmul(self, k: int) -> "LimbPoly":
+        k = self.mod.reduce(k)
+        return LimbPoly._from_limbs(_limb_scalarmul(self.limbs, k, self._top_mask), self.mod, self.N)
+
+    @staticmethod
+    def mul_methods(mod: SingleMod, N: int) -> tuple:
+        return ("convolve", "karatsuba", "kronecker")
+
+    def mul(self, other: "LimbPoly", method: str = "kronecker") -> "LimbPoly":
+        self._check(other)
+        if method == "kronecker":
+            return self._mul_kronecker(other)
+        a = Poly._from_reduced(self.coeffs, self.mod, self.N)
+        b = Poly._from_reduced(other.coeffs, self.mod, self.N)
+        c = a.mul(b, method=method)
+        return LimbPoly._from_reduced(c.coeffs, self.mod, self.N)
+
+    # limb 를 slot 의 하위 byte 에 그대로 복사해서 packing/unpacking (계수 단위 loop 없음)
+    def _mul_kronecker(self, other: "LimbPoly") -> "LimbPoly":
+        N = self.N
+        K = self.limbs.shape[0]
+        nb = max(_kronecker_slot_bytes(self.mod.q, N), 4 * K)
+
+        def pack(limbs):
+            slots = np.zeros((N, nb), dtype=np.uint8)
+            slots[:, :4 * K] = np.ascontiguousarray(limbs.T, dtype="<u4").view(np.uint8)
+            return int.from_bytes(slots.tobytes(), "little")
+
+        raw = (pack(self.limbs) * pack(other.limbs)).to_bytes(2 * N * nb, "little")
+        slots = np.frombuffer(raw, dtype=np.uint8).reshape(2 * N, nb)[:, :4 * K]
+        # mod 2^k 는 하위 limb 만 보면 됨
+        low = np.ascontiguousarray(slots).view("<u4").T
+        res = _limb_sub(low[:, :N], low[:, N:], self._top_mask)
+        return LimbPoly._from_limbs(res, self.mod, N)
+
+    def automorphism(self, k: int) -> "LimbPoly":
+        return self.automorphism_with_map(*automorphism_map(self.N, k))
+
+    def automorphism_with_map(self, perm: np.ndarray, sign: np.ndarray) -> "LimbPoly":
+        N = self.N
+        _check_map(perm, sign, N)
+        res = np.empty_like(self.limbs)
+        res[:, perm] = np.where(sign < 0, _limb_neg(self.limbs, self._top_mask), self.limbs)
+        return LimbPoly._from_limbs(res, self.mod, N)
+
+    def div_round(self, divisor: int, target_mod: ModSystem) -> "Poly | LimbPoly | RNSPoly":
+        if divisor & (divisor - 1) == 0:
+            return self.div_round_pow2(divisor.bit_length() - 1, target_mod)
+        return Poly._from_reduced(self.coeffs, self.mod, self.N).div_round(divisor, target_mod)
+
+    def div_round_pow2(self, shift: int, target_mod: ModSystem) -> "Poly | LimbPoly | RNSPoly":
+        k = self.mod.q.bit_length() - 1
+        if not (isinstance(target_mod, SingleMod) and target_mod.is_pow2
+                and target_mod.q.bit_length() - 1 <= k - shift):
+            return Poly._from_reduced(self.coeffs, self.mod, self.N).div_round_pow2(shift, target_mod)
+        # x + 2^(shift-1) 의 carry 가 2^k 를 넘어가도 결과는 q' = 2^(k-shift) 의 배수만큼만 차이
+        acc = self.limbs.astype(np.uint64)
+        if shift > 0:
+            half = 1 << (shift - 1)
+            for j in range(acc.shape[0]):
+                acc[j] += np.uint64((half >> (_LIMB_BITS * j)) & 0xFFFFFFFF)
+        rounded = _limb_normalize(acc, self._top_mask)
+        K_out = _limb_count(target_mod.q)
+        limbs = _limb_shift_right(rounded, shift, K_out, _limb_top_mask(target_mod.q))
+        return LimbPoly._from_limbs(limbs, target_mod, self.N)
+
+    def tolist(self) -> List[int]: return [int(x) for x in self.coeffs]
+
+    def _q_like(self):
+        return self.mod.q
+
+    # --- serialization: limb byte 를 그대로 잘라서 (계수 단위 loop 없음) ---
+    @staticmethod
+    def byte_size(mod: SingleMod, N: int) -> int:
+        return N * _coeff_bytes(mod.q)
+
+    def to_bytes(self) -> bytes:
+        nb = _coeff_bytes(self.mod.q)
+        raw = np.ascontiguousarray(self.limbs.T, dtype="<u4").view(np.uint8)
+        return raw[:, :nb].tobytes()
+
+    @classmethod
+    def from_bytes(cls, buf, mod: SingleMod, N: int) -> "LimbPoly":
+        nb = _coeff_bytes(mod.q)
+        K = _limb_count(mod.q)
+        raw = np.frombuffer(buf, dtype=np.uint8, count=N * nb).reshape(N, nb)
+        padded = np.zeros((N, 4 * K), dtype=np.uint8)
+        padded[:, :nb] = raw
+        limbs = np.ascontiguousarray(padded.view("<u4").T, dtype=np.uint32)
+        # q = 2^k: byte 경계 밖의 bit 는 mod q 로 버림
+        limbs[-1] &= np.uint32(_limb_top_mask(mod.q))
+        return cls._from_limbs(limbs, mod, N)
+
+    def _center_reduce(self):
+        q = self.mod.q
+        x = self.coeffs
+        return np.where(x >= q // 2, x - q, x)
+
+    def _check(self, other: "LimbPoly"):
+        if self.N != other.N or type(self.mod) != type(other.mod):
+            raise TypeError("incompatible polynomials")
+
+class RNSPoly:
+    """Polynomial over Z_Q, Q = prod q_i, stored as residues (limbs x N, uint64)."""
+    __slots__ = ("limbs", "mod", "N")
+    def __init__(self, coeffs: Iterable[int], mod: RNSMod, N: int):
+        if not _is_machine_int_array(coeffs):
+            coeffs = np.array([_to_pyint_scalar(c) for c in coeffs], dtype=object)
+        if len(coeffs) != N:
+            raise ValueError(f"need {N} coeffs")
+        self.mod = mod
+        self.N = N
+        self.limbs = mod.to_limbs(coeffs)
+
+    @classmethod
+    def _from_limbs(cls, limbs: np.ndarray, mod: RNSMod, N: int) -> "RNSPoly":
+        obj = cls.__new__(cls)
+        obj.limbs = limbs
+        obj.mod = mod
+        obj.N = N
+        return obj
+
+    @classmethod
+    def _from_reduced(cls, coeffs: np.ndarray, mod: RNSMod, N: int) -> "RNSPoly":
+        return cls._from_limbs(mod.to_limbs(coeffs), mod, N)
+
+    @classmethod
+    def zero(cls, mod: RNSMod, N: int) -> "RNSPoly":
+        return cls._from_limbs(np.zeros((mod.limbs, N), dtype=np.uint64), mod, N)
+
+    @classmethod
+    def from_int(cls, k: int, mod: RNSMod, N: int) -> "RNSPoly":
+        v = [0]*N
+        v[0] = mod.reduce(k)
+        return cls(v, mod, N)
+
+    def copy(self) -> "RNSPoly": return RNSPoly._from_limbs(self.limbs.copy(), self.mod, self.N)
+
+    @property
+    def coeffs(self) -> np.ndarray:
+        """CRT reconstruction into [0, Q) (fresh object array)."""
+        return self.mod.from_limbs(self.limbs)
+
+    # ring ops (limb-wise, machine word)
+    def __add__(self, other: "RNSPoly") -> "RNSPoly":
+        self._check(other)
+        q = self.mod._col
+        return RNSPoly._from_limbs((self.limbs + other.limbs) % q, self.mod, self.N)
+
+    def __sub__(self, other: "RNSPoly") -> "RNSPoly":
+        self._check(other)
+        q = self.mod._col
+        return RNSPoly._from_limbs((self.limbs + (q - other.limbs)) % q, self.mod, self.N)
+
+    def iadd(self, other: "RNSPoly") -> "RNSPoly":
+        self._check(other)
+        np.add(self.limbs, other.limbs, out=self.limbs)
+        np.remainder(self.limbs, self.mod._col, out=self.limbs)
+        return self
+
+    def isub(self, other: "RNSPoly") -> "RNSPoly":
+        self._check(other)
+        q = self.mod._col
+        np.add(self.limbs, q - other.limbs, out=self.limbs)
+        np.remainder(self.limbs, q, out=self.limbs)
+        return self
+
+    def __neg__(self) -> "RNSPoly":
+        q = self.mod._col
+        return RNSPoly._from_limbs((q - self.limbs) % q, self.mod, self.N)
+
+    def scalarmul(self, k: int) -> "RNSPoly":
+        ks = np.array([k % p for p in self.mod.primes], dtype=np.uint64).reshape(-1, 1)
+        return RNSPoly._from_limbs(mulmod_word(self.limbs, ks, self.mod._col), self.mod, self.N)
+
+    @staticmethod
+    def mul_methods(mod: RNSMod, N: int) -> tuple:
+        return ("ntt",)
+
+    def mul(self, other: "RNSPoly", method: str = "ntt") -> "RNSPoly":
+        self._check(other)
+        out = np.empty_like(self.limbs)
+        for i, p in enumerate(self.mod.primes):
+            if method == "ntt":
+                out[i] = ntt_params(self.N, p).negacyclic_mul(self.limbs[i], other.limbs[i])
+            elif method == "schoolbook":
+                a = Poly._from_reduced(self.limbs[i].astype(object), SingleMod(p), self.N)
+                b = Poly._from_reduced(other.limbs[i].astype(object), SingleMod(p), self.N)
+                out[i] = np.array(a._mul_schoolbook(b).tolist(), dtype=np.uint64)
+            else:
+                raise ValueError("unknown method")
+        return RNSPoly._from_limbs(out, self.mod, self.N)
+
+    def automorphism(self, k: int) -> "RNSPoly":
+        return self.automorphism_with_map(*automorphism_map(self.N, k))
+
+    def automorphism_with_map(self, perm: np.ndarray, sign: np.ndarray) -> "RNSPoly":
+        N = self.N
+        _check_map(perm, sign, N)
+        q = self.mod._col
+        res = np.empty_like(self.limbs)
+        res[:, perm] = np.where(sign < 0, (q - self.limbs) % q, self.limbs)
+        return RNSPoly._from_limbs(res, self.mod, N)
+
+    # divisor 가 target 에 없는 prime 들의 곱이면 CRT 없이 limb 를 버리는 방식으로 계산
+    # (rescale: q_l, key switching: special prime 들의 곱 P)
+    def div_round(self, divisor: int, target_mod: ModSystem) -> "Poly | LimbPoly | RNSPoly":
+        primes = self.mod.primes
+        if isinstance(target_mod, RNSMod) and set(target_mod.primes) <= set(primes):
+            dropped = tuple(p for p in primes if p not in target_mod.primes and divisor % p == 0)
+            if math.prod(dropped) == divisor:
+                return self._drop_limbs(dropped, target_mod)
+        c = (self.coeffs + (divisor >> 1)) // divisor
+        return _poly_cls_for(target_mod)._from_reduced(c % target_mod.q, target_mod, self.N)
+
+    def div_round_pow2(self, shift: int, target_mod: ModSystem) -> "Poly | LimbPoly | RNSPoly":
+        return self.div_round(1 << shift, target_mod)
+
+    def _drop_limbs(self, dropped: tuple, target_mod: RNSMod) -> "RNSPoly":
+        # round(x / P) = (x + h - [x + h]_P) / P,  P = prod(dropped), h = P // 2
+        P = math.prod(dropped)
+        h = P >> 1
+        index = {p: i for i, p in enumerate(self.mod.primes)}
+        col = target_mod._col
+        if len(dropped) == 1:
+            p = dropped[0]
+            r = (self.limbs[index[p]] + np.uint64(h % p)) % np.uint64(p)
+            r_mod = r % col
+        else:
+            sub = _sub_rns(dropped)
+            x_P = sub.from_limbs(self.limbs[[index[p] for p in dropped]])
+            r = (x_P + h) % P
+            r_mod = np.array([r % q for q in target_mod.primes], dtype=np.uint64)
+        h_mod = np.array([h % q for q in target_mod.primes], dtype=np.uint64).reshape(-1, 1)
+        P_inv = np.array([pow(P % q, -1, q) for q in target_mod.primes], dtype=np.uint64).reshape(-1, 1)
+        x = self.limbs[[index[q] for q in target_mod.primes]]
+        y = (x + h_mod) % col
+        y = (y + (col - r_mod)) % col
+        return RNSPoly._from_limbs(mulmod_word(y, P_inv, col), target_mod, self.N)
+
+    def tolist(self) -> List[int]: return [int(x) for x in self.coeffs]
+
+    def _q_like(self):
+        return self.mod.q
+
+    # --- serialization: limb 별로 ceil(log2 q_i / 8) byte ---
+    @staticmethod
+    def byte_size(mod: RNSMod, N: int) -> int:
+        return N * sum(_coeff_bytes(p) for p in mod.primes)
+
+    def to_bytes(self) -> bytes:
+        return b"".join(_words_to_bytes(self.limbs[i], _coeff_bytes(p))
+                        for i, p in enumerate(self.mod.primes))
+
+    @classmethod
+    def from_bytes(cls, buf, mod: RNSMod, N: int) -> "RNSPoly":
+        view = memoryview(buf)
+        limbs = np.empty((mod.limbs, N), dtype=np.uint64)
+        offset = 0
+        for i, p in enumerate(mod.primes):
+            nb = _coeff_bytes(p)
+            limbs[i] = _words_from_bytes(view[offset:offset + N * nb], nb, N)
+            offset += N * nb
+        _check_serialized_range(limbs, mod._col)
+        return cls._from_limbs(limbs, mod, N)
+
+    def _center_reduce(self):
+        return self.mod.center_from_limbs(self.limbs)
+
+    def _check(self, other: "RNSPoly"):
+        if self.N != other.N or self.mod != other.mod:
+            raise TypeError("incompatible polynomials")
+
+def _poly_cls_for(mod: ModSystem) -> type:
+    if isinstance(mod, RNSMod):
+        return RNSPoly
+    if isinstance(mod, SingleMod) and mod.is_pow2:
+        return LimbPoly
+    return Poly
+
 # ---------- Ring & elements ----------
 
 @dataclass
@@ -184,31 +863,72 @@ class CyclotomicRing:
     def create(cls, N: int, modsys: ModSystem) -> "CyclotomicRing":
         return cls(N=N, modsys=modsys, poly=Cyclotomic2N(N))
 
+    @cached_property
+    def ntt(self) -> NTTParams | None:
+        """Precomputed NTT tables, or None if the modulus is not NTT-friendly."""
+        if isinstance(self.modsys, SingleMod) and is_ntt_friendly(self.N, self.modsys.q):
+            return ntt_params(self.N, self.modsys.q)
+        return None
+
+    @cached_property
+    def mul_method(self) -> str:
+        """Fastest Poly.mul strategy for this ring's shape (autotuned once, persisted)."""
+        return DISPATCHER.method_for(self)
+
+    @property
+    def poly_cls(self) -> type:
+        return _poly_cls_for(self.modsys)
+
+    def automorphism_map(self, k: int) -> tuple[np.ndarray, np.ndarray]:
+        return automorphism_map(self.N, k)
+
+    def galois_element(self, shift: int) -> int:
+        return galois_element(shift, self.N)
+
     def from_coeffs(self, coeffs: Iterable[int]) -> "RingElem":
-        return RingElem(self, Poly(coeffs, self.modsys, self.N))
-    def zero(self) -> "RingElem": return RingElem(self, Poly.zero(self.modsys, self.N))
-    def one(self) -> "RingElem": return RingElem(self, Poly.from_int(1, self.modsys, self.N))
+        return RingElem(self, self.poly_cls(coeffs, self.modsys, self.N))
+    def from_bytes(self, buf) -> "RingElem":
+        return RingElem(self, self.poly_cls.from_bytes(buf, self.modsys, self.N))
+    @property
+    def byte_size(self) -> int:
+        return self.poly_cls.byte_size(self.modsys, self.N)
+    # 이미 [0, q) 인 object 배열 (더 작은 modulus 에서 lift 하는 경우 등): 검증 생략
+    def _from_reduced(self, coeffs: np.ndarray) -> "RingElem":
+        return RingElem(self, self.poly_cls._from_reduced(coeffs, self.modsys, self.N))
+    def zero(self) -> "RingElem": return RingElem(self, self.poly_cls.zero(self.modsys, self.N))
+    def one(self) -> "RingElem": return RingElem(self, self.poly_cls.from_int(1, self.modsys, self.N))
     def random_uniform(self) -> "RingElem":
-        if isinstance(self.modsys, SingleMod):
-            q = self.modsys.q
-            coeffs = [secrets.randbelow(q) for _ in range(self.N)]
-            return RingElem(self, Poly(coeffs, self.modsys, self.N))
-        else: # For RNS variant
-            raise RuntimeError("Not implemented yet")
-    def sample_ternary(self) -> "RingElem":
-        if isinstance(self.modsys, SingleMod):
-            coeffs = [secrets.randbelow(3) - 1 for _ in range(self.N)]
-            return RingElem(self, Poly(coeffs, self.modsys, self.N))
-        else: # For RNS variant
-            raise RuntimeError("Not implemented yet")
-    def sample_Gaussian(self, sigma=3.2) -> "RingElem":
-            coeffs = [round(random.gauss(0, sigma)) for _ in range(self.N)]
-            return RingElem(self, Poly(coeffs, self.modsys, self.N))
+        return self.expand_uniform(new_seed())
+    # seed 로부터 SHAKE-256 으로 결정적으로 전개한 uniform 원소 (seeded 암호문/키의 a)
+    def expand_uniform(self, seed: bytes) -> "RingElem":
+        if self.poly_cls is LimbPoly:
+            K = _limb_count(self.modsys.q)
+            return self._uniform_from_bytes(XOF(seed).read(4 * K * self.N))
+        elif isinstance(self.modsys, SingleMod):
+            coeffs = uniform_mod(XOF(seed), self.modsys.q, self.N).astype(object)
+            return RingElem(self, Poly._from_reduced(coeffs, self.modsys, self.N))
+        else: # limb 마다 domain 을 나눈 독립적인 stream
+            limbs = np.array([uniform_mod(XOF(seed, i.to_bytes(2, "little")), p, self.N)
+                              for i, p in enumerate(self.modsys.primes)], dtype=np.uint64)
+            return RingElem(self, RNSPoly._from_limbs(limbs, self.modsys, self.N))
+    def _uniform_from_bytes(self, buf: bytes) -> "RingElem":
+        q = self.modsys.q
+        K = _limb_count(q)
+        limbs = np.frombuffer(buf, dtype="<u4").reshape(K, self.N).astype(np.uint32)
+        limbs[-1] &= np.uint32(_limb_top_mask(q))
+        return RingElem(self, LimbPoly._from_limbs(limbs, self.modsys, self.N))
+    # seed 를 주면 결정적 (재현/테스트용), 없으면 새 seed
+    def sample_ternary(self, seed: bytes | None = None) -> "RingElem":
+        coeffs = ternary(XOF(seed or new_seed(), b"ternary"), self.N)
+        return self.from_coeffs(coeffs)
+    def sample_Gaussian(self, sigma=3.2, seed: bytes | None = None) -> "RingElem":
+        coeffs = gaussian(XOF(seed or new_seed(), b"gaussian"), self.N, sigma)
+        return self.from_coeffs(coeffs)
 
 @dataclass
 class RingElem:
     ring: CyclotomicRing
-    poly: Poly
+    poly: Poly | LimbPoly | RNSPoly
 
     def __post_init__(self):
         if self.poly.N != self.ring.N:
@@ -221,56 +941,27 @@ class RingElem:
         self._check(other); return RingElem(self.ring, self.poly - other.poly)
     def __neg__(self) -> "RingElem":
         return RingElem(self.ring, -self.poly)
+    # in-place (self 의 버퍼를 수정): 같은 poly 를 공유하는 다른 원소도 함께 바뀜
+    def iadd(self, other: "RingElem") -> "RingElem":
+        self._check(other); self.poly.iadd(other.poly); return self
+    def isub(self, other: "RingElem") -> "RingElem":
+        self._check(other); self.poly.isub(other.poly); return self
+    def copy(self) -> "RingElem":
+        return RingElem(self.ring, self.poly.copy())
     def scalarmul(self, k: int) -> "RingElem":
         return RingElem(self.ring, self.poly.scalarmul(k))
     def __mul__(self, other: "RingElem") -> "RingElem":
-        self._check(other); return RingElem(self.ring, self.poly.mul(other.poly, method="schoolbook"))
+        self._check(other); return RingElem(self.ring, self.poly.mul(other.poly, method=self.ring.mul_method))
+    def div_round(self, divisor: int, ring: CyclotomicRing) -> "RingElem":
+        """round(x / divisor) as an element of `ring` (rescale, key switching)."""
+        return RingElem(ring, self.poly.div_round(divisor, ring.modsys))
     def Auto(self, k: int) -> "RingElem":
-        return RingElem(self.ring, self.poly.automorphism(k))
+        return RingElem(self.ring, self.poly.automorphism_with_map(*self.ring.automorphism_map(k)))
 
     def tolist(self) -> List[int]: return self.poly.tolist()
+    def to_bytes(self) -> bytes: return self.poly.to_bytes()
 
     def _check(self, other: "RingElem"):
         if self.ring is not other.ring:
             # Strict: require same ring instance; relax if needed by checking N & modsys equality.
             raise TypeError("elements from different rings")
-
-
-''' Notes
-class CyclotomicRing:
-    ...
-    def automorphism_map(self, k: int):
-        """Precompute target indices and signs (+1/-1) for X -> X^k."""
-        N = self.N
-        M = 2 * N
-        k %= M
-        if k % 2 == 0 or math.gcd(k, M) != 1:
-            raise ValueError("k must be odd and coprime to 2N")
-        perm = [0] * N     # target index in [0, N)
-        sign = [1] * N     # +1 or -1
-        for i in range(N):
-            j = (i * k) % M
-            if j < N:
-                perm[i] = j
-                sign[i] = 1
-            else:
-                perm[i] = j - N
-                sign[i] = -1
-        return np.array(perm, dtype=int), np.array(sign, dtype=int)
-
-class Poly:
-    ...
-    def automorphism_with_map(self, perm: np.ndarray, sign: np.ndarray) -> "Poly":
-        """Apply a precomputed automorphism map (perm, sign)."""
-        if len(perm) != self.N or len(sign) != self.N:
-            raise ValueError("bad map shape")
-        q = self._q_like()
-        res = np.zeros(self.N, dtype=object)
-        for i in range(self.N):
-            j = int(perm[i])
-            if sign[i] == 1:
-                res[j] = self.coeffs[i]
-            else:
-                res[j] = (-self.coeffs[i]) % q
-        return Poly(res, self.mod, self.N)
-'''
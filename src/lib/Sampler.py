@@ -0,0 +1,121 @@
+from __future__ import annotations
+import decimal
+import hashlib
+import math
+import secrets
+from decimal import Decimal
+from functools import lru_cache
+import numpy as np
+
+# SHAKE-256 (XOF) 기반 샘플링: 같은 seed 로부터 항상 같은 계수 배열을 만듦.
+# seed 를 주지 않으면 OS CSPRNG (secrets) 에서 새 seed 를 뽑음.
+# 모든 sampler 는 계수 배열 전체를 한 번에 (numpy) 생성.
+
+SEED_BYTES = 32
+
+def new_seed() -> bytes:
+    return secrets.token_bytes(SEED_BYTES)
+
+class XOF:
+    """Sequential reader over SHAKE-256(domain || seed)."""
+    def __init__(self, seed: bytes, domain: bytes = b""):
+        if len(seed) != SEED_BYTES:
+            raise ValueError(f"seed should be {SEED_BYTES} bytes")
+        self._shake = hashlib.shake_256(domain + seed)
+        self._buf = b""
+        self._pos = 0
+
+    def read(self, n: int) -> bytes:
+        # hashlib 의 shake 는 이어서 squeeze 할 수 없으므로 prefix 를 두 배씩 늘려가며 다시 계산
+        need = self._pos + n
+        if need > len(self._buf):
+            self._buf = self._shake.digest(max(need, 2 * len(self._buf)))
+        out = self._buf[self._pos:need]
+        self._pos = need
+        return out
+
+def uniform_mod(xof: XOF, q: int, count: int) -> np.ndarray:
+    """`count` uniform integers in [0, q) by rejection sampling on bit-masked words.
+
+    q < 2^64 이면 uint64 배열, 아니면 object 배열.
+    """
+    bits = (q - 1).bit_length()
+    nbytes = max(1, -(-bits // 8))
+    if q & (q - 1) == 0: # power-of-two: rejection 없음
+        return _masked_words(xof.read(nbytes * count), nbytes, bits, count)
+
+    out = []
+    have = 0
+    while have < count:
+        # 수락 확률 > 1/2: 남은 개수의 두 배 정도씩 뽑음
+        draw = 2 * (count - have) + 8
+        words = _masked_words(xof.read(nbytes * draw), nbytes, bits, draw)
+        words = words[words < q]
+        out.append(words)
+        have += len(words)
+    return np.concatenate(out)[:count]
+
+def _masked_words(buf: bytes, nbytes: int, bits: int, count: int) -> np.ndarray:
+    if nbytes <= 8:
+        raw = np.frombuffer(buf, dtype=np.uint8).reshape(count, nbytes)
+        padded = np.zeros((count, 8), dtype=np.uint8)
+        padded[:, :nbytes] = raw
+        words = padded.view("<u8").reshape(count).astype(np.uint64)
+        if bits < 64:
+            words &= np.uint64((1 << bits) - 1)
+        return words
+    mask = (1 << bits) - 1
+    return np.array([int.from_bytes(buf[i * nbytes:(i + 1) * nbytes], "little") & mask
+                     for i in range(count)], dtype=object)
+
+def ternary(xof: XOF, count: int) -> np.ndarray:
+    """`count` uniform values in {-1, 0, 1} (int64)."""
+    out = []
+    have = 0
+    while have < count:
+        # byte < 255 = 3 * 85 만 받아서 mod 3 이 균등하도록
+        draw = (count - have) + (count - have) // 64 + 8
+        raw = np.frombuffer(xof.read(draw), dtype=np.uint8)
+        raw = raw[raw < 255]
+        out.append(raw)
+        have += len(raw)
+    return (np.concatenate(out)[:count] % 3).astype(np.int64) - 1
+
+# 이산 Gaussian 의 꼬리는 tail * sigma 에서 자름
+GAUSSIAN_TAIL = 10
+# CDT 계산 정밀도 (십진 자리): 2^64 는 20 자리, 나머지는 누적 오차 여유
+CDT_DIGITS = 40
+
+@lru_cache(maxsize=None)
+def cdt_table(sigma: float, tail: int = GAUSSIAN_TAIL) -> tuple[np.ndarray, int]:
+    """Cumulative distribution table over [-t, t] scaled to 2^64 (uint64), and t.
+
+    확률은 decimal (CDT_DIGITS 자리) 로 계산하고 누적합도 그대로 더해서 마지막에 2^64 를 곱해 내림:
+    float64 로 누적하면 53 bit 까지만 의미가 있음.
+    """
+    t = max(1, math.ceil(tail * sigma))
+    with decimal.localcontext() as ctx:
+        ctx.prec = CDT_DIGITS
+        two_sigma_sq = 2 * Decimal(sigma) ** 2
+        rho = [(-Decimal(x * x) / two_sigma_sq).exp() for x in range(-t, t + 1)]
+        total = sum(rho)
+        table = []
+        acc = Decimal(0)
+        for r in rho[:-1]:
+            acc += r
+            table.append(min((1 << 64) - 1, int(acc * (1 << 64) / total)))
+    return np.array(table, dtype=np.uint64), t
+
+def gaussian(xof: XOF, count: int, sigma: float) -> np.ndarray:
+    """`count` discrete Gaussian samples (int64) by CDT inversion.
+
+    uniform word 를 table 전체와 비교해서 개수를 세므로 값에 따른 분기/조기 종료가 없음.
+    """
+    table, t = cdt_table(float(sigma))
+    u = np.frombuffer(xof.read(8 * count), dtype="<u8").astype(np.uint64)
+    out = np.empty(count, dtype=np.int64)
+    step = max(1, (1 << 16) // len(table)) # (step x table) 크기로 나눠서 비교
+    for start in range(0, count, step):
+        chunk = u[start:start + step]
+        out[start:start + step] = (chunk[:, None] >= table[None, :]).sum(axis=1)
+    return out - t
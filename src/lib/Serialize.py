@@ -0,0 +1,120 @@
+from __future__ import annotations
+import mmap
+import struct
+import traceback
+from lib.Polynomial import CyclotomicRing, RingElem
+from lib.Sampler import SEED_BYTES
+
+# Binary format (little-endian, version 1)
+#   header : magic "TCKS" | version u8 | kind u8 | flags u8 | components u8 |
+#            N u32 | level u16 | shift i32 | chain id 8B | scale length u16 | scale
+#   [seed 32B]  (FLAG_SEEDED: 첫 번째 component 는 저장하지 않음)
+#   components : 계수마다 ceil(log2 q / 8) byte (RNS 는 limb 별로)
+
+MAGIC = b"TCKS"
+VERSION = 1
+
+KIND_CIPHERTEXT = 1
+KIND_PLAINTEXT = 2
+KIND_SECRET_KEY = 3
+KIND_RELINEARIZATION_KEY = 4
+KIND_ROTATION_KEY = 5
+KIND_PUBLIC_KEY = 6
+
+FLAG_SEEDED = 1
+FLAG_AUX = 2 # component 가 auxRing 위에 있음 (evaluation key)
+
+_HEADER = struct.Struct("<4sBBBBIHi8sH")
+
+def pack(kind: int, params, level: int, scale: int, components: list["RingElem | None"],
+         seed: bytes | None = None, aux: bool = False, shift: int = 0) -> bytes:
+    flags = (FLAG_SEEDED if seed is not None else 0) | (FLAG_AUX if aux else 0)
+    scale_bytes = int(scale).to_bytes(max(1, -(-int(scale).bit_length() // 8)), "little")
+    parts = [_HEADER.pack(MAGIC, VERSION, kind, flags, len(components), params.N, level,
+                          shift, params.chain_id, len(scale_bytes)), scale_bytes]
+    if seed is not None:
+        parts.append(seed)
+        components = components[1:]
+    parts.extend(c.to_bytes() for c in components)
+    return b"".join(parts)
+
+class Header:
+    def __init__(self, kind, flags, count, N, level, shift, chain_id, scale):
+        self.kind = kind
+        self.flags = flags
+        self.count = count
+        self.N = N
+        self.level = level
+        self.shift = shift
+        self.chain_id = chain_id
+        self.scale = scale
+
+    @property
+    def seeded(self) -> bool:
+        return bool(self.flags & FLAG_SEEDED)
+
+def unpack(data, params, kind: int) -> tuple[Header, list["RingElem | None"], bytes | None]:
+    """Parse `data` (bytes, memoryview or mmap) without copying the payload."""
+    # 오류로 빠져나가도 view 를 바로 놓아야 mmap 을 닫을 수 있음
+    view = memoryview(data)
+    try:
+        return _unpack_view(view, params, kind)
+    finally:
+        view.release()
+
+def _unpack_view(view: memoryview, params, kind: int):
+    if len(view) < _HEADER.size:
+        raise ValueError("truncated header")
+    magic, version, got_kind, flags, count, N, level, shift, chain_id, scale_len = \
+        _HEADER.unpack_from(view)
+    if magic != MAGIC:
+        raise ValueError("not a ToyCKKS object")
+    if version != VERSION:
+        raise ValueError(f"unsupported format version {version}")
+    if got_kind != kind:
+        raise ValueError(f"expected object kind {kind}, got {got_kind}")
+    if N != params.N or chain_id != params.chain_id:
+        raise ValueError("object was serialized under different parameters")
+    offset = _HEADER.size
+    scale = int.from_bytes(view[offset:offset + scale_len], "little")
+    offset += scale_len
+    header = Header(got_kind, flags, count, N, level, shift, chain_id, scale)
+
+    ring = _ring_for(params, header)
+    seed = None
+    components = []
+    if header.seeded:
+        seed = bytes(view[offset:offset + SEED_BYTES])
+        offset += SEED_BYTES
+        components.append(None)
+    size = ring.byte_size
+    for _ in range(count - len(components)):
+        if offset + size > len(view):
+            raise ValueError("truncated payload")
+        components.append(ring.from_bytes(view[offset:offset + size]))
+        offset += size
+    if offset != len(view):
+        raise ValueError("trailing bytes after payload")
+    return header, components, seed
+
+def _ring_for(params, header: Header) -> CyclotomicRing:
+    if header.flags & FLAG_AUX:
+        return params.auxRing
+    if header.level > params.max_level:
+        raise ValueError(f"level {header.level} exceeds max level {params.max_level}")
+    return params.rings[header.level]
+
+def save(path: str, data: bytes):
+    with open(path, "wb") as f:
+        f.write(data)
+
+def load(path: str, loader):
+    """Map `path` read-only and hand the mapping to `loader` (no intermediate copy)."""
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            try:
+                return loader(mm)
+            except Exception as e:
+                # traceback 의 frame 들이 잡고 있는 slice (mmap 의 export) 를 놓아야 close 가 됨
+                traceback.clear_frames(e.__traceback__)
+                raise
@@ -0,0 +1,161 @@
+from __future__ import annotations
+import threading
+from typing import NamedTuple
+import numpy as np
+from multiprocessing import shared_memory
+from lib.Ciphertext import Ciphertext
+from lib.Plaintext import Plaintext
+from lib.Polynomial import CyclotomicRing, RingElem, LimbPoly, RNSPoly, _limb_count
+
+# multiprocessing.shared_memory 위의 고정 크기 slot 배열.
+# slot 하나에 component 최대 3개 (aa, abba, bb) 를 각 backend 의 limb 배치 그대로 저장:
+#   LimbPoly: (K x N) uint32,  RNSPoly: (L x N) uint64
+# 프로세스 사이에는 handle (segment, offset, level, ...) 만 넘기고,
+# 받는 쪽은 같은 segment 를 attach 해서 NumPy view 로 바로 읽음 (pickle / 복사 없음).
+
+KIND_CIPHERTEXT = 0
+KIND_PLAINTEXT = 1
+
+MAX_COMPONENTS = 3
+
+class ArenaHandle(NamedTuple):
+    segment: str
+    offset: int
+    level: int
+    count: int
+    scale: int
+    kind: int
+
+class CiphertextArena:
+    """Fixed-size ciphertext / plaintext slots in a shared memory segment.
+
+    slot 할당 (put / reserve / free) 은 segment 를 만든 프로세스에서만.
+    attach 한 프로세스는 handle 로 읽고 (get), 미리 받은 slot 에 쓰기만 (write) 함.
+    """
+    # name 이 주어지면 새로 만들지 않고 기존 segment 에 attach (slots 는 segment 크기로부터)
+    def __init__(self, params, slots: int = 64, name: str | None = None):
+        self.params = params
+        self.component_size = max(_native_nbytes(ring) for ring in params.rings)
+        self.slot_size = MAX_COMPONENTS * self.component_size
+        self.owner = name is None
+        if self.owner:
+            if slots < 1:
+                raise ValueError("slots should be positive")
+            self.shm = shared_memory.SharedMemory(create=True, size=slots * self.slot_size)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+            slots = self.shm.size // self.slot_size
+        self.slots = slots
+        self.name = self.shm.name
+        self._free = list(range(slots - 1, -1, -1)) if self.owner else []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def attach(cls, name: str, params) -> "CiphertextArena":
+        return cls(params, name=name)
+
+    # --- slot 관리 (owner) ---
+    def reserve(self) -> "ArenaHandle":
+        """Take an empty slot (count 0) for an object another process will `write`."""
+        with self._lock:
+            if not self._free:
+                raise RuntimeError("Shared arena is full.")
+            slot = self._free.pop()
+        return ArenaHandle(self.name, slot * self.slot_size, 0, 0, 0, KIND_CIPHERTEXT)
+
+    def put(self, obj: "Ciphertext | Plaintext") -> "ArenaHandle":
+        return self.write(self.reserve(), obj)
+
+    def free(self, handle: "ArenaHandle"):
+        self._check_offset(handle)
+        with self._lock:
+            self._free.append(handle.offset // self.slot_size)
+
+    @property
+    def available(self) -> int:
+        return len(self._free)
+
+    # --- 읽기 / 쓰기 (모든 프로세스) ---
+    def write(self, handle: "ArenaHandle", obj: "Ciphertext | Plaintext") -> "ArenaHandle":
+        """Store `obj` in a reserved slot; returns the handle updated to obj's level/size."""
+        kind, components = _split(obj)
+        handle = handle._replace(level=obj.level, count=len(components), scale=obj.scale,
+                                 kind=kind)
+        self._write_components(handle, components)
+        return handle
+
+    def get(self, handle: "ArenaHandle", copy: bool = True) -> "Ciphertext | Plaintext":
+        """Rebuild the object in `handle`.
+
+        copy=False: component 가 shared memory 의 read-only view 를 그대로 사용 (zero-copy).
+        slot 이 free 된 뒤에는 쓰면 안 됨.
+        """
+        self._check_handle(handle)
+        ring = self.params.rings[handle.level]
+        components = []
+        for i in range(handle.count):
+            view = self._view(ring, handle.offset + i * self.component_size)
+            if copy:
+                view = view.copy()
+            else:
+                view.flags.writeable = False
+            components.append(RingElem(ring, ring.poly_cls._from_limbs(view, ring.modsys, ring.N)))
+        if handle.kind == KIND_PLAINTEXT:
+            return Plaintext(components[0], handle.scale, handle.level)
+        return Ciphertext(components, handle.scale, handle.level)
+
+    def close(self):
+        self.shm.close()
+
+    # owner 만: segment 삭제
+    def unlink(self):
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+    def __enter__(self) -> "CiphertextArena":
+        return self
+
+    def __exit__(self, *exc):
+        self.unlink()
+
+    def _write_components(self, handle: "ArenaHandle", components: list["RingElem"]):
+        self._check_handle(handle)
+        ring = self.params.rings[handle.level]
+        for i, c in enumerate(components):
+            if c.ring is not ring:
+                raise TypeError("component ring does not match the handle level")
+            self._view(ring, handle.offset + i * self.component_size)[...] = c.poly.limbs
+
+    def _view(self, ring: "CyclotomicRing", offset: int) -> np.ndarray:
+        shape, dtype = _native_layout(ring)
+        return np.ndarray(shape, dtype=dtype, buffer=self.shm.buf, offset=offset)
+
+    def _check_offset(self, handle: "ArenaHandle"):
+        if handle.segment != self.name:
+            raise ValueError("handle belongs to a different arena")
+        if handle.offset % self.slot_size or not 0 <= handle.offset < self.slots * self.slot_size:
+            raise ValueError("invalid arena offset")
+
+    def _check_handle(self, handle: "ArenaHandle"):
+        self._check_offset(handle)
+        if not 0 <= handle.level <= self.params.max_level:
+            raise ValueError(f"level {handle.level} exceeds max level {self.params.max_level}")
+        if not 1 <= handle.count <= MAX_COMPONENTS:
+            raise ValueError("invalid component count")
+
+def _split(obj: "Ciphertext | Plaintext") -> tuple[int, list["RingElem"]]:
+    if isinstance(obj, Plaintext):
+        return KIND_PLAINTEXT, [obj.ringelem]
+    return KIND_CIPHERTEXT, obj.components
+
+def _native_layout(ring: "CyclotomicRing") -> tuple[tuple[int, int], type]:
+    if ring.poly_cls is LimbPoly:
+        return (_limb_count(ring.modsys.q), ring.N), np.uint32
+    if ring.poly_cls is RNSPoly:
+        return (ring.modsys.limbs, ring.N), np.uint64
+    raise TypeError("shared arena needs a power-of-two or RNS modulus")
+
+def _native_nbytes(ring: "CyclotomicRing") -> int:
+    (rows, cols), dtype = _native_layout(ring)
+    return rows * cols * np.dtype(dtype).itemsize
@@ -0,0 +1,10 @@
+import pytest
+from lib import Dispatcher
+
+# 테스트는 ~/.cache 의 autotune 결과를 읽거나 쓰지 않음: 테스트마다 빈 cache 파일에서 시작
+@pytest.fixture(autouse=True)
+def isolated_mul_dispatch_cache(tmp_path, monkeypatch):
+    cache_path = str(tmp_path / "mul_dispatch.json")
+    monkeypatch.setenv(Dispatcher.CACHE_ENV, cache_path)
+    monkeypatch.setattr(Dispatcher.DISPATCHER, "cache_path", cache_path)
+    monkeypatch.setattr(Dispatcher.DISPATCHER, "_table", None)
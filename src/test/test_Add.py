@@ -65,3 +65,73 @@ def test_ciphertext_messages_addition(N):
         result = cc.decrypt(added, secret_key)
 
         assert np.allclose(ideal, result, rtol=0, atol=1e-5)
+
+@pytest.mark.parametrize("N", [8, 16, 32, 64])
+@pytest.mark.parametrize("rns", [False, True])
+def test_inplace_operations(N, rns):
+    TESTPARAM = CKKSParameters(N, 250, 40, 300, 3.2, rns=rns)
+    cc = CryptoContext(TESTPARAM)
+    max_level = cc.max_level
+    slot_count = cc.slot_count
+
+    secret_key = cc.keygen()
+    relin_key = cc.relinearization_keygen(secret_key)
+    rotation_key = cc.rotation_keygen(1, secret_key)
+
+    msgs = [np.random.randint(-100, 100, size=slot_count) / 7 for _ in range(4)]
+
+    # 누적 버퍼는 그대로, 레벨이 낮은 src 가 오면 dst 레벨을 내림
+    acc = cc.encrypt(msgs[0], secret_key)
+    buffers = [c.poly for c in acc.components]
+    for msg in msgs[1:]:
+        cc.add_inplace(acc, cc.encrypt(msg, secret_key))
+    assert [c.poly for c in acc.components] == buffers
+    assert np.allclose(sum(msgs), cc.decrypt(acc, secret_key), rtol=0, atol=1e-4)
+
+    cc.add_inplace(acc, cc.encrypt(msgs[0], secret_key, max_level - 1))
+    assert acc.level == max_level - 1
+    ideal = sum(msgs) + msgs[0]
+    assert np.allclose(ideal, cc.decrypt(acc, secret_key), rtol=0, atol=1e-4)
+
+    # 3개짜리 암호문 누적
+    ct = cc.encrypt(msgs[1], secret_key)
+    cc.add_inplace(acc, cc.mul(ct, ct, relinearize=False))
+    ideal = ideal + msgs[1] * msgs[1]
+    assert len(acc.components) == 3
+    assert np.allclose(ideal, cc.decrypt(acc, secret_key), rtol=0, atol=1e-3)
+
+    cc.mul_plain_inplace(acc, cc.encode(msgs[2]))
+    ideal = ideal * msgs[2]
+    assert np.allclose(ideal, cc.decrypt(acc, secret_key), rtol=0, atol=1e-2)
+
+    cc.rotate_inplace(acc, rotation_key, relin_key)
+    assert len(acc.components) == 2
+    assert np.allclose(np.roll(ideal, -1), cc.decrypt(acc, secret_key), rtol=0, atol=1e-2)
+
+    # copy 는 버퍼를 공유하지 않음
+    snapshot = acc.copy()
+    cc.add_inplace(acc, acc)
+    assert np.allclose(np.roll(ideal, -1), cc.decrypt(snapshot, secret_key), rtol=0, atol=1e-2)
+    assert np.allclose(2 * np.roll(ideal, -1), cc.decrypt(acc, secret_key), rtol=0, atol=1e-2)
+
+@pytest.mark.parametrize("N", [8, 16, 32, 64])
+@pytest.mark.parametrize("rns", [False, True])
+def test_inplace_after_add_plain(N, rns):
+    TESTPARAM = CKKSParameters(N, 250, 40, 300, 3.2, rns=rns)
+    cc = CryptoContext(TESTPARAM)
+    slot_count = cc.slot_count
+
+    secret_key = cc.keygen()
+    msg1 = np.random.randint(-100, 100, size=slot_count) / 7
+    msg2 = np.random.randint(-100, 100, size=slot_count) / 3
+
+    # add_plain 결과에 add_inplace 를 해도 원래 암호문은 그대로 (2개, 3개짜리 모두)
+    ct = cc.encrypt(msg1, secret_key)
+    triple = cc.mul(ct, ct, relinearize=False)
+    for source, ideal in [(ct, msg1), (triple, msg1 * msg1)]:
+        before = [c.tolist() for c in source.components]
+        added = cc.add_plain(source, cc.encode(msg2, source.level))
+        cc.add_inplace(added, cc.encrypt(msg2, secret_key, source.level))
+        assert [c.tolist() for c in source.components] == before
+        assert np.allclose(ideal, cc.decrypt(source, secret_key), rtol=0, atol=1e-3)
+        assert np.allclose(ideal + 2 * msg2, cc.decrypt(added, secret_key), rtol=0, atol=1e-3)
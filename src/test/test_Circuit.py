@@ -0,0 +1,182 @@
+import threading
+import pytest
+import numpy as np
+from core.parameters import CKKSParameters
+from core.cryptocontext import CryptoContext
+from core.circuit import Circuit
+from core.scheduler import DAGScheduler, critical_path
+from lib.Keys import RotationKeySet
+
+# key 를 찾은 thread 를 기록
+class _RecordingKeySet(RotationKeySet):
+    def __init__(self, keyset: "RotationKeySet"):
+        super().__init__(keyset.params, keyset.keys)
+        self.threads = set()
+
+    def _find(self, shift: int):
+        self.threads.add(threading.get_ident())
+        return super()._find(shift)
+
+@pytest.mark.parametrize("N", [8, 16, 32, 64])
+@pytest.mark.parametrize("rns", [False, True])
+def test_compiled_circuit(N, rns):
+    TESTPARAM = CKKSParameters(N, 250, 40, 300, 3.2, rns=rns)
+    cc = CryptoContext(TESTPARAM)
+    slot_count = cc.slot_count
+
+    secret_key = cc.keygen()
+    relin_key = cc.relinearization_keygen(secret_key)
+    keyset = cc.rotation_keyset_gen(secret_key)
+
+    msg1 = np.random.randint(-10, 10, size=slot_count) / 7
+    msg2 = np.random.randint(-10, 10, size=slot_count) / 7
+    weight = np.random.randint(-10, 10, size=slot_count) / 3
+    bias = np.random.randint(-10, 10, size=slot_count) / 5
+
+    circuit = Circuit(TESTPARAM)
+    x = circuit.input("x")
+    y = circuit.input("y")
+    hidden = x * y + x * x + (x * weight) * 0.5 + bias + 1.5
+    shifted = y.rotate(1) + y.rotate(3) + y.rotate(1)
+    circuit.output("hidden", hidden + shifted)
+    circuit.output("rotated", hidden.rotate(2).rotate(-1))
+
+    compiled = circuit.compile()
+    counts = compiled.counts
+    assert counts["rotate"] == 3      # y.rotate(1) 공유, 회전의 회전은 하나로
+    assert counts["dot"] == 1         # x*y + x*x: rescale / relinearize 한 번
+    assert counts["mul_plain"] == 1   # (x * weight) * 0.5 -> x * (0.5 weight)
+    assert counts["add_plain"] == 1   # bias + 1.5
+    assert counts["relinearize"] == 1 # 회전 전 / 출력 전에 한 번만
+
+    ct1 = cc.encrypt(msg1, secret_key)
+    ct2 = cc.encrypt(msg2, secret_key)
+    outputs = compiled.run(cc, {"x": ct1, "y": ct2}, relin_key, keyset)
+
+    ideal = msg1 * msg2 + msg1 * msg1 + msg1 * weight * 0.5 + bias + 1.5
+    ideal_shifted = 2 * np.roll(msg2, -1) + np.roll(msg2, -3)
+    assert np.allclose(ideal + ideal_shifted, cc.decrypt(outputs["hidden"], secret_key), rtol=0, atol=1e-4)
+    assert np.allclose(np.roll(ideal, -1), cc.decrypt(outputs["rotated"], secret_key), rtol=0, atol=1e-4)
+    assert all(len(ct.components) == 2 for ct in outputs.values())
+
+    # 한 번 compile 해서 여러 입력에
+    outputs = compiled.run(cc, {"x": ct2, "y": ct1}, relin_key, keyset)
+    ideal = msg2 * msg1 + msg2 * msg2 + msg2 * weight * 0.5 + bias + 1.5
+    assert np.allclose(np.roll(ideal, -1), cc.decrypt(outputs["rotated"], secret_key), rtol=0, atol=1e-4)
+
+@pytest.mark.parametrize("N", [8, 16, 32, 64])
+def test_compiled_circuit_levels(N):
+    TESTPARAM = CKKSParameters(N, 250, 40, 300, 3.2)
+    cc = CryptoContext(TESTPARAM)
+    max_level = cc.max_level
+    slot_count = cc.slot_count
+
+    secret_key = cc.keygen()
+    relin_key = cc.relinearization_keygen(secret_key)
+
+    msg1 = np.random.randint(-10, 10, size=slot_count) / 7
+    msg2 = np.random.randint(-10, 10, size=slot_count) / 7
+
+    # 여러 번 쓰이는 중간 결과 (square) 는 한 번만 계산하고 relinearize 도 한 번
+    circuit = Circuit(TESTPARAM)
+    x = circuit.input("x")
+    y = circuit.input("y", max_level - 1)
+    square = x * x
+    cube = square * x
+    circuit.output("a", cube + square + y)
+    circuit.output("b", square * y + y)
+    compiled = circuit.compile()
+    assert compiled.counts["mul"] == 3
+    assert compiled.counts["relinearize"] == 3 # square (곱셈 전, 덧셈에도 공유), 출력 a, b
+    assert compiled.counts["level_down"] == 3  # x, square, y (a 와 b 가 공유)
+
+    outputs = compiled.run(cc, {"x": cc.encrypt(msg1, secret_key), "y": cc.encrypt(msg2, secret_key)},
+                           relin_key)
+    assert outputs["a"].level == max_level - 2
+    assert outputs["b"].level == max_level - 2
+    a = msg1 ** 3 + msg1 ** 2 + msg2
+    b = msg1 ** 2 * msg2 + msg2
+    assert np.allclose(a, cc.decrypt(outputs["a"], secret_key), rtol=0, atol=1e-4)
+    assert np.allclose(b, cc.decrypt(outputs["b"], secret_key), rtol=0, atol=1e-4)
+
+def test_circuit_errors():
+    TESTPARAM = CKKSParameters(16, 250, 40, 300, 3.2)
+    cc = CryptoContext(TESTPARAM)
+    secret_key = cc.keygen()
+    msg = np.random.randint(-10, 10, size=cc.slot_count) / 7
+
+    circuit = Circuit(TESTPARAM)
+    x = circuit.input("x")
+    with pytest.raises(RuntimeError):
+        circuit.input("z", 0) * x
+    with pytest.raises(ValueError):
+        x + Circuit(TESTPARAM).input("x")
+    with pytest.raises(ValueError):
+        circuit.input("x")
+
+    circuit.output("y", (x * x).rotate(1))
+    compiled = circuit.compile()
+    with pytest.raises(ValueError):
+        compiled.run(cc, {})
+    with pytest.raises(RuntimeError):
+        compiled.run(cc, {"x": cc.encrypt(msg, secret_key)})
+    with pytest.raises(RuntimeError): # rotation key 없음
+        compiled.run(cc, {"x": cc.encrypt(msg, secret_key)}, cc.relinearization_keygen(secret_key))
+
+@pytest.mark.parametrize("N", [8, 16, 32, 64])
+@pytest.mark.parametrize("workers", [1, 3])
+def test_dag_scheduler(N, workers):
+    TESTPARAM = CKKSParameters(N, 250, 40, 300, 3.2)
+    cc = CryptoContext(TESTPARAM)
+    slot_count = cc.slot_count
+
+    secret_key = cc.keygen()
+    relin_key = cc.relinearization_keygen(secret_key)
+    keyset = cc.rotation_keyset_gen(secret_key)
+
+    msg = np.random.randint(-10, 10, size=slot_count) / 7
+    weights = [np.random.randint(-10, 10, size=slot_count) / 3 for _ in range(4)]
+
+    # 서로 독립적인 branch 가 많은 회로: 회전들의 합 + 평문 곱들
+    circuit = Circuit(TESTPARAM)
+    x = circuit.input("x")
+    rotated = [x.rotate(shift) for shift in (1, 2, 3, 5, 6)]
+    total = rotated[0]
+    for r in rotated[1:]:
+        total = total + r
+    products = [(x * w).rotate(i + 1) for i, w in enumerate(weights)]
+    branch = products[0]
+    for p in products[1:]:
+        branch = branch + p
+    circuit.output("total", total)
+    circuit.output("branch", branch * x)
+    compiled = circuit.compile()
+
+    scheduler = DAGScheduler(workers=workers)
+    recording = _RecordingKeySet(keyset)
+    outputs = compiled.run(cc, {"x": cc.encrypt(msg, secret_key)}, relin_key, recording, scheduler)
+    # rotation key 는 scheduling thread 에서만 찾음 (worker thread 는 keyset 을 건드리지 않음)
+    assert recording.threads == {threading.get_ident()}
+
+    ideal_total = sum(np.roll(msg, -s) for s in (1, 2, 3, 5, 6))
+    ideal_branch = sum(np.roll(msg * w, -(i + 1)) for i, w in enumerate(weights)) * msg
+    assert np.allclose(ideal_total, cc.decrypt(outputs["total"], secret_key), rtol=0, atol=1e-4)
+    assert np.allclose(ideal_branch, cc.decrypt(outputs["branch"], secret_key), rtol=0, atol=1e-4)
+
+    # 중간 결과는 마지막 consumer 뒤에 버려지므로 program 전체보다 훨씬 적게 살아 있음
+    assert scheduler.peak_live < len(compiled.program) // 2
+
+def test_critical_path():
+    TESTPARAM = CKKSParameters(16, 250, 40, 300, 3.2)
+    circuit = Circuit(TESTPARAM)
+    x = circuit.input("x")
+    circuit.output("long", (x * x).rotate(1))
+    circuit.output("short", x + 1.0)
+    compiled = circuit.compile()
+    rank = critical_path(compiled.program)
+
+    outputs = compiled.outputs
+    long_path = rank[id(outputs["long"])]
+    # 입력의 rank 는 가장 긴 출력까지의 경로
+    (x_node,) = compiled.inputs.values()
+    assert rank[id(x_node)] > long_path > rank[id(outputs["short"])]
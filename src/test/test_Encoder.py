@@ -1,6 +1,7 @@
 import numpy as np
 import pytest
-from core.encoder import Encoder
+from core.encoder import (Encoder, GenTransformMatrices, Encode, Decode,
+                          GenFFTTables, FFTEncode, FFTDecode)
 from core.parameters import CKKSParameters
 
 def TransformationMatricesGen(N):
@@ -43,3 +44,43 @@ def test_encode(N):
         cleartext = encoder.decode(plaintext)
 
         assert np.allclose(cleartext, msg, rtol=0, atol=1e-5)
+
+@pytest.mark.parametrize("N", [8, 16, 32, 64, 256])
+def test_fft_encode_matches_matrix(N):
+    TESTPARAM = CKKSParameters(N, 250, 40, 300, 3.2)
+    ecdM, dcdM = GenTransformMatrices(N)
+    fftTables = GenFFTTables(N)
+
+    for _ in range(10):
+        msg = np.random.rand(N // 2) * 20 - 10
+
+        ours_fft = FFTEncode(msg, fftTables, N, TESTPARAM.scale)
+        ours_matrix = Encode(msg, ecdM, N, TESTPARAM.scale)
+        # 부동소수 오차로 .5 근처에서만 반올림이 1 차이날 수 있음
+        assert np.max(np.abs(ours_fft - ours_matrix)) <= 1
+
+        plaintext = Encoder(TESTPARAM).encode(msg)
+        decoded_fft = FFTDecode(plaintext, fftTables, N, TESTPARAM.scale)
+        decoded_matrix = Decode(plaintext, dcdM, N, TESTPARAM.scale)
+        assert np.allclose(decoded_fft, decoded_matrix, rtol=0, atol=1e-9)
+        assert np.allclose(decoded_fft, msg, rtol=0, atol=1e-5)
+
+@pytest.mark.parametrize("N", [8, 16, 32, 64])
+def test_encode_batch(N):
+    TESTPARAM = CKKSParameters(N, 250, 40, 300, 3.2)
+    encoder = Encoder(TESTPARAM)
+    msgs = np.random.rand(7, N // 2) * 20 - 10
+
+    for level in range(TESTPARAM.max_level + 1):
+        plaintexts = encoder.encode_batch(msgs, level)
+        assert len(plaintexts) == len(msgs)
+        for msg, plaintext in zip(msgs, plaintexts):
+            assert plaintext.level == level
+            assert plaintext.ringelem.tolist() == encoder.encode(msg, level).ringelem.tolist()
+
+        decoded = encoder.decode_batch(plaintexts)
+        assert decoded.shape == msgs.shape
+        assert np.allclose(decoded, msgs, rtol=0, atol=1e-5)
+
+    with pytest.raises(RuntimeError):
+        encoder.encode_batch(msgs[:, 1:])
@@ -1,3 +1,4 @@
+import time
 import pytest
 import numpy as np
 from core.key_generator import KeyGenerator
@@ -5,6 +6,7 @@ from core.encoder import Encoder
 from core.encryptor import Encryptor
 from core.cryptocontext import CryptoContext
 from core.parameters import CKKSParameters
+from lib.Keys import PublicKey
 
 @pytest.mark.parametrize("N", [8, 16, 32, 64])
 def test_encrypt(N):
@@ -41,3 +43,108 @@ def test_encrypt_diff_levels(N):
         cleartext = cc.decrypt(ciphertext, secret_key)
 
         assert np.allclose(cleartext, msg, rtol=0, atol=1e-5)
+
+@pytest.mark.parametrize("N", [8, 16, 32, 64])
+def test_encrypt_batch(N):
+    TESTPARAM = CKKSParameters(N, 250, 40, 300, 3.2)
+    cc = CryptoContext(TESTPARAM)
+    secret_key = cc.keygen()
+
+    for level in range(cc.max_level + 1):
+        msgs = np.random.rand(5, cc.slot_count)
+        ciphertexts = cc.encrypt_batch(msgs, secret_key, level)
+        assert [ct.level for ct in ciphertexts] == [level] * len(msgs)
+
+        cleartexts = cc.decrypt_batch(ciphertexts, secret_key)
+        assert np.allclose(cleartexts, msgs, rtol=0, atol=1e-5)
+
+@pytest.mark.parametrize("N", [8, 16, 32, 64])
+@pytest.mark.parametrize("rns", [False, True])
+def test_seeded_ciphertexts_and_keys(N, rns):
+    TESTPARAM = CKKSParameters(N, 250, 40, 300, 3.2, rns=rns)
+    cc = CryptoContext(TESTPARAM)
+    slot_count = cc.slot_count
+
+    secret_key = cc.keygen()
+    relin_key = cc.relinearization_keygen(secret_key, seeded=True)
+    rotation_key = cc.rotation_keygen(1, secret_key, seeded=True)
+    assert relin_key.key.is_seeded and rotation_key.key.is_seeded
+
+    msg1 = np.random.randint(-10, 10, size=slot_count) / 7
+    msg2 = np.random.randint(-10, 10, size=slot_count) / 3
+    ct1 = cc.encrypt(msg1, secret_key, seeded=True)
+    ct2 = cc.encrypt(msg2, secret_key, seeded=True)
+
+    # a 는 seed 로만 보관되다가 처음 사용할 때 전개
+    assert ct1.is_seeded and ct1._components[0] is None
+    assert np.allclose(msg1, cc.decrypt(ct1, secret_key), rtol=0, atol=1e-5)
+    a = ct1.components[0]
+    assert a.tolist() == a.ring.expand_uniform(ct1.seed).tolist()
+
+    multiplied = cc.mul(ct1, ct2, relin_key)
+    assert not multiplied.is_seeded
+    assert np.allclose(msg1 * msg2, cc.decrypt(multiplied, secret_key), rtol=0, atol=1e-4)
+    rotated = cc.rotate(ct2, rotation_key)
+    assert np.allclose(np.roll(msg2, -1), cc.decrypt(rotated, secret_key), rtol=0, atol=1e-4)
+
+    # in-place 로 a 가 바뀌면 seed 는 버림
+    acc = ct2.copy()
+    assert acc.is_seeded
+    cc.add_inplace(acc, ct1)
+    assert not acc.is_seeded
+    assert np.allclose(msg1 + msg2, cc.decrypt(acc, secret_key), rtol=0, atol=1e-5)
+
+@pytest.mark.parametrize("N", [8, 16, 32, 64])
+@pytest.mark.parametrize("rns", [False, True])
+def test_public_key_encryption(N, rns):
+    TESTPARAM = CKKSParameters(N, 250, 40, 300, 3.2, rns=rns)
+    cc = CryptoContext(TESTPARAM)
+    max_level = cc.max_level
+    slot_count = cc.slot_count
+
+    secret_key = cc.keygen()
+    public_key = cc.public_keygen(secret_key)
+    relin_key = cc.relinearization_keygen(secret_key)
+
+    for _level in range(max_level+1):
+        msg = np.random.randint(-10, 10, size=slot_count) / 7
+        ct = cc.encrypt_public(msg, public_key, _level)
+        assert ct.level == _level
+        assert np.allclose(msg, cc.decrypt(ct, secret_key), rtol=0, atol=1e-4)
+
+    # 직렬화된 (seeded) 공개키로도 암호화
+    seeded = cc.public_keygen(secret_key, seeded=True)
+    loaded = PublicKey.from_bytes(seeded.to_bytes(), TESTPARAM)
+    msg = np.random.randint(-10, 10, size=slot_count) / 7
+    ct = cc.encrypt_public(msg, loaded)
+    multiplied = cc.mul(ct, ct, relin_key)
+    assert np.allclose(msg * msg, cc.decrypt(multiplied, secret_key), rtol=0, atol=1e-3)
+
+@pytest.mark.parametrize("background", [False, True])
+def test_zero_encryption_pool(background):
+    TESTPARAM = CKKSParameters(16, 250, 40, 300, 3.2)
+    cc = CryptoContext(TESTPARAM)
+    slot_count = cc.slot_count
+
+    secret_key = cc.keygen()
+    public_key = cc.public_keygen(secret_key)
+
+    with cc.encryption_pool(public_key, capacity=4, background=background) as pool:
+        if not background:
+            assert len(pool) == 0
+            pool.fill()
+        else:
+            pool.take() # 비어 있으면 그 자리에서 생성
+            while len(pool) < pool.capacity:
+                time.sleep(0.001)
+        assert len(pool) == 4
+
+        for _ in range(6):
+            msg = np.random.randint(-10, 10, size=slot_count) / 7
+            ct = cc.encrypt_public(msg, public_key, pool=pool)
+            assert np.allclose(msg, cc.decrypt(ct, secret_key), rtol=0, atol=1e-4)
+        assert pool.hits + pool.misses == 6 + background
+        assert pool.hits >= 4
+
+        with pytest.raises(RuntimeError):
+            cc.encrypt_public(msg, public_key, level=cc.max_level - 1, pool=pool)
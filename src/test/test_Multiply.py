@@ -85,3 +85,98 @@ def test_ciphertext_ciphertext_multiplication(N):
             result = cc.decrypt(added, secret_key)
 
             assert np.allclose(ideal, result, rtol=0, atol=1e-5)
+
+@pytest.mark.parametrize("N", [8, 16, 32, 64])
+def test_lazy_relinearization_inner_product(N):
+    TESTPARAM = CKKSParameters(N, 250, 40, 300, 3.2)
+    cc = CryptoContext(TESTPARAM)
+    slot_count = cc.slot_count
+
+    secret_key = cc.keygen()
+    relin_key = cc.relinearization_keygen(secret_key)
+
+    msgs1 = [np.random.randint(-10, 10, size=slot_count) / 7 for _ in range(4)]
+    msgs2 = [np.random.randint(-10, 10, size=slot_count) / 3 for _ in range(4)]
+    ideal = sum(m1 * m2 for m1, m2 in zip(msgs1, msgs2))
+
+    acc = None
+    for m1, m2 in zip(msgs1, msgs2):
+        ct1 = cc.encrypt(m1, secret_key)
+        ct2 = cc.encrypt(m2, secret_key)
+        prod = cc.mul(ct1, ct2, relin_key, relinearize=False)
+        assert len(prod.components) == 3
+        acc = prod if acc is None else cc.add(acc, prod)
+
+    # 3개짜리 그대로 복호화 / relinearize 후 복호화
+    assert np.allclose(ideal, cc.decrypt(acc, secret_key), rtol=0, atol=1e-4)
+    relinearized = cc.relinearize(acc, relin_key)
+    assert len(relinearized.components) == 2
+    assert np.allclose(ideal, cc.decrypt(relinearized, secret_key), rtol=0, atol=1e-4)
+
+    # 2개짜리 + 3개짜리, 평문 덧셈/곱셈
+    mixed = cc.add(cc.encrypt(msgs1[0], secret_key, acc.level), acc)
+    assert np.allclose(ideal + msgs1[0], cc.decrypt(mixed, secret_key), rtol=0, atol=1e-4)
+    scaled = cc.mul_messages(acc, msgs2[0])
+    assert np.allclose(ideal * msgs2[0], cc.decrypt(scaled, secret_key), rtol=0, atol=1e-3)
+
+    # 다음 mul 은 relinearize 된 입력을 사용
+    squared = cc.mul(acc, acc, relin_key)
+    assert np.allclose(ideal * ideal, cc.decrypt(squared, secret_key), rtol=0, atol=1e-2)
+
+@pytest.mark.parametrize("N", [8, 16, 32, 64])
+def test_lazy_relinearization_requires_key(N):
+    TESTPARAM = CKKSParameters(N, 250, 40, 300, 3.2)
+    cc = CryptoContext(TESTPARAM)
+    slot_count = cc.slot_count
+
+    secret_key = cc.keygen()
+    rotation_key = cc.rotation_keygen(1, secret_key)
+    relin_key = cc.relinearization_keygen(secret_key)
+
+    msg = np.random.randint(-10, 10, size=slot_count) / 7
+    ct = cc.encrypt(msg, secret_key)
+    lazy = cc.mul(ct, ct, relinearize=False)
+
+    with pytest.raises(RuntimeError):
+        cc.rotate(lazy, rotation_key)
+    with pytest.raises(RuntimeError):
+        cc.mul(ct, ct)
+
+    rotated = cc.rotate(lazy, rotation_key, relin_key)
+    assert np.allclose(np.roll(msg * msg, -1), cc.decrypt(rotated, secret_key), rtol=0, atol=1e-4)
+
+@pytest.mark.parametrize("N", [8, 16, 32, 64])
+def test_dot(N):
+    TESTPARAM = CKKSParameters(N, 250, 40, 300, 3.2)
+    cc = CryptoContext(TESTPARAM)
+    max_level = cc.max_level
+    slot_count = cc.slot_count
+
+    secret_key = cc.keygen()
+    relin_key = cc.relinearization_keygen(secret_key)
+
+    k = 5
+    msgs1 = [np.random.randint(-10, 10, size=slot_count) / 7 for _ in range(k)]
+    msgs2 = [np.random.randint(-10, 10, size=slot_count) / 3 for _ in range(k)]
+    ideal = sum(m1 * m2 for m1, m2 in zip(msgs1, msgs2))
+
+    # 레벨이 섞여 있어도 가장 낮은 레벨에 맞춤
+    cts1 = [cc.encrypt(m, secret_key, max_level - (i % 2)) for i, m in enumerate(msgs1)]
+    cts2 = [cc.encrypt(m, secret_key) for m in msgs2]
+
+    result = cc.dot(cts1, cts2, relin_key)
+    assert result.level == max_level - 2
+    assert len(result.components) == 2
+    assert np.allclose(ideal, cc.decrypt(result, secret_key), rtol=0, atol=1e-4)
+
+    lazy = cc.dot(cts1, cts2, relinearize=False)
+    assert len(lazy.components) == 3
+    assert np.allclose(ideal, cc.decrypt(lazy, secret_key), rtol=0, atol=1e-4)
+
+    pts = [cc.encode(m) for m in msgs2]
+    result = cc.dot_plain(cts1, pts)
+    assert result.level == max_level - 2
+    assert np.allclose(ideal, cc.decrypt(result, secret_key), rtol=0, atol=1e-4)
+
+    with pytest.raises(RuntimeError):
+        cc.dot(cts1, cts2[:-1], relin_key)
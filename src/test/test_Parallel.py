@@ -0,0 +1,165 @@
+import pytest
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from core.parameters import CKKSParameters
+from core.cryptocontext import CryptoContext
+from core.parallel_cryptocontext import ParallelCryptoContext
+from core.executor import make_executor
+from lib.Plaintext import Plaintext
+from lib.SharedArena import CiphertextArena
+
+@pytest.mark.parametrize("N", [16, 32])
+@pytest.mark.parametrize("rns", [False, True])
+@pytest.mark.parametrize("arena_slots", [None, 4])
+def test_parallel_crypto_context(N, rns, arena_slots):
+    TESTPARAM = CKKSParameters(N, 250, 40, 300, 3.2, rns=rns)
+    cc = CryptoContext(TESTPARAM)
+    slot_count = cc.slot_count
+
+    secret_key = cc.keygen()
+    relin_key = cc.relinearization_keygen(secret_key)
+    keyset = cc.rotation_keyset_gen(secret_key)
+
+    msgs1 = [np.random.randint(-10, 10, size=slot_count) / 7 for _ in range(5)]
+    msgs2 = [np.random.randint(-10, 10, size=slot_count) / 3 for _ in range(5)]
+
+    with ParallelCryptoContext(TESTPARAM, processes=2, secret_key=secret_key,
+                               relinearization_key=relin_key, rotation_keys=keyset,
+                               arena_slots=arena_slots) as pcc:
+        cts1 = pcc.encrypt_map(msgs1)
+        cts2 = pcc.encrypt_map(msgs2)
+        assert np.allclose(np.array(msgs1), pcc.decrypt_map(cts1), rtol=0, atol=1e-5)
+
+        multiplied = pcc.mul_map(cts1, cts2)
+        ideal = np.array([m1 * m2 for m1, m2 in zip(msgs1, msgs2)])
+        assert np.allclose(ideal, pcc.decrypt_map(multiplied), rtol=0, atol=1e-4)
+
+        shifts = [1, 2, 3, -1, 5]
+        rotated = pcc.rotate_map(cts1, shifts)
+        ideal = np.array([np.roll(m, -s) for m, s in zip(msgs1, shifts)])
+        assert np.allclose(ideal, pcc.decrypt_map(rotated), rtol=0, atol=1e-4)
+
+        # worker 에서 만든 암호문도 현재 process 의 key 로 복호화
+        assert np.allclose(msgs1[0], pcc.decrypt(cts1[0], secret_key), rtol=0, atol=1e-5)
+
+def test_parallel_requires_keys():
+    TESTPARAM = CKKSParameters(16, 250, 40, 300, 3.2)
+    cc = CryptoContext(TESTPARAM)
+    secret_key = cc.keygen()
+    public_key = cc.public_keygen(secret_key)
+    msg = np.random.randint(-10, 10, size=cc.slot_count) / 7
+
+    with ParallelCryptoContext(TESTPARAM, processes=1, public_key=public_key) as pcc:
+        cts = pcc.encrypt_map([msg, msg])
+        assert np.allclose(msg, cc.decrypt(cts[1], secret_key), rtol=0, atol=1e-4)
+        with pytest.raises(RuntimeError):
+            pcc.decrypt_map(cts)
+        with pytest.raises(RuntimeError):
+            pcc.rotate_map(cts, 1)
+
+    # mul_map 은 task 하나에 slot 3개 (입력 2 + 결과 1) 가 필요
+    for arena_slots in [0, 1, 2]:
+        with pytest.raises(ValueError):
+            ParallelCryptoContext(TESTPARAM, processes=1, public_key=public_key,
+                                  arena_slots=arena_slots)
+    with ParallelCryptoContext(TESTPARAM, processes=1, secret_key=secret_key,
+                               relinearization_key=cc.relinearization_keygen(secret_key),
+                               arena_slots=3) as pcc:
+        cts = pcc.encrypt_map([msg, msg])
+        multiplied = pcc.mul_map(cts, cts)
+        assert np.allclose(msg * msg, pcc.decrypt_map(multiplied)[1], rtol=0, atol=1e-4)
+
+@pytest.mark.parametrize("kind", ["thread", "process"])
+@pytest.mark.parametrize("rns", [False, True])
+def test_intra_operation_executor(kind, rns):
+    TESTPARAM = CKKSParameters(32, 250, 40, 300, 3.2, rns=rns)
+    serial = CryptoContext(TESTPARAM)
+    slot_count = serial.slot_count
+
+    secret_key = serial.keygen()
+    relin_key = serial.relinearization_keygen(secret_key)
+    rot_key = serial.rotation_keygen(3, secret_key)
+
+    msg1 = np.random.randint(-10, 10, size=slot_count) / 7
+    msg2 = np.random.randint(-10, 10, size=slot_count) / 3
+    ct1 = serial.encrypt(msg1, secret_key)
+    ct2 = serial.encrypt(msg2, secret_key)
+
+    with make_executor(TESTPARAM, kind, 2) as executor:
+        cc = CryptoContext(TESTPARAM, executor)
+        multiplied = cc.mul(ct1, ct2, relin_key)
+        rotated = cc.rotate(ct1, rot_key)
+
+    # 같은 ring 곱을 나눠서 할 뿐이므로 결과는 순차 실행과 완전히 같음
+    for got, expected in [(multiplied, serial.mul(ct1, ct2, relin_key)),
+                          (rotated, serial.rotate(ct1, rot_key))]:
+        assert got.level == expected.level
+        for x, y in zip(got.components, expected.components):
+            assert x.ring is y.ring
+            assert x.tolist() == y.tolist()
+
+    assert np.allclose(msg1 * msg2, cc.decrypt(multiplied, secret_key), rtol=0, atol=1e-4)
+    assert np.allclose(np.roll(msg1, -3), cc.decrypt(rotated, secret_key), rtol=0, atol=1e-4)
+
+def test_make_executor_kind():
+    with pytest.raises(ValueError):
+        make_executor(CKKSParameters(16, 250, 40, 300, 3.2), "fiber")
+
+@pytest.mark.parametrize("kind", ["thread", "process"])
+def test_executor_params_mismatch(kind):
+    params_a = CKKSParameters(16, 250, 40, 300, 3.2)
+    params_b = CKKSParameters(32, 250, 40, 300, 3.2)
+    with make_executor(params_a, kind, 1) as executor:
+        CryptoContext(params_a, executor)
+        with pytest.raises(RuntimeError):
+            CryptoContext(params_b, executor)
+    # worker 에 params 가 없는 process pool 도 거부
+    with ProcessPoolExecutor(1) as executor:
+        with pytest.raises(RuntimeError):
+            CryptoContext(params_a, executor)
+
+@pytest.mark.parametrize("N", [8, 16, 32, 64])
+@pytest.mark.parametrize("rns", [False, True])
+def test_shared_arena(N, rns):
+    TESTPARAM = CKKSParameters(N, 250, 40, 300, 3.2, rns=rns)
+    cc = CryptoContext(TESTPARAM)
+    secret_key = cc.keygen()
+    relin_key = cc.relinearization_keygen(secret_key)
+    msg = np.random.randint(-10, 10, size=cc.slot_count) / 7
+    ct = cc.encrypt(msg, secret_key)
+    lazy = cc.mul(ct, ct, relin_key, relinearize=False)
+    pt = cc.encode(msg)
+
+    with CiphertextArena(TESTPARAM, slots=3) as arena:
+        handles = [arena.put(obj) for obj in [ct, lazy, pt]]
+        assert arena.available == 0
+        with pytest.raises(RuntimeError):
+            arena.reserve()
+
+        # 다른 process 처럼 이름으로 attach 해서 handle 로 읽기
+        other = CiphertextArena.attach(arena.name, TESTPARAM)
+        for obj, handle in zip([ct, lazy, pt], handles):
+            got = other.get(handle, copy=False)
+            assert got.level == obj.level and got.scale == obj.scale
+            expected = [obj.ringelem] if isinstance(obj, Plaintext) else obj.components
+            got_components = [got.ringelem] if isinstance(got, Plaintext) else got.components
+            for x, y in zip(got_components, expected):
+                assert x.ring is y.ring
+                assert x.tolist() == y.tolist()
+        assert isinstance(got, Plaintext)
+
+        # zero-copy view 는 read-only, copy 는 slot 과 독립
+        view = other.get(handles[0], copy=False)
+        with pytest.raises(ValueError):
+            view.components[0].iadd(view.components[1])
+        copied = other.get(handles[0])
+        copied.components[0].iadd(copied.components[1])
+        assert np.allclose(msg * msg, cc.decrypt(arena.get(handles[1]), secret_key), rtol=0, atol=1e-4)
+        del view, got, got_components
+        other.close()
+
+        for handle in handles:
+            arena.free(handle)
+        assert arena.available == 3
+        with pytest.raises(ValueError): # 아직 쓰지 않은 slot
+            arena.get(arena.reserve())
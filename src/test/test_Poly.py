@@ -1,8 +1,14 @@
 # tests/test_polynomial_numpy_compare.py
+import random
 import numpy as np
 import pytest
+from concurrent.futures import ThreadPoolExecutor
 
-from lib.Polynomial import SingleMod, CyclotomicRing
+from lib.Polynomial import SingleMod, CyclotomicRing, Poly, LimbPoly
+from lib.NTT import gen_ntt_primes
+from lib.Dispatcher import MulDispatcher
+from core.operator import div_round
+from lib.Sampler import XOF, uniform_mod, new_seed, ternary, gaussian, cdt_table
 
 # --------- NumPy 쪽 헬퍼들 (상승차수 계수: a[0] + a[1] X + ... ) ---------
 
@@ -89,3 +95,177 @@ def test_ring_vs_numpy(N, q, k1, k2):
         numpy_auto2 = automorphism_numpy(b_np, k2, N, q)
         assert np.array_equal(np.array(ours_auto2, dtype=int), numpy_auto2), f"Automorphism k={k2} mismatch"
 
+
+@pytest.mark.parametrize("N,bits", [(8, 14), (32, 30), (64, 50), (16, 120)])
+def test_ntt_vs_schoolbook(N, bits):
+    q = gen_ntt_primes(bits, N, 1)[0]
+    R = CyclotomicRing.create(N, SingleMod(q))
+    assert R.ntt is not None and "ntt" in MulDispatcher.candidates(R)
+
+    for _ in range(5):
+        a = R.random_uniform()
+        b = R.random_uniform()
+
+        # forward/inverse 는 서로 역변환
+        forwarded = R.ntt.forward(a.poly.coeffs)
+        assert [int(x) for x in R.ntt.inverse(forwarded)] == a.tolist()
+
+        ours_ntt = a.poly.mul(b.poly, method="ntt").tolist()
+        ours_school = a.poly.mul(b.poly, method="schoolbook").tolist()
+        assert ours_ntt == ours_school, "NTT multiplication mismatch"
+
+def test_ntt_rejects_unfriendly_modulus():
+    R = CyclotomicRing.create(16, SingleMod(1 << 40))
+    assert R.ntt is None and "ntt" not in MulDispatcher.candidates(R)
+    a = R.random_uniform()
+    with pytest.raises(ValueError):
+        a.poly.mul(a.poly, method="ntt")
+
+@pytest.mark.parametrize("N,log_q", [(8, 6), (16, 32), (16, 33), (32, 250), (16, 550)])
+def test_limb_backend_vs_object(N, log_q):
+    q = 1 << log_q
+    R = CyclotomicRing.create(N, SingleMod(q))
+    assert isinstance(R.zero().poly, LimbPoly)
+
+    for _ in range(5):
+        a = R.random_uniform()
+        b = R.random_uniform()
+        k = random.randrange(-q, q)
+        a_obj = Poly(a.tolist(), SingleMod(q), N)
+        b_obj = Poly(b.tolist(), SingleMod(q), N)
+
+        assert (a + b).tolist() == (a_obj + b_obj).tolist(), "Addition mismatch"
+        assert (a - b).tolist() == (a_obj - b_obj).tolist(), "Subtraction mismatch"
+        assert (-a).tolist() == (-a_obj).tolist(), "Negation mismatch"
+        assert a.scalarmul(k).tolist() == a_obj.scalarmul(k).tolist(), "Scalar mismatch"
+        assert a.Auto(3).tolist() == a_obj.automorphism(3).tolist(), "Automorphism mismatch"
+        assert list(a.poly._center_reduce()) == list(a_obj._center_reduce())
+        assert a.copy().iadd(b).tolist() == (a_obj + b_obj).tolist(), "In-place addition mismatch"
+        assert a.copy().isub(b).tolist() == (a_obj - b_obj).tolist(), "In-place subtraction mismatch"
+
+@pytest.mark.parametrize("N,log_q,shift", [(8, 6, 3), (16, 64, 31), (16, 90, 40), (32, 250, 40), (16, 550, 300)])
+def test_limb_div_round_vs_reference(N, log_q, shift):
+    R = CyclotomicRing.create(N, SingleMod(1 << log_q))
+    T = SingleMod(1 << (log_q - shift))
+    for _ in range(5):
+        a = R.random_uniform()
+        before = a.tolist()
+        ideal = [div_round(x, 1 << shift) % T.q for x in before]
+        res = a.poly.div_round_pow2(shift, T)
+        assert isinstance(res, LimbPoly)
+        assert res.tolist() == ideal
+        assert a.tolist() == before, "input must not be modified"
+
+    # prime modulus (object backend)
+    p = gen_ntt_primes(30, N, 1)[0]
+    P = CyclotomicRing.create(N, SingleMod(p))
+    a = P.random_uniform()
+    assert a.poly.div_round(1000, SingleMod(p // 1000)).tolist() == \
+        [div_round(x, 1000) % (p // 1000) for x in a.tolist()]
+
+@pytest.mark.parametrize("q", [64, 257, 1 << 250, (1 << 61) - 1, (1 << 127) - 1])
+def test_xof_uniform_expansion(q):
+    seed = new_seed()
+    x = uniform_mod(XOF(seed), q, 512)
+    assert len(x) == 512
+    assert all(0 <= int(v) < q for v in x)
+    assert list(x) == list(uniform_mod(XOF(seed), q, 512)), "expansion must be deterministic"
+    assert list(x) != list(uniform_mod(XOF(seed, b"\x01"), q, 512)), "domains must be separated"
+    # 상위 절반에도 값이 골고루 나오는지 대략 확인
+    assert 100 < sum(int(v) >= q // 2 for v in x) < 412
+
+    R = CyclotomicRing.create(16, SingleMod(q))
+    assert R.expand_uniform(seed).tolist() == R.expand_uniform(seed).tolist()
+
+@pytest.mark.parametrize("sigma", [1.0, 3.2, 8.0])
+def test_ternary_and_gaussian_samplers(sigma):
+    seed = new_seed()
+    n = 1 << 14
+    t = ternary(XOF(seed), n)
+    assert set(np.unique(t)) <= {-1, 0, 1}
+    counts = [np.sum(t == v) for v in (-1, 0, 1)]
+    assert all(abs(c - n / 3) < 0.05 * n for c in counts)
+
+    g = gaussian(XOF(seed), n, sigma)
+    table, tail = cdt_table(sigma)
+    # 대칭: P(X <= -t+i) + P(X <= t-1-i) = 1 이므로 2^64 로 내림한 두 값의 합은 2^64 - 1 (64 bit 전부 정확)
+    assert {int(a) + int(b) for a, b in zip(table, table[::-1])} == {(1 << 64) - 1}
+    assert np.all(np.abs(g) <= tail)
+    assert abs(g.mean()) < 0.1 * sigma
+    assert abs(g.std() - sigma) < 0.1 * sigma
+    assert list(g) == list(gaussian(XOF(seed), n, sigma)), "sampling must be deterministic"
+
+    R = CyclotomicRing.create(16, SingleMod(1 << 60))
+    assert R.sample_ternary(seed).tolist() == R.sample_ternary(seed).tolist()
+    assert R.sample_Gaussian(sigma, seed).tolist() == R.sample_Gaussian(sigma, seed).tolist()
+
+def test_trusted_constructor_adopts_array():
+    N, q = 16, 257
+    R = CyclotomicRing.create(N, SingleMod(q))
+    c = np.array([random.randrange(q) for _ in range(N)], dtype=object)
+    p = Poly._from_reduced(c, SingleMod(q), N)
+    assert p.coeffs is c
+
+    # 외부 입력은 계속 reduce / 검증
+    raw = [random.randrange(-3 * q, 3 * q) for _ in range(N)]
+    assert R.from_coeffs(raw).tolist() == [x % q for x in raw]
+    assert R.from_coeffs(np.array(raw, dtype=np.int64)).tolist() == [x % q for x in raw]
+    with pytest.raises(ValueError):
+        R.from_coeffs(raw[:-1])
+
+@pytest.mark.parametrize("N,q", [(8, 64), (16, 257), (32, 1 << 250), (16, 1 << 550)])
+def test_kronecker_vs_schoolbook(N, q):
+    R = CyclotomicRing.create(N, SingleMod(q))
+
+    for _ in range(5):
+        a = R.random_uniform()
+        b = R.random_uniform()
+        a_obj = Poly(a.tolist(), SingleMod(q), N)
+        b_obj = Poly(b.tolist(), SingleMod(q), N)
+
+        ours_school = a_obj.mul(b_obj, method="schoolbook").tolist()
+        assert a_obj.mul(b_obj, method="kronecker").tolist() == ours_school
+        assert a.poly.mul(b.poly, method="kronecker").tolist() == ours_school
+
+@pytest.mark.parametrize("N,q", [(16, 257), (16, 1 << 250)])
+def test_convolution_strategies(N, q):
+    R = CyclotomicRing.create(N, SingleMod(q))
+    a = R.random_uniform()
+    b = R.random_uniform()
+    ours_school = Poly(a.tolist(), SingleMod(q), N).mul(Poly(b.tolist(), SingleMod(q), N)).tolist()
+
+    for method in MulDispatcher.candidates(R):
+        assert a.poly.mul(b.poly, method=method).tolist() == ours_school, f"{method} mismatch"
+
+def test_dispatcher_persists_choice(tmp_path, monkeypatch):
+    cache = tmp_path / "mul.json"
+    R = CyclotomicRing.create(32, SingleMod(1 << 250))
+
+    dispatcher = MulDispatcher(cache_path=str(cache))
+    chosen = dispatcher.method_for(R)
+    assert chosen in MulDispatcher.candidates(R)
+    assert cache.exists()
+
+    # 두 번째 dispatcher 는 benchmark 없이 저장된 결과를 사용
+    reloaded = MulDispatcher(cache_path=str(cache))
+    monkeypatch.setattr(reloaded, "tune", lambda ring: pytest.fail("should not re-tune"))
+    assert reloaded.method_for(R) == chosen
+
+    reloaded.set(R, "karatsuba")
+    assert MulDispatcher(cache_path=str(cache)).method_for(R) == "karatsuba"
+    with pytest.raises(ValueError):
+        reloaded.set(R, "ntt")
+
+def test_dispatcher_threads(tmp_path):
+    cache = tmp_path / "mul.json"
+    rings = [CyclotomicRing.create(N, SingleMod(1 << 250)) for N in (8, 16, 32, 64)]
+    dispatcher = MulDispatcher(cache_path=str(cache), repeat=1)
+
+    # 여러 thread 가 동시에 tune / 저장해도 table 과 파일이 깨지지 않음
+    with ThreadPoolExecutor(8) as executor:
+        chosen = list(executor.map(lambda i: dispatcher.method_for(rings[i % 4]), range(32)))
+    for i, method in enumerate(chosen):
+        assert method == chosen[i % 4]
+    reloaded = MulDispatcher(cache_path=str(cache))
+    assert [reloaded.method_for(R) for R in rings] == chosen[:4]
+    assert not list(tmp_path.glob("*.tmp"))
@@ -0,0 +1,79 @@
+import pytest
+import numpy as np
+from lib.Polynomial import RNSMod, SingleMod, CyclotomicRing
+from lib.NTT import gen_ntt_primes
+from core.parameters import CKKSParameters
+from core.cryptocontext import CryptoContext
+from core.operator import div_round
+
+@pytest.mark.parametrize("N", [8, 16, 32])
+def test_rns_ring_vs_single_modulus(N):
+    primes = gen_ntt_primes(50, N, 3)
+    R = CyclotomicRing.create(N, RNSMod(tuple(primes)))
+    Q = R.modsys.q
+    S = CyclotomicRing.create(N, SingleMod(Q))
+
+    for _ in range(5):
+        a = R.random_uniform()
+        b = R.random_uniform()
+        a_s = S.from_coeffs(a.tolist())
+        b_s = S.from_coeffs(b.tolist())
+
+        assert R.from_coeffs(a.tolist()).tolist() == a.tolist(), "CRT round trip mismatch"
+        assert (a + b).tolist() == (a_s + b_s).tolist(), "Addition mismatch"
+        assert (a - b).tolist() == (a_s - b_s).tolist(), "Subtraction mismatch"
+        assert (-a).tolist() == (-a_s).tolist(), "Negation mismatch"
+        assert a.scalarmul(-7).tolist() == a_s.scalarmul(-7).tolist(), "Scalar mismatch"
+        assert (a * b).tolist() == (a_s * b_s).tolist(), "Multiplication mismatch"
+        assert a.Auto(5).tolist() == a_s.Auto(5).tolist(), "Automorphism mismatch"
+        assert list(a.poly._center_reduce()) == list(a_s.poly._center_reduce())
+        assert a.copy().iadd(b).tolist() == a_s.copy().iadd(b_s).tolist(), "In-place addition mismatch"
+        assert a.copy().isub(b).tolist() == a_s.copy().isub(b_s).tolist(), "In-place subtraction mismatch"
+
+@pytest.mark.parametrize("N", [8, 16, 32])
+def test_rns_div_round_drops_limbs(N):
+    primes = tuple(gen_ntt_primes(50, N, 5))
+    R = CyclotomicRing.create(N, RNSMod(primes))
+    for _ in range(5):
+        a = R.random_uniform()
+        before = a.tolist()
+        # rescale: 마지막 prime 하나, key switching: 여러 prime (target 은 앞쪽 일부)
+        for target, divisor in [(primes[:4], primes[4]),
+                                (primes[:2], primes[3] * primes[4]),
+                                (primes[1:3], primes[0] * primes[4])]:
+            T = RNSMod(target)
+            ideal = [div_round(x, divisor) % T.q for x in before]
+            assert a.poly.div_round(divisor, T).tolist() == ideal
+        # limb 를 버릴 수 없는 divisor 는 CRT 로 계산
+        T = RNSMod(primes[:2])
+        assert a.poly.div_round(12345, T).tolist() == [div_round(x, 12345) % T.q for x in before]
+        assert a.tolist() == before, "input must not be modified"
+
+@pytest.mark.parametrize("N", [8, 16, 32])
+def test_rns_ckks(N):
+    TESTPARAM = CKKSParameters(N, 250, 40, 300, 3.2, rns=True)
+    cc = CryptoContext(TESTPARAM)
+    max_level = cc.max_level
+    slot_count = cc.slot_count
+
+    secret_key = cc.keygen()
+    relinearization_key = cc.relinearization_keygen(secret_key)
+
+    for _level in range(1, max_level+1):
+        shift = np.random.randint(0, slot_count)
+        rotation_key = cc.rotation_keygen(shift, secret_key)
+        msg1 = np.random.randint(-10, 10, size=slot_count) / 7
+        msg2 = np.random.randint(-10, 10, size=slot_count) / 3
+
+        ciphertext1 = cc.encrypt(msg1, secret_key, _level)
+        ciphertext2 = cc.encrypt(msg2, secret_key, _level)
+
+        added = cc.decrypt(cc.add(ciphertext1, ciphertext2), secret_key)
+        multiplied = cc.decrypt(cc.mul(ciphertext1, ciphertext2, relinearization_key), secret_key)
+        plain_multiplied = cc.decrypt(cc.mul_messages(ciphertext1, msg2), secret_key)
+        rotated = cc.decrypt(cc.rotate(ciphertext1, rotation_key), secret_key)
+
+        assert np.allclose(msg1 + msg2, added, rtol=0, atol=1e-5)
+        assert np.allclose(msg1 * msg2, multiplied, rtol=0, atol=1e-5)
+        assert np.allclose(msg1 * msg2, plain_multiplied, rtol=0, atol=1e-5)
+        assert np.allclose(np.roll(msg1, -shift), rotated, rtol=0, atol=1e-5)
@@ -1,8 +1,10 @@
+import os
 import pytest
 import numpy as np
 from lib.Plaintext import Plaintext
 from core.parameters import CKKSParameters
 from core.cryptocontext import CryptoContext
+from lib.KeyStore import KeyStore
 
 @pytest.mark.parametrize("N", [8, 16, 32, 64])
 def test_plaintext_rotation(N):
@@ -43,3 +45,131 @@ def test_ciphertext_rotation(N):
         result = cc.decrypt(rotated, secret_key)
 
         assert np.allclose(ideal, result)
+
+@pytest.mark.parametrize("N", [8, 16, 32, 64])
+def test_cached_automorphism_map(N):
+    TESTPARAM = CKKSParameters(N, 250, 40, 300, 3.2)
+    ring = TESTPARAM.rings[-1]
+    a = ring.random_uniform()
+
+    for shift in range(N // 2):
+        k = ring.galois_element(shift)
+        assert k == (5 ** shift) % (2 * N)
+        assert ring.automorphism_map(k) is ring.automorphism_map(5 ** shift)
+        assert a.Auto(k).tolist() == a.Auto(5 ** shift).tolist()
+
+    with pytest.raises(ValueError):
+        ring.automorphism_map(2)
+
+@pytest.mark.parametrize("N", [8, 16, 32])
+@pytest.mark.parametrize("rns", [False, True])
+def test_hoisted_rotations(N, rns):
+    TESTPARAM = CKKSParameters(N, 250, 40, 300, 3.2, rns=rns)
+    cc = CryptoContext(TESTPARAM)
+    slot_count = cc.slot_count
+
+    secret_key = cc.keygen()
+    shifts = sorted({0, 1, 3, slot_count - 1})
+    rotation_keys = [cc.rotation_keygen(shift, secret_key) for shift in shifts]
+
+    for _level in range(cc.max_level + 1):
+        msg = np.random.randint(-10, 10, size=slot_count) / 7
+        ciphertext = cc.encrypt(msg, secret_key, _level)
+
+        rotated = cc.rotate_many(ciphertext, rotation_keys)
+        assert sorted(rotated) == sorted(shifts)
+        for shift, ct in rotated.items():
+            assert ct.level == _level
+            result = cc.decrypt(ct, secret_key)
+            assert np.allclose(np.roll(msg, -shift), result, rtol=0, atol=1e-5)
+
+@pytest.mark.parametrize("N", [8, 16, 32, 64])
+def test_rotation_keyset(N):
+    TESTPARAM = CKKSParameters(N, 250, 40, 300, 3.2)
+    cc = CryptoContext(TESTPARAM)
+    slot_count = cc.slot_count
+    log_slots = slot_count.bit_length() - 1
+
+    secret_key = cc.keygen()
+    keyset = cc.rotation_keyset_gen(secret_key, extra_shifts=[slot_count - 3])
+    assert len(keyset) <= 2 * log_slots + 1
+
+    msg = np.random.randint(-10, 10, size=slot_count) / 7
+    ciphertext = cc.encrypt(msg, secret_key)
+
+    for shift in range(-slot_count, slot_count + 1):
+        keys = keyset.decompose(shift)
+        assert len(keys) <= (log_slots + 2) // 2
+        assert sum(key.shift for key in keys) % slot_count == shift % slot_count
+
+    for shift in [0, 1, slot_count // 2 + 1, slot_count - 1, slot_count - 3, -5]:
+        rotated = cc.rotate_by(ciphertext, shift, keyset)
+        result = cc.decrypt(rotated, secret_key)
+        assert np.allclose(np.roll(msg, -shift), result, rtol=0, atol=1e-5)
+
+@pytest.mark.parametrize("N", [16, 32, 64])
+@pytest.mark.parametrize("seeded", [False, True])
+def test_key_store(N, seeded, tmp_path):
+    TESTPARAM = CKKSParameters(N, 250, 40, 300, 3.2)
+    cc = CryptoContext(TESTPARAM)
+    slot_count = cc.slot_count
+
+    secret_key = cc.keygen()
+    keyset = cc.rotation_keyset_gen(secret_key, seeded=seeded)
+    relin_key = cc.relinearization_keygen(secret_key, seeded=seeded)
+    path = str(tmp_path / "keys.bin")
+    KeyStore.write(path, keyset, relin_key)
+
+    msg = np.random.randint(-10, 10, size=slot_count) / 7
+    ct = cc.encrypt(msg, secret_key)
+
+    with KeyStore(path, TESTPARAM, capacity=2) as store:
+        assert store.shifts == keyset.shifts
+        assert len(store) == len(keyset)
+        assert store.stats["cached"] == 0 # 아직 아무 key 도 읽지 않음
+
+        rotated = cc.rotate(ct, store, shift=1)
+        assert np.allclose(np.roll(msg, -1), cc.decrypt(rotated, secret_key), rtol=0, atol=1e-4)
+        cc.rotate(ct, store, shift=1)
+        assert store.hits == 1 and store.misses == 1
+
+        # 용량을 넘으면 가장 오래전에 쓰인 key 부터 버림
+        for shift in (2, 4, -1):
+            rotated = cc.rotate(ct, store, shift=shift)
+            assert np.allclose(np.roll(msg, -shift), cc.decrypt(rotated, secret_key), rtol=0, atol=1e-4)
+        assert store.stats["cached"] == 2
+        assert store.evictions == 2
+
+        # 3 = 4 - 1: 분해된 shift 들의 key 를 미리 읽어둠
+        store.prefetch([3])
+        misses = store.misses
+        rotated = cc.rotate(ct, store, shift=3)
+        assert store.misses == misses
+        assert np.allclose(np.roll(msg, -3), cc.decrypt(rotated, secret_key), rtol=0, atol=1e-4)
+
+        multiplied = cc.mul(ct, ct, store.relinearization_key)
+        assert np.allclose(msg * msg, cc.decrypt(multiplied, secret_key), rtol=0, atol=1e-4)
+
+        with pytest.raises(RuntimeError):
+            cc.rotate(ct, store)
+
+        # keys 에는 메모리에 올라온 RotationKey 만
+        assert all(key.shift == shift for shift, key in store.keys.items())
+
+def test_key_store_rejects_invalid_file(tmp_path):
+    TESTPARAM = CKKSParameters(16, 250, 40, 300, 3.2)
+    cc = CryptoContext(TESTPARAM)
+    secret_key = cc.keygen()
+    path = tmp_path / "keys.bin"
+    KeyStore.write(str(path), [cc.rotation_keygen(1, secret_key)])
+    data = path.read_bytes()
+
+    fds = len(os.listdir("/proc/self/fd"))
+    errors = [] # traceback 이 KeyStore 를 잡고 있어도 mmap 은 이미 닫혀 있어야 함
+    for blob in [b"XXXX" + data[4:], data[:4] + b"\x09" + data[5:], data[:7], data[:40],
+                 data[:9] + b"\x07" + data[10:]]:
+        path.write_bytes(blob)
+        with pytest.raises(ValueError) as error:
+            KeyStore(str(path), TESTPARAM)
+        errors.append(error)
+    assert len(os.listdir("/proc/self/fd")) == fds
@@ -0,0 +1,112 @@
+import pytest
+import numpy as np
+from core.parameters import CKKSParameters
+from core.cryptocontext import CryptoContext
+from lib.Ciphertext import Ciphertext
+from lib.Plaintext import Plaintext
+from lib.Keys import SecretKey, RelinearizationKey, RotationKey
+
+@pytest.mark.parametrize("N", [8, 16, 32, 64])
+@pytest.mark.parametrize("rns", [False, True])
+def test_ciphertext_roundtrip(N, rns, tmp_path):
+    TESTPARAM = CKKSParameters(N, 250, 40, 300, 3.2, rns=rns)
+    cc = CryptoContext(TESTPARAM)
+    max_level = cc.max_level
+    slot_count = cc.slot_count
+
+    secret_key = cc.keygen()
+    msg = np.random.randint(-10, 10, size=slot_count) / 7
+
+    for _level in range(max_level+1):
+        ct = cc.encrypt(msg, secret_key, _level)
+        data = ct.to_bytes(TESTPARAM)
+        # 계수당 ceil(log q / 8) byte
+        assert len(data) - 2 * ct.components[0].ring.byte_size < 64
+        loaded = Ciphertext.from_bytes(data, TESTPARAM)
+        assert loaded.level == ct.level and loaded.scale == ct.scale
+        assert [c.tolist() for c in loaded.components] == [c.tolist() for c in ct.components]
+
+    # seeded: b 만 저장
+    seeded = cc.encrypt(msg, secret_key, seeded=True)
+    data = seeded.to_bytes(TESTPARAM)
+    assert len(data) < len(ct.to_bytes(TESTPARAM)) // 2 + 64
+    loaded = Ciphertext.from_bytes(data, TESTPARAM)
+    assert loaded.is_seeded
+    assert np.allclose(msg, cc.decrypt(loaded, secret_key), rtol=0, atol=1e-5)
+
+    # relinearize 전 3개짜리, 파일 (mmap)
+    triple = cc.mul(seeded, seeded, relinearize=False)
+    path = str(tmp_path / "ct.bin")
+    triple.save(path, TESTPARAM)
+    loaded = Ciphertext.load(path, TESTPARAM)
+    assert len(loaded.components) == 3
+    assert np.allclose(msg * msg, cc.decrypt(loaded, secret_key), rtol=0, atol=1e-4)
+
+@pytest.mark.parametrize("N", [8, 16, 32, 64])
+@pytest.mark.parametrize("rns", [False, True])
+def test_keys_and_plaintext_roundtrip(N, rns, tmp_path):
+    TESTPARAM = CKKSParameters(N, 250, 40, 300, 3.2, rns=rns)
+    cc = CryptoContext(TESTPARAM)
+    slot_count = cc.slot_count
+
+    secret_key = cc.keygen()
+    path = str(tmp_path / "sk.bin")
+    secret_key.save(path)
+    loaded_sk = SecretKey.load(path, TESTPARAM)
+    assert loaded_sk.ringelem.tolist() == secret_key.ringelem.tolist()
+
+    msg1 = np.random.randint(-10, 10, size=slot_count) / 7
+    msg2 = np.random.randint(-10, 10, size=slot_count) / 3
+    pt = cc.encode(msg1)
+    loaded_pt = Plaintext.from_bytes(pt.to_bytes(TESTPARAM), TESTPARAM)
+    assert np.allclose(msg1, cc.decode(loaded_pt), rtol=0, atol=1e-5)
+
+    for seeded in (False, True):
+        relin_key = cc.relinearization_keygen(secret_key, seeded=seeded)
+        rotation_key = cc.rotation_keygen(3, secret_key, seeded=seeded)
+        relin_key.save(str(tmp_path / "relin.bin"))
+        loaded_relin = RelinearizationKey.load(str(tmp_path / "relin.bin"), TESTPARAM)
+        loaded_rot = RotationKey.from_bytes(rotation_key.to_bytes(), TESTPARAM)
+        assert loaded_rot.shift == 3
+        assert loaded_relin.key.is_seeded == seeded
+
+        ct1 = cc.encrypt(msg1, loaded_sk)
+        ct2 = cc.encrypt(msg2, loaded_sk)
+        multiplied = cc.mul(ct1, ct2, loaded_relin)
+        assert np.allclose(msg1 * msg2, cc.decrypt(multiplied, secret_key), rtol=0, atol=1e-4)
+        rotated = cc.rotate(ct1, loaded_rot)
+        assert np.allclose(np.roll(msg1, -3), cc.decrypt(rotated, secret_key), rtol=0, atol=1e-4)
+
+def test_rejects_invalid_input():
+    params = CKKSParameters(16, 250, 40, 300, 3.2)
+    other = CKKSParameters(16, 250, 40, 300, 3.2, rns=True)
+    cc = CryptoContext(params)
+    secret_key = cc.keygen()
+    ct = cc.encrypt(np.zeros(cc.slot_count), secret_key)
+    data = ct.to_bytes(params)
+
+    with pytest.raises(ValueError):
+        Ciphertext.from_bytes(data, other) # 다른 modulus chain
+    with pytest.raises(ValueError):
+        Ciphertext.from_bytes(data[:-1], params)
+    with pytest.raises(ValueError):
+        Plaintext.from_bytes(data, params) # 다른 종류
+    with pytest.raises(ValueError):
+        Ciphertext.from_bytes(b"XXXX" + data[4:], params)
+
+@pytest.mark.parametrize("rns", [False, True])
+def test_load_rejects_invalid_file(rns, tmp_path):
+    params = CKKSParameters(16, 250, 40, 300, 3.2, rns=rns)
+    cc = CryptoContext(params)
+    secret_key = cc.keygen()
+    data = cc.encrypt(np.ones(cc.slot_count), secret_key).to_bytes(params)
+
+    # mmap 으로 읽다가 실패해도 BufferError 가 아닌 ValueError
+    corrupted = {"truncated": data[:-3], "magic": b"XXXX" + data[4:], "header": data[:10]}
+    if rns: # prime 보다 큰 계수 (power-of-two 는 모든 bit 패턴이 유효)
+        corrupted["coefficient"] = data[:-8] + b"\xff" * 8
+    for name, blob in corrupted.items():
+        path = tmp_path / f"{name}.bin"
+        path.write_bytes(blob)
+        with pytest.raises(ValueError):
+            Ciphertext.load(str(path), params)
@@ -1,4 +1,5 @@
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor
 from lib.Plaintext import Plaintext
 from lib.Ciphertext import Ciphertext
 from lib.Polynomial import RingElem
@@ -8,6 +9,11 @@ def _check_ciphertext_components(ct: "Ciphertext"):
     if len(ct.components) != 2:
         raise RuntimeError("Ciphertext components should be two.")
 
+# 암호문의 poly 가 2개 (a, b) 혹은 relinearize 전의 3개 (aa, abba, bb) 인지 체크
+def _check_ciphertext_size(ct: "Ciphertext"):
+    if len(ct.components) not in (2, 3):
+        raise RuntimeError("Ciphertext components should be two or three.")
+
 # poly list 가 튜플인지 체크
 def _check_components(components: list["RingElem"]):
     if len(components) != 2:
@@ -18,6 +24,57 @@ def _check_triple_components(components: list["RingElem"]):
     if len(components) != 3:
         raise RuntimeError("Ciphertext components should be three.")
 
+# poly list 가 2개 혹은 3개 인지 체크
+def _check_two_or_three_components(components: list["RingElem"]):
+    if len(components) not in (2, 3):
+        raise RuntimeError("Ciphertext components should be two or three.")
+
+def _check_relinearization_key(relinearization_key):
+    if relinearization_key is None:
+        raise RuntimeError("Relinearization key is required.")
+
+# 3개의 poly 를 가진 암호문을 relinearize 할 key 가 있는지 체크
+def _check_relinearizable(ct: "Ciphertext", relinearization_key):
+    if len(ct.components) == 3 and relinearization_key is None:
+        raise RuntimeError("Three-component ciphertext needs a relinearization key.")
+
+# 내적의 두 operand 의 길이가 같고 비어있지 않은지 체크
+def _check_dot_operands(xs: list, ys: list):
+    if len(xs) != len(ys):
+        raise RuntimeError(f"Operand length mismatch: {len(xs)} != {len(ys)}")
+    if len(xs) == 0:
+        raise RuntimeError("Operands should not be empty")
+
+# 0 의 암호문 pool 의 레벨이 평문의 레벨과 같은지 체크
+def _check_pool_level(pool_level: int, level: int):
+    if pool_level != level:
+        raise RuntimeError(f"Encryption pool level {pool_level} does not match plaintext level {level}")
+
+# worker 에 필요한 key 가 전달되었는지 체크
+def _check_worker_key(available: set, *names: str):
+    if not any(name in available for name in names):
+        raise RuntimeError(f"Workers were started without {' or '.join(names)}.")
+
+# executor 가 같은 params 로 만들어졌는지 체크 (process worker 는 params 를 make_executor 에서 받음)
+def _check_executor(executor, params):
+    if executor is None:
+        return
+    chain_id = getattr(executor, "chain_id", None)
+    if chain_id is None and isinstance(executor, ProcessPoolExecutor):
+        raise RuntimeError("Process executors should be created with make_executor.")
+    if chain_id is not None and chain_id != params.chain_id:
+        raise RuntimeError("Executor was created for different parameters.")
+
+# 회로의 회전에는 RotationKeySet 이 필요
+def _check_rotation_keyset(rotation_keys):
+    if rotation_keys is None:
+        raise RuntimeError("Rotations need a rotation key set.")
+
+# key set 으로 회전할 때는 shift 가 필요
+def _check_shift_given(shift):
+    if shift is None:
+        raise RuntimeError("Rotation by a key set needs a shift.")
+
 # 암호문의 레벨이 타겟보다 작은지 체크
 def _is_small_level_ct(ct: "Ciphertext", target_level: int):
     if ct.level < target_level:
@@ -28,6 +85,11 @@ def _is_level_zero(ct: "Ciphertext"):
     if ct.level == 0:
         raise RuntimeError("Ciphertext level is zero")
 
+# rescale 할 수 있는 레벨인지 체크
+def _is_rescalable_level(level: int):
+    if level <= 0:
+        raise RuntimeError("Operand level is zero")
+
 # 평문의 레벨이 타겟보다 작은지 체크
 def _is_small_level_pt(pt: "Plaintext", target_level: int):
     if pt.level < target_level:
@@ -38,6 +100,11 @@ def _check_msg_length(msg: np.ndarray, slot_count: int):
     if len(msg) != slot_count:
         raise RuntimeError("Invalied message length")
 
+# 배치 메세지가 (B, slot_count) 모양인지 체크
+def _check_batch_shape(msgs: np.ndarray, slot_count: int):
+    if msgs.ndim != 2 or msgs.shape[1] != slot_count:
+        raise RuntimeError(f"Invalied batch shape {msgs.shape}, expected (B, {slot_count})")
+
 # 스칼라가 정수 혹은 실수인지 확인하는 체커
 def _valid_scalar(x):
     allowed_types = (int, float, np.integer, np.floating)